@@ -0,0 +1,204 @@
+import os
+import sys
+import csv
+from contextlib import ExitStack
+from functools import partial
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.MatchWise import match_format
+from data_processing.match_json import decode_match_info, loads
+from data_processing.match_source import list_match_files, map_match_files, read_match_file
+
+# List of fields for the head-to-head CSVs; Test/MDM rows split the dismissal by the team's first and second innings
+H2H_FIELDS = [
+    'match_id', 'batsman_id', 'batsman_name', 'batsman_team', 'bowler_id', 'bowler_name', 'bowler_team',
+    'runs_scored', 'balls_faced', 'runs_conceded', 'balls_bowled', '4s', '6s', 'wickets',
+    'gender', 'venue', 'date', 'match_type', 'wicket_type'
+]
+TEST_H2H_FIELDS = H2H_FIELDS[:-1] + ['wicket_type_1', 'wicket_type_2']
+
+
+def h2h_fields(format_name):
+    """
+    Returns the head-to-head CSV columns of a format ('ODI', 'T20' or 'Test').
+    """
+    return TEST_H2H_FIELDS if format_name == 'Test' else H2H_FIELDS
+
+
+def head_to_head_stats(match_data, match_id, format_name):
+    """
+    Aggregates one match's deliveries per (batsman, bowler) pair.
+
+    Args:
+        match_data (dict): The parsed match JSON.
+        match_id (str): Match id, the JSON file name without extension.
+        format_name (str): 'ODI', 'T20' or 'Test'.
+
+    Returns:
+        list: One dict per batsman-bowler pair with the h2h_fields() columns, in order of first delivery.
+    """
+    # Extract match details
+    match_type = match_data['info']['match_type']
+    match_date = match_data['info']['dates'][0]
+    venue = match_data['info']['venue']
+    gender = match_data['info']['gender']
+
+    # Map player names to their IDs from the registry
+    player_registry = match_data['info']['registry']['people']
+
+    # Create a mapping of players to their teams
+    player_teams = {}
+    if 'players' in match_data['info']:
+        for team_name, team_players in match_data['info']['players'].items():
+            for player_name in team_players:
+                player_teams[player_name] = team_name
+
+    # Dictionary to store aggregated stats for each batsman-bowler pair
+    head_to_head_data = {}
+
+    # Iterate through each inning in the match
+    inning_index = 0
+    for inning in match_data['innings']:
+        inning_index += 1
+        if 'overs' not in inning:
+            continue
+
+        for over in inning['overs']:
+            for delivery in over['deliveries']:
+                batter = delivery['batter']
+                bowler = delivery['bowler']
+                key = (batter, bowler)
+
+                if key not in head_to_head_data:
+                    head_to_head_data[key] = {
+                        'batsman_id': player_registry[batter],
+                        'batsman_name': batter,
+                        'batsman_team': player_teams.get(batter, "Unknown"),
+                        'bowler_id': player_registry[bowler],
+                        'bowler_name': bowler,
+                        'bowler_team': player_teams.get(bowler, "Unknown"),
+                        'runs_scored': 0,
+                        'balls_faced': 0,
+                        'runs_conceded': 0,
+                        'balls_bowled': 0,
+                        '4s': 0,
+                        '6s': 0,
+                        'wickets': 0,
+                    }
+                    if format_name == 'Test':
+                        head_to_head_data[key].update({'wicket_type_1': "", 'wicket_type_2': ""})
+                    else:
+                        head_to_head_data[key]['wicket_type'] = ""
+                stats = head_to_head_data[key]
+
+                # Handle extras
+                extras = delivery.get('extras', {})
+                if 'byes' in extras:
+                    stats['balls_bowled'] += 1
+                    stats['balls_faced'] += 1
+                    stats['runs_conceded'] += extras['byes']
+                elif 'legbyes' in extras:
+                    stats['balls_bowled'] += 1
+                    stats['balls_faced'] += 1
+                    stats['runs_conceded'] += extras['legbyes']
+                elif 'wides' in extras:
+                    stats['runs_conceded'] += extras['wides']
+                    stats['balls_bowled'] += 1
+                elif 'noballs' in extras:
+                    stats['runs_conceded'] += extras['noballs'] + delivery['runs']['batter']
+                    stats['runs_scored'] += delivery['runs']['batter']
+                    stats['balls_faced'] += 1
+                    if delivery['runs']['batter'] == 4:
+                        stats['4s'] += 1
+                    elif delivery['runs']['batter'] == 6:
+                        stats['6s'] += 1
+                else:
+                    stats['balls_bowled'] += 1
+                    stats['balls_faced'] += 1
+                    stats['runs_conceded'] += delivery['runs']['total']
+                    stats['runs_scored'] += delivery['runs']['total']
+                    if delivery['runs']['batter'] == 4:
+                        stats['4s'] += 1
+                    elif delivery['runs']['batter'] == 6:
+                        stats['6s'] += 1
+
+                # Process wickets
+                for wicket_info in delivery.get('wickets', []):
+                    if wicket_info['player_out'] == batter:
+                        stats['wickets'] += 1
+                        if format_name != 'Test':
+                            stats['wicket_type'] = wicket_info['kind']
+                        elif inning_index in (1, 2):
+                            stats['wicket_type_1'] = wicket_info['kind']
+                        elif inning_index in (3, 4):
+                            stats['wicket_type_2'] = wicket_info['kind']
+
+    for stats in head_to_head_data.values():
+        stats.update({'match_id': match_id, 'gender': gender, 'venue': venue, 'date': match_date, 'match_type': match_type})
+    return list(head_to_head_data.values())
+
+
+def parse_h2h_file(source, file_name, formats):
+    """
+    Parses one match file into head-to-head rows (tuples in h2h_fields() order), if it is of one of formats.
+
+    Returns:
+        tuple: (format_name, rows), or None for other match types.
+    """
+    content = read_match_file(source, file_name)
+    format_name = match_format(decode_match_info(content)['match_type'])
+    if format_name not in formats:
+        return None
+    match_data = loads(content)
+    match_id = os.path.splitext(os.path.basename(file_name))[0]
+    fields = h2h_fields(format_name)
+    return format_name, [tuple(row[field] for field in fields) for row in head_to_head_stats(match_data, match_id, format_name)]
+
+
+def H2H(json_dir, output_csvs, workers=1, chunksize=64):
+    """
+    Writes batsman-vs-bowler head-to-head stats of every match, for several formats in one pass.
+
+    Args:
+        json_dir (str): Directory, or zip / tar archive such as ipl_json.zip, containing the JSON match data.
+        output_csvs (dict): Output CSV path per format, e.g. {'T20': 'CSVs/T20_H2H.csv'}.
+        workers (int, optional): Number of parsing processes; 1 parses in this process, None uses every CPU.
+        chunksize (int, optional): Files per task sent to a worker process.
+
+    Returns:
+        dict: Number of matches written per format.
+    """
+    with ExitStack() as stack:
+        writers = {}
+        for format_name, output_csv in output_csvs.items():
+            os.makedirs(os.path.dirname(output_csv) or '.', exist_ok=True)
+            csv_file = stack.enter_context(open(output_csv, mode="w", newline=""))
+            writers[format_name] = csv.writer(csv_file)
+            writers[format_name].writerow(h2h_fields(format_name))
+        match_counts = {format_name: 0 for format_name in writers}
+
+        parse = partial(parse_h2h_file, formats=tuple(output_csvs))
+        for result in map_match_files(parse, json_dir, list_match_files(json_dir), workers, chunksize):
+            if result is None:
+                continue
+            format_name, rows = result
+            writers[format_name].writerows(rows)
+            match_counts[format_name] += 1
+
+    for output_csv in output_csvs.values():
+        print(f"Data has been written to {output_csv}")
+    return match_counts
+
+
+if __name__ == "__main__":
+    from data_processing.delivery_aggregation import H2H_from_store
+    from data_processing.delivery_store import update_delivery_store
+
+    json_dir = "../ipl_json.zip"
+    store_dir = "../data/interim/delivery_store"
+    output_csvs = {'T20': "../data/interim/T20_H2H.csv"}
+
+    # The delivery store (see data_processing/delivery_store.py) parses only new or changed files and gives the same
+    # rows as H2H() without walking the JSON again
+    update_delivery_store(json_dir, store_dir)
+    print(H2H_from_store(store_dir, output_csvs))
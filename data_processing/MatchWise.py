@@ -0,0 +1,390 @@
+import os
+import sys
+import csv
+import hashlib
+import shutil
+from collections import defaultdict
+from contextlib import ExitStack
+from datetime import datetime
+from functools import partial
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.ingest_manifest import (is_output_unchanged, is_unchanged, load_manifest, output_record,
+                                             remove_match_rows, save_manifest)
+from data_processing.match_json import decode_match_info, loads
+from data_processing.match_index import update_match_index
+from data_processing.match_source import list_match_files, map_match_files, match_file_stat, match_id_of, read_match_file
+
+# Cricsheet match types written to each format's MatchWise CSV. Test/MDM rows have no 'out' column.
+MATCH_FORMATS = {
+    'ODI': {'match_types': ('odi', 'odm'), 'track_out': True},
+    'T20': {'match_types': ('t20', 'it20'), 'track_out': True},
+    'Test': {'match_types': ('test', 'mdm'), 'track_out': False},
+}
+
+CSV_FIELDS = [
+    'match_id', 'player_id', 'player_name', 'team_name', 'runs_scored', 'balls_faced', 'no_of_fours', 'no_of_sixes',
+    'no_of_catches', 'runouts', 'balls_bowled', 'dot_balls',
+    'wickets', 'LBWs/Bowled', 'runs_conceded', 'stumpings', 'out', 'date', 'venue', 'match_type', 'gender'
+]
+
+
+def match_format(match_type):
+    """
+    Returns the MATCH_FORMATS key ('ODI', 'T20' or 'Test') of a Cricsheet match_type, or None for other match types.
+    """
+    match_type = match_type.lower()
+    for format_name, spec in MATCH_FORMATS.items():
+        if match_type in spec['match_types']:
+            return format_name
+    return None
+
+
+def csv_fields(format_name):
+    """
+    Returns the MatchWise CSV columns of a format.
+    """
+    if MATCH_FORMATS[format_name]['track_out']:
+        return list(CSV_FIELDS)
+    return [field for field in CSV_FIELDS if field != 'out']
+
+
+def player_match_stats(match_data, match_id, track_out=True):
+    """
+    Extracts per-player batting, bowling and fielding stats from one parsed Cricsheet match.
+
+    Args:
+        match_data (dict): The parsed match JSON.
+        match_id (str): Match id, the JSON file name without extension.
+        track_out (bool): Whether to record each player's 'out' status (DNB / not out / out).
+
+    Returns:
+        list: One dict per player with the MatchWise CSV fields, in the order players appear in the registry
+        and then in the deliveries.
+    """
+    info = match_data['info']
+    match_type = info['match_type']
+    match_date_str = info['dates'][0]
+    venue = info.get('city', "Unknown Venue")
+
+    def new_player():
+        stats = {
+            'match_id': match_id,
+            'player_id': None,
+            'team_name': None,
+            'runs_scored': 0,
+            'balls_faced': 0,
+            'no_of_fours': 0,
+            'no_of_sixes': 0,
+            'no_of_catches': 0,
+            'runouts': 0,
+            'balls_bowled': 0,
+            'dot_balls': 0,
+            'wickets': 0,
+            'LBWs/Bowled': 0,
+            'runs_conceded': 0,
+            'stumpings': 0,
+        }
+        if track_out:
+            stats['out'] = "DNB"  # Did not bat
+        stats.update({'date': match_date_str, 'venue': venue, 'match_type': match_type, 'gender': info['gender']})
+        return stats
+
+    # Initialize dictionary to store player statistics
+    player_stats = defaultdict(new_player)
+
+    # Assign player IDs from the registry
+    for player_name, player_id in info['registry']['people'].items():
+        player_stats[player_name]['player_id'] = str(player_id)
+
+    # Assign team names to players
+    if 'players' in info:
+        for team_name, team_players in info['players'].items():
+            for player_name in team_players:
+                if player_name in player_stats:
+                    player_stats[player_name]['team_name'] = team_name
+
+    # Iterate through each inning in the match
+    for inning in match_data['innings']:
+        if 'overs' not in inning:
+            continue
+
+        for over in inning['overs']:
+            for delivery in over['deliveries']:
+                batter = delivery['batter']
+                bowler = delivery['bowler']
+
+                # Mark the batter and non-striker as having batted
+                if track_out:
+                    non_striker = delivery['non_striker']
+                    if player_stats[batter]['out'] == 'DNB':
+                        player_stats[batter]['out'] = 'not out'
+                    if player_stats[non_striker]['out'] == 'DNB':
+                        player_stats[non_striker]['out'] = 'not out'
+
+                # Handle extras
+                extras = delivery.get('extras', {})
+                if 'byes' in extras or 'legbyes' in extras:
+                    player_stats[bowler]['balls_bowled'] += 1
+                elif 'wides' in extras:
+                    player_stats[bowler]['runs_conceded'] += extras['wides']
+                elif 'noballs' in extras:
+                    player_stats[bowler]['runs_conceded'] += extras['noballs'] + delivery['runs']['batter']
+                    player_stats[batter]['runs_scored'] += delivery['runs']['batter']
+                    player_stats[batter]['balls_faced'] += 1
+                    if delivery['runs']['batter'] == 4:
+                        player_stats[batter]['no_of_fours'] += 1
+                    elif delivery['runs']['batter'] == 6:
+                        player_stats[batter]['no_of_sixes'] += 1
+                else:
+                    player_stats[bowler]['balls_bowled'] += 1
+                    player_stats[bowler]['runs_conceded'] += delivery['runs']['total']
+                    if delivery['runs']['total'] == 0:
+                        player_stats[bowler]['dot_balls'] += 1
+
+                # Update batter's stats
+                if 'byes' not in extras and 'legbyes' not in extras and 'wides' not in extras and 'noballs' not in extras:
+                    runs_scored = delivery['runs']['batter']
+                    player_stats[batter]['runs_scored'] += runs_scored
+                    player_stats[batter]['balls_faced'] += 1
+                    if runs_scored == 4:
+                        player_stats[batter]['no_of_fours'] += 1
+                    elif runs_scored == 6:
+                        player_stats[batter]['no_of_sixes'] += 1
+                elif 'byes' in extras or 'legbyes' in extras:
+                    player_stats[batter]['balls_faced'] += 1
+
+                # Handle wickets
+                for wicket_info in delivery.get('wickets', []):
+                    player_out = wicket_info['player_out']
+
+                    # Update out status for the dismissed player
+                    if track_out and player_out in [batter, non_striker]:
+                        player_stats[player_out]['out'] = "out"
+
+                    if wicket_info['kind'] == 'caught':
+                        player_stats[bowler]['wickets'] += 1
+                        fielder = wicket_info.get('fielders', [{}])[0].get('name', None)
+                        if fielder:
+                            player_stats[fielder]['no_of_catches'] += 1
+                    elif wicket_info['kind'] == 'run out':
+                        for fielder_info in wicket_info.get('fielders', []):
+                            fielder_name = fielder_info.get('name', None)
+                            if fielder_name:
+                                player_stats[fielder_name]['runouts'] += 1
+                    elif wicket_info['kind'] == 'stumped':
+                        player_stats[bowler]['wickets'] += 1
+                        stumper = wicket_info.get('fielders', [{}])[0].get('name', None)
+                        if stumper:
+                            player_stats[stumper]['stumpings'] += 1
+                    elif wicket_info['kind'] in ['bowled', 'lbw']:
+                        player_stats[bowler]['LBWs/Bowled'] += 1
+                        player_stats[bowler]['wickets'] += 1
+                    else:
+                        player_stats[bowler]['wickets'] += 1
+
+    rows = []
+    for player, stats in player_stats.items():
+        stats_row = {'player_name': player}
+        stats_row.update(stats)
+        rows.append(stats_row)
+    return rows
+
+
+def parse_match_file(source, file_name, formats, start_date_obj=None, end_date_obj=None):
+    """
+    Parses one Cricsheet JSON file into MatchWise rows, if it belongs to one of formats and the date range.
+
+    Runs in the worker processes of a parallel MatchWise pass, so the rows come back as compact tuples in the
+    format's csv_fields() order rather than dicts.
+
+    Args:
+        source (str): Directory or zip / tar archive holding the file (see data_processing/match_source.py).
+        file_name (str): File (or archive member) name.
+        formats (Iterable[str]): Formats being written, keys of MATCH_FORMATS.
+        start_date_obj (datetime, optional): Start of the date range (inclusive).
+        end_date_obj (datetime, optional): End of the date range (inclusive).
+
+    Returns:
+        tuple: (format_name, date, sha256, rows) of the match; format_name is None for other match types and
+        rows is None when the match is skipped.
+    """
+    content = read_match_file(source, file_name)
+    digest = hashlib.sha256(content).hexdigest()
+
+    # Only the info block is decoded to decide whether the match is wanted; the innings only for wanted matches
+    info = decode_match_info(content)
+    format_name = match_format(info['match_type'])
+    match_date_str = info['dates'][0]
+    if format_name not in formats or not in_date_range(match_date_str, start_date_obj, end_date_obj):
+        return format_name, match_date_str, digest, None
+
+    match_data = loads(content)
+    match_id = match_id_of(file_name)
+    fields = csv_fields(format_name)
+    rows = player_match_stats(match_data, match_id, MATCH_FORMATS[format_name]['track_out'])
+    return format_name, match_date_str, digest, [tuple(row[field] for field in fields) for row in rows]
+
+
+def in_date_range(match_date_str, start_date_obj=None, end_date_obj=None):
+    """
+    Whether a YYYY-MM-DD match date lies in the (inclusive) range; open ends are not checked.
+    """
+    match_date = datetime.strptime(match_date_str, "%Y-%m-%d")
+    return not ((start_date_obj and match_date < start_date_obj) or (end_date_obj and match_date > end_date_obj))
+
+
+def MatchWise(json_dir, output_csvs, start_date=None, end_date=None, workers=1, chunksize=64, manifest_path=None, index_path=None):
+    """
+    Processes the Cricsheet JSON files in a directory or archive once and writes the MatchWise player stats of several
+    formats in the same pass.
+
+    Each file is read and parsed a single time and dispatched on its match_type (ODI/ODM, T20/IT20, Test/MDM)
+    to the CSV of its format, so building all three formats costs one parse of the archive instead of three.
+    Each CSV is identical to what ODI_MatchWise, T20_MatchWise or Test_MatchWise writes on its own.
+
+    With workers > 1 the files are parsed in a process pool, handed out chunksize files at a time. Results are
+    written in directory (or archive) order as they come back, so the output is byte-identical to the serial pass.
+
+    With a manifest_path, the run is incremental: the manifest (see data_processing/ingest_manifest.py) records
+    every file's mtime, size, hash, match type, date and rows written, and only new or changed files, or files
+    that newly fall in the date range, are parsed. Their rows are appended to the previous outputs (copied over
+    first if the output paths changed), and rows of deleted, changed or no longer wanted matches are removed.
+    The result has the same rows as a full rebuild, with the newly parsed matches at the end.
+
+    An output that only gains rows is appended to in place, so earlier rows keep their byte offsets. One that
+    also loses rows is written to a temporary file and renamed over the old one once complete. The manifest,
+    which records every output's size and mtime, is saved last: if a run stops part way, an output no longer
+    matches its record and that format is rebuilt from scratch on the next run, so the manifest never
+    describes rows that are not in the CSVs.
+
+    json_dir may also be a zip or tar archive such as ipl_json.zip; its members are read in archive order
+    straight from the archive, without extracting them to disk.
+
+    With an index_path, the sidecar match index (see data_processing/match_index.py) is brought up to date
+    first and files whose match type or date is not wanted are not opened at all.
+
+    Args:
+        json_dir (str): Directory, or zip / tar archive, containing the JSON match data.
+        output_csvs (dict): Output CSV path per format, e.g. {'ODI': ..., 'T20': ..., 'Test': ...}. Formats left
+            out are skipped.
+        start_date (str, optional): Start date (inclusive) for filtering (YYYY-MM-DD).
+        end_date (str, optional): End date (inclusive) for filtering (YYYY-MM-DD).
+        workers (int, optional): Number of parsing processes; 1 parses in this process, None uses every CPU.
+        chunksize (int, optional): Files per task sent to a worker process.
+        manifest_path (str, optional): Ingestion manifest to read and update, for an incremental run.
+        index_path (str, optional): Sidecar match index to read and update, to skip unwanted files unopened.
+
+    Returns:
+        dict: Number of matches parsed and written per format in this run.
+    """
+    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+    end_date_obj = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
+    workers = workers or os.cpu_count() or 1
+
+    manifest = load_manifest(manifest_path, json_dir)
+    entries = manifest['files']
+
+    # Previous outputs are kept when the manifest saw them as they are now
+    kept_formats = set()
+    for format_name, output_csv in output_csvs.items():
+        previous = manifest['outputs'].get(format_name)
+        if manifest_path and is_output_unchanged(previous):
+            kept_formats.add(format_name)
+
+    def is_written(entry):
+        return entry is not None and entry['written'] and entry['format'] in kept_formats
+
+    # With the sidecar index, files of other formats or outside the date range are never opened
+    index = update_match_index(json_dir, index_path, workers, chunksize) if index_path else {}
+
+    # Decide, in directory order, which JSON files to parse and which matches' rows to drop
+    to_parse = []
+    to_remove = {format_name: set() for format_name in kept_formats}
+    current = set()
+    for file_name in list_match_files(json_dir):
+        indexed = index.get(file_name)
+        if indexed is not None and (match_format(indexed['match_type']) not in output_csvs
+                                    or not in_date_range(indexed['date'], start_date_obj, end_date_obj)):
+            continue
+        match_id = match_id_of(file_name)
+        current.add(match_id)
+        entry = entries.get(match_id)
+        if entry is not None and entry['file'] == file_name and is_unchanged(entry, json_dir, file_name):
+            wanted = entry['format'] in output_csvs and in_date_range(entry['date'], start_date_obj, end_date_obj)
+            if wanted and not is_written(entry):
+                to_parse.append(file_name)
+            elif not wanted and is_written(entry):
+                to_remove[entry['format']].add(match_id)
+                entry['written'], entry['rows'] = False, 0
+            continue
+        if is_written(entry):
+            to_remove[entry['format']].add(match_id)
+        to_parse.append(file_name)
+
+    for match_id in [match_id for match_id in entries if match_id not in current]:
+        if is_written(entries[match_id]):
+            to_remove[entries[match_id]['format']].add(match_id)
+        del entries[match_id]
+
+    # Outputs losing rows are staged in a temporary file; the others are appended to (copied first if they moved)
+    written_csvs = dict(output_csvs)
+    for format_name in kept_formats:
+        output_csv, previous_csv = output_csvs[format_name], manifest['outputs'][format_name]['path']
+        os.makedirs(os.path.dirname(output_csv) or '.', exist_ok=True)
+        if to_remove[format_name]:
+            written_csvs[format_name] = output_csv + '.tmp'
+            remove_match_rows(previous_csv, to_remove[format_name], written_csvs[format_name])
+        elif previous_csv != os.path.abspath(output_csv):
+            shutil.copyfile(previous_csv, output_csv)
+
+    parse = partial(parse_match_file, formats=tuple(output_csvs), start_date_obj=start_date_obj, end_date_obj=end_date_obj)
+
+    with ExitStack() as stack:
+        writers = {}
+        for format_name, output_csv in written_csvs.items():
+            # Ensure the output directory exists
+            os.makedirs(os.path.dirname(output_csv) or '.', exist_ok=True)
+            csv_file = stack.enter_context(open(output_csv, mode="a" if format_name in kept_formats else "w", newline=""))
+            writers[format_name] = csv.writer(csv_file)
+            if format_name not in kept_formats:
+                writers[format_name].writerow(csv_fields(format_name))
+        match_counts = {format_name: 0 for format_name in writers}
+
+        results = map_match_files(parse, json_dir, to_parse, workers, chunksize)
+        for file_name, (format_name, match_date_str, digest, rows) in zip(to_parse, results):
+            if rows is not None:
+                writers[format_name].writerows(rows)
+                match_counts[format_name] += 1
+            if manifest_path:
+                stat = match_file_stat(json_dir, file_name)
+                entries[match_id_of(file_name)] = {
+                    'file': file_name, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest,
+                    'format': format_name, 'date': match_date_str,
+                    'written': rows is not None, 'rows': len(rows) if rows is not None else 0,
+                }
+
+    for format_name, written_csv in written_csvs.items():
+        if written_csv != output_csvs[format_name]:
+            os.replace(written_csv, output_csvs[format_name])
+
+    if manifest_path:
+        manifest['outputs'] = {format_name: output_record(output_csv) for format_name, output_csv in output_csvs.items()}
+        save_manifest(manifest_path, manifest)
+
+    for format_name, output_csv in output_csvs.items():
+        print(f"Data saved to {output_csv}")
+    return match_counts
+
+
+if __name__ == "__main__":
+    json_dir = "../data/raw/cricksheet_data/all_json"
+    output_csvs = {
+        'ODI': '../data/interim/ODI_MatchWise.csv',
+        'T20': '../data/interim/T20_MatchWise.csv',
+        'Test': '../data/interim/Test_MatchWise.csv',
+    }
+    start_date = "2000-01-01"
+    end_date = "2024-12-01"
+
+    print(MatchWise(json_dir, output_csvs, start_date, end_date))
@@ -1,7 +1,58 @@
+import os
+import sys
 import pandas as pd
 from collections import deque
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.feature_builder import build_feature_table
+
+
 def career_ODI(input_file: str, output_file: str):
+    """
+    Writes each player's career stats before every ODI match (runs, 100s, 50s, averages, wickets, catches, ...)
+    from a ODI_MatchWise_fantasy_points CSV, using grouped running sums over the date-sorted rows.
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with career stats.
+
+    Returns:
+        None: Saves the CSV with career statistics, the same table career_ODI_iterrows() writes.
+    """
+    build_feature_table('career', 'ODI', input_file, output_file)
+
+
+def recent_ODI(input_file: str, output_file: str):
+    """
+    Writes each player's form over their last 5 ODI matches before every match, from rolling window sums.
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with recent form metrics.
+
+    Returns:
+        None: Saves the CSV with recent form metrics, the same table recent_ODI_iterrows() writes.
+    """
+    build_feature_table('recent', 'ODI', input_file, output_file)
+
+
+def venue_ODI(input_file: str, output_file: str):
+    """
+    Writes each player's stats at the match venue before every ODI match, from running sums grouped by
+    (player_id, venue).
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with venue-specific performance metrics.
+
+    Returns:
+        None: Saves the CSV with venue statistics, the same table venue_ODI_iterrows() writes.
+    """
+    build_feature_table('venue', 'ODI', input_file, output_file)
+
+
+# Row-at-a-time versions of the builders above, kept unchanged as the reference for tests/test_feature_builder.py
+def career_ODI_iterrows(input_file: str, output_file: str):
     """
     Processes player performance data from a ODI_MatchWise_fantasy_points CSV, calculates cumulative career stats for ODI matches, and saves to a new CSV.
     
@@ -114,7 +165,7 @@ def career_ODI(input_file: str, output_file: str):
     print("Career statistics added to the DataFrame with optimized performance!")
 
 
-def recent_ODI(input_file: str, output_file: str):
+def recent_ODI_iterrows(input_file: str, output_file: str):
     """
     Processes player performance data, calculates recent form metrics (last 5 matches) for ODI matches, and saves to a new CSV.
 
@@ -253,7 +304,7 @@ def recent_ODI(input_file: str, output_file: str):
     print("Recent form metrics added to the DataFrame with optimized performance!")
 
 
-def venue_ODI(input_file, output_file):
+def venue_ODI_iterrows(input_file, output_file):
     """
     Calculates and appends venue-specific performance metrics for ODI players.
 
@@ -0,0 +1,153 @@
+import os
+import sys
+import csv
+import json
+from collections import defaultdict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.match_json import loads
+from data_processing.match_source import list_match_files, map_match_files, read_match_file
+
+# Fields for the overall stats CSV
+OVERALL_CSV_FIELDS = [
+    'player_id', 'player_name', 'batting_innings', 'bowling_innings',
+    'total_runs_scored', 'total_balls_faced', 'total_fours', 'total_sixes',
+    'total_catches', 'total_runouts', 'total_balls_bowled', 'total_dot_balls',
+    'total_wickets', 'total_LBWs/Bowled', 'total_runs_conceded', 'total_stumpings'
+]
+# Fields that are summed across matches; player_id and player_name keep their latest value
+TOTAL_FIELDS = OVERALL_CSV_FIELDS[2:]
+
+
+def new_player_totals():
+    return {field: 0 for field in TOTAL_FIELDS}
+
+
+def match_player_totals(source, file_name):
+    """
+    Per-player totals of one match file, for Overall_PlayerStats.
+
+    Returns:
+        dict: player name -> totals, in order of first appearance; None if the file is not valid JSON.
+    """
+    try:
+        match_data = loads(read_match_file(source, file_name))
+    except json.JSONDecodeError:
+        return None
+
+    # Map player names to their IDs
+    player_registry = match_data['info']['registry']['people']
+    match_stats = defaultdict(new_player_totals)
+
+    # Process each inning
+    for inning in match_data.get('innings', []):
+        batter_participation = set()  # Tracks batters who participated in this inning
+        bowler_participation = set()  # Tracks bowlers who participated in this inning
+
+        for over in inning.get('overs', []):
+            for delivery in over.get('deliveries', []):
+                batter = delivery['batter']
+                bowler = delivery['bowler']
+
+                # Track batting innings
+                if batter not in batter_participation:
+                    batter_participation.add(batter)
+                    match_stats[batter]['batting_innings'] += 1
+                    match_stats[batter]['player_id'] = str(player_registry.get(batter, "Unknown"))
+                    match_stats[batter]['player_name'] = batter
+
+                # Update batter stats
+                batter_stats = match_stats[batter]
+                batter_stats['total_runs_scored'] += delivery.get('runs', {}).get('batter', 0)
+                batter_stats['total_balls_faced'] += 1
+                batter_stats['total_fours'] += 1 if delivery.get('runs', {}).get('batter', 0) == 4 else 0
+                batter_stats['total_sixes'] += 1 if delivery.get('runs', {}).get('batter', 0) == 6 else 0
+
+                # Track bowling innings
+                if bowler not in bowler_participation:
+                    bowler_participation.add(bowler)
+                    match_stats[bowler]['bowling_innings'] += 1
+                    match_stats[bowler]['player_id'] = str(player_registry.get(bowler, "Unknown"))
+                    match_stats[bowler]['player_name'] = bowler
+
+                # Update bowler stats
+                bowler_stats = match_stats[bowler]
+                bowler_stats['total_balls_bowled'] += 1
+                bowler_stats['total_runs_conceded'] += delivery.get('runs', {}).get('total', 0)
+                bowler_stats['total_dot_balls'] += 1 if delivery.get('runs', {}).get('total', 0) == 0 else 0
+
+                if 'wickets' in delivery:
+                    bowler_stats['total_wickets'] += len(delivery['wickets'])
+                    bowler_stats['total_LBWs/Bowled'] += sum(
+                        1 for wicket in delivery['wickets'] if wicket.get('kind') in ['bowled', 'lbw']
+                    )
+
+                    for wicket in delivery['wickets']:
+                        # Track fielders
+                        for fielder_info in wicket.get('fielders', []):
+                            fielder_name = fielder_info.get('name')
+                            if fielder_name:
+                                match_stats[fielder_name]['player_id'] = str(player_registry.get(fielder_name, "Unknown"))
+                                match_stats[fielder_name]['player_name'] = fielder_name
+                                fielder_stats = match_stats[fielder_name]
+
+                                if wicket.get('kind') == 'caught':
+                                    fielder_stats['total_catches'] += 1
+                                elif wicket.get('kind') == 'run out':
+                                    fielder_stats['total_runouts'] += 1
+                                elif wicket.get('kind') == 'stumped':
+                                    fielder_stats['total_stumpings'] += 1
+    return dict(match_stats)
+
+
+def Overall_PlayerStats(json_dir, output_csv, workers=1, chunksize=64):
+    """
+    Writes every player's overall batting, bowling and fielding totals across all matches of a Cricsheet
+    directory or archive.
+
+    Each match is totalled on its own (in worker processes when workers > 1) and the per-match totals are
+    merged in file order, so the CSV is the same as accumulating every delivery in a single loop.
+
+    Args:
+        json_dir (str): Directory, or zip / tar archive such as ipl_json.zip, containing the JSON match data.
+        output_csv (str): Path of the overall stats CSV.
+        workers (int, optional): Number of parsing processes; 1 parses in this process, None uses every CPU.
+        chunksize (int, optional): Files per task sent to a worker process.
+
+    Returns:
+        int: Number of players written.
+    """
+    overall_stats = defaultdict(new_player_totals)
+    for match_stats in map_match_files(match_player_totals, json_dir, list_match_files(json_dir), workers, chunksize):
+        for player_name, stats in (match_stats or {}).items():
+            totals = overall_stats[player_name]
+            for field, value in stats.items():
+                if field in ('player_id', 'player_name'):
+                    totals[field] = value
+                else:
+                    totals[field] += value
+
+    # Write overall stats to a single CSV
+    os.makedirs(os.path.dirname(output_csv) or '.', exist_ok=True)
+    with open(output_csv, mode="w", newline="") as overall_csv:
+        writer = csv.DictWriter(overall_csv, fieldnames=OVERALL_CSV_FIELDS)
+        writer.writeheader()
+        for player_name, stats in overall_stats.items():
+            writer.writerow({'player_name': player_name, **stats})
+
+    print(f"Overall stats written to {output_csv}")
+    return len(overall_stats)
+
+
+if __name__ == "__main__":
+    from data_processing.delivery_aggregation import Overall_PlayerStats_from_store
+    from data_processing.delivery_store import update_delivery_store
+
+    json_dir = "../ipl_json.zip"
+    store_dir = "../data/interim/delivery_store"
+    output_csv = "../data/interim/Overall_PlayerStats.csv"
+
+    # The delivery store (see data_processing/delivery_store.py) parses only new or changed files and gives the same
+    # totals as Overall_PlayerStats() without walking the JSON again
+    update_delivery_store(json_dir, store_dir)
+    Overall_PlayerStats_from_store(store_dir, output_csv)
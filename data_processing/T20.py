@@ -1,8 +1,58 @@
+import os
+import sys
 import pandas as pd
 from collections import deque
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.feature_builder import build_feature_table
+
 
 def career_T20(input_file, output_file):
+    """
+    Writes each player's career stats before every T20 match (runs, 100s, 50s, averages, wickets, catches, ...)
+    from a T20_MatchWise_fantasy_points CSV, using grouped running sums over the date-sorted rows.
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with career stats.
+
+    Returns:
+        None: Saves the CSV with career statistics, the same table career_T20_iterrows() writes.
+    """
+    build_feature_table('career', 'T20', input_file, output_file)
+
+
+def recent_T20(input_file, output_file):
+    """
+    Writes each player's form over their last 5 T20 matches before every match, from rolling window sums.
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with recent form metrics.
+
+    Returns:
+        None: Saves the CSV with recent form metrics, the same table recent_T20_iterrows() writes.
+    """
+    build_feature_table('recent', 'T20', input_file, output_file)
+
+
+def venue_T20(input_file, output_file):
+    """
+    Writes each player's stats at the match venue before every T20 match, from running sums grouped by
+    (player_id, venue).
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with venue-specific performance metrics.
+
+    Returns:
+        None: Saves the CSV with venue statistics, the same table venue_T20_iterrows() writes.
+    """
+    build_feature_table('venue', 'T20', input_file, output_file)
+
+
+# Row-at-a-time versions of the builders above, kept unchanged as the reference for tests/test_feature_builder.py
+def career_T20_iterrows(input_file, output_file):
     """
     Processes a T20 match dataset and calculates cumulative career statistics for each player, saving the results to a new CSV file.
 
@@ -124,7 +174,7 @@ def career_T20(input_file, output_file):
     print("Career statistics added to the T20 DataFrame with optimized performance!")
 
 
-def recent_T20(input_file, output_file):
+def recent_T20_iterrows(input_file, output_file):
     """
     Processes a T20 match dataset to calculate recent form metrics for each player (last 5 matches), saving the results to a new CSV file.
 
@@ -273,7 +323,7 @@ def recent_T20(input_file, output_file):
     print("Recent form metrics added to the DataFrame with optimized performance!")
 
 
-def venue_T20(input_file, output_file):
+def venue_T20_iterrows(input_file, output_file):
     """
     Processes a T20 match dataset to calculate venue-specific performance metrics for each player, saving the results to a new CSV file.
 
@@ -1,8 +1,58 @@
+import os
+import sys
 import pandas as pd
 from collections import deque
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.feature_builder import build_feature_table
+
 
 def career_Test(input_file, output_file):
+    """
+    Writes each player's career stats before every Test match (runs, 100s, 50s, averages, wickets, catches, ...)
+    from a Test_MatchWise_fantasy_points CSV, using grouped running sums over the date-sorted rows.
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with career stats.
+
+    Returns:
+        None: Saves the CSV with career statistics, the same table career_Test_iterrows() writes.
+    """
+    build_feature_table('career', 'Test', input_file, output_file)
+
+
+def recent_Test(input_file, output_file):
+    """
+    Writes each player's form over their last 5 Test matches before every match, from rolling window sums.
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with recent form metrics.
+
+    Returns:
+        None: Saves the CSV with recent form metrics, the same table recent_Test_iterrows() writes.
+    """
+    build_feature_table('recent', 'Test', input_file, output_file)
+
+
+def venue_Test(input_file, output_file):
+    """
+    Writes each player's stats at the match venue before every Test match, from running sums grouped by
+    (player_id, venue).
+
+    Args:
+        input_file (str): Path to the input CSV file containing match data.
+        output_file (str): Path to save the output CSV with venue-specific performance metrics.
+
+    Returns:
+        None: Saves the CSV with venue statistics, the same table venue_Test_iterrows() writes.
+    """
+    build_feature_table('venue', 'Test', input_file, output_file)
+
+
+# Row-at-a-time versions of the builders above, kept unchanged as the reference for tests/test_feature_builder.py
+def career_Test_iterrows(input_file, output_file):
     """
     Calculates and adds career statistics for each player from a match dataset.
 
@@ -109,7 +159,7 @@ def career_Test(input_file, output_file):
 
     print("Career statistics added to the DataFrame with optimized performance!")
 
-def recent_Test(input_file, output_file):
+def recent_Test_iterrows(input_file, output_file):
     """
     Calculates and adds recent form metrics for each player from a match dataset.
 
@@ -249,7 +299,7 @@ def recent_Test(input_file, output_file):
 
     print("Recent form metrics added to the DataFrame with optimized performance!")
 
-def venue_Test(input_file, output_file):
+def venue_Test_iterrows(input_file, output_file):
     """
     Calculates and adds venue-specific performance metrics for each player from a match dataset.
 
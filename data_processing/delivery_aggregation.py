@@ -0,0 +1,513 @@
+import os
+import sys
+import csv
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.H2H import h2h_fields
+from data_processing.MatchWise import MATCH_FORMATS, csv_fields, match_format
+from data_processing.PlayerStats import OVERALL_CSV_FIELDS
+from data_processing.delivery_store import EXTRAS_BITS, load_delivery_store, select_matches
+
+# Per-player totals computed by aggregate_player_stats(), in MatchWise CSV order
+STAT_FIELDS = [
+    'runs_scored', 'balls_faced', 'no_of_fours', 'no_of_sixes', 'no_of_catches', 'runouts', 'balls_bowled',
+    'dot_balls', 'wickets', 'LBWs/Bowled', 'runs_conceded', 'stumpings'
+]
+
+# Positions in the delivery walk used to order players: registry entries come before WALK_START
+WALK_START = np.int64(1) << 40
+NOT_TOUCHED = np.iinfo(np.int64).max
+
+
+def aggregate_player_stats(store, track_out=True):
+    """
+    Computes the MatchWise batting, bowling and fielding totals of every player of every match in a delivery store
+    with grouped NumPy reductions, instead of per-delivery dict updates.
+
+    The rules are those of player_match_stats() in data_processing/MatchWise.py:
+        - byes / legbyes: a ball bowled and faced, no runs to either side.
+        - wides (without byes): the wide runs are conceded, no ball bowled or faced.
+        - no-balls (without byes or wides): no-ball plus batter runs conceded; batter runs, ball faced and
+          boundaries count for the batter, no ball bowled.
+        - anything else: a ball bowled, the total conceded (a dot ball if 0), batter runs and boundaries.
+        - every dismissal but a run out is a wicket to the bowler; bowled and lbw also count as LBWs/Bowled; caught
+          and stumped credit the first named fielder, run outs every named fielder.
+    Players appear in the same order as in player_match_stats(): the registry first, then everyone else in the
+    order the delivery walk would first touch them.
+
+    Args:
+        store (dict): Tables from load_delivery_store(), possibly restricted with select_matches().
+        track_out (bool): Whether to compute each player's 'out' status (DNB / not out / out).
+
+    Returns:
+        pd.DataFrame: One row per (match, player) with 'match', 'player', 'registered', the STAT_FIELDS columns
+        and, with track_out, 'out'.
+    """
+    deliveries, wickets, fielders, people = store['deliveries'], store['wickets'], store['fielders'], store['people']
+    kinds = dict(zip(store['wicket_kinds']['name'], store['wicket_kinds']['kind']))
+    player_count = np.int64(max(len(store['players']), 1))
+
+    match = deliveries['match'].to_numpy(np.int64)
+    batter = match * player_count + deliveries['batter'].to_numpy(np.int64)
+    bowler = match * player_count + deliveries['bowler'].to_numpy(np.int64)
+    non_striker = match * player_count + deliveries['non_striker'].to_numpy(np.int64)
+    runs_batter = deliveries['runs_batter'].to_numpy(np.int64)
+    runs_total = deliveries['runs_total'].to_numpy(np.int64)
+
+    # Extras precedence: byes/legbyes, then wides, then no-balls
+    extras_mask = deliveries['extras_mask'].to_numpy()
+    bye = (extras_mask & (EXTRAS_BITS['byes'] | EXTRAS_BITS['legbyes'])) != 0
+    wide = ~bye & ((extras_mask & EXTRAS_BITS['wides']) != 0)
+    noball = ~bye & ~wide & ((extras_mask & EXTRAS_BITS['noballs']) != 0)
+    plain = ~(bye | wide | noball)
+    scoring = noball | plain
+
+    wicket_delivery = wickets['delivery'].to_numpy(np.int64)
+    wicket_kind = wickets['kind'].to_numpy()
+    fielder_wicket = fielders['wicket'].to_numpy(np.int64)
+    fielder = fielders['fielder'].to_numpy(np.int64)
+    fielder_kind = wicket_kind[fielder_wicket]
+    first_fielder = np.r_[True, fielder_wicket[1:] != fielder_wicket[:-1]] if len(fielder_wicket) else np.zeros(0, dtype=bool)
+    named = fielder >= 0
+    catch = first_fielder & (fielder_kind == kinds.get('caught', -1))
+    stumping = first_fielder & (fielder_kind == kinds.get('stumped', -1))
+    runout = fielder_kind == kinds.get('run out', -1)
+    credited = (catch | stumping | runout)[named]
+    fielder_delivery = wicket_delivery[fielder_wicket[named]]
+    fielder_key = match[fielder_delivery] * player_count + fielder[named]
+
+    # Where the delivery walk first touches (and so creates) each player's entry: registered players first, in
+    # registry order, then by delivery and by the step within it (batter, non-striker, bowler, batter, fielders).
+    # Keys that are only looked at, never touched, get NOT_TOUCHED and are dropped.
+    registered = people['registered'].to_numpy()
+    people_key = people['match'].to_numpy(np.int64)[registered] * player_count + people['player'].to_numpy(np.int64)[registered]
+    step = np.arange(len(deliveries), dtype=np.int64) * 128 + WALK_START
+    if track_out:
+        batter_step, non_striker_step = step, step + 16
+    else:
+        batter_step, non_striker_step = np.where(wide, NOT_TOUCHED, step + 48), np.full(len(step), NOT_TOUCHED)
+    fielder_rank = np.arange(len(fielder_key), dtype=np.int64) - np.searchsorted(fielder_delivery, fielder_delivery)
+    fielder_step = np.where(credited, fielder_delivery * 128 + WALK_START + 64 + np.minimum(fielder_rank, 63), NOT_TOUCHED)
+
+    segments = [people_key, batter, non_striker, bowler, fielder_key]
+    keys = np.concatenate(segments)
+    first_touch = np.concatenate([np.arange(len(people_key), dtype=np.int64), batter_step, non_striker_step, step + 32, fielder_step])
+
+    # One sort groups every key and finds its first touch; inverse maps each entry of keys to its group
+    by_key = np.lexsort((first_touch, keys))
+    starts = np.r_[True, keys[by_key][1:] != keys[by_key][:-1]] if len(keys) else np.zeros(0, dtype=bool)
+    inverse = np.empty(len(keys), dtype=np.int64)
+    inverse[by_key] = np.cumsum(starts) - 1
+    unique_keys = keys[by_key[starts]]
+    unique_first_touch = first_touch[by_key[starts]]
+    bounds = np.cumsum([0] + [len(segment) for segment in segments])
+    _, batter_group, non_striker_group, bowler_group, fielder_group = np.split(inverse, bounds[1:-1])
+
+    def total(group, weights=None):
+        return np.bincount(group, weights, minlength=len(unique_keys)).astype(np.int64)
+
+    wicket_bowler_group = bowler_group[wicket_delivery]
+    stats = {
+        'runs_scored': total(batter_group[scoring], runs_batter[scoring]),
+        'balls_faced': total(batter_group[scoring | bye]),
+        'no_of_fours': total(batter_group[scoring & (runs_batter == 4)]),
+        'no_of_sixes': total(batter_group[scoring & (runs_batter == 6)]),
+        'no_of_catches': total(fielder_group[catch[named]]),
+        'runouts': total(fielder_group[runout[named]]),
+        'balls_bowled': total(bowler_group[bye | plain]),
+        'dot_balls': total(bowler_group[plain & (runs_total == 0)]),
+        'wickets': total(wicket_bowler_group[wicket_kind != kinds.get('run out', -1)]),
+        'LBWs/Bowled': total(wicket_bowler_group[np.isin(wicket_kind, [kinds.get('bowled', -1), kinds.get('lbw', -1)])]),
+        'runs_conceded': total(bowler_group, np.where(wide, deliveries['wides'].to_numpy(np.int64), 0)
+                               + np.where(noball, deliveries['noballs'].to_numpy(np.int64) + runs_batter, 0)
+                               + np.where(plain, runs_total, 0)),
+        'stumpings': total(fielder_group[stumping[named]]),
+    }
+
+    result = pd.DataFrame({
+        'match': (unique_keys // player_count).astype(np.int32),
+        'player': (unique_keys % player_count).astype(np.int32),
+        'registered': unique_first_touch < WALK_START,
+        **stats,
+    })
+    if track_out:
+        # A dismissal marks the batter or non-striker it names as out
+        player_out = wickets['player_out'].to_numpy(np.int64)
+        out_key = match[wicket_delivery] * player_count + player_out
+        batter_out = (player_out >= 0) & (out_key == batter[wicket_delivery])
+        non_striker_out = (player_out >= 0) & ~batter_out & (out_key == non_striker[wicket_delivery])
+        dismissed = total(np.concatenate([batter_group[wicket_delivery[batter_out]], non_striker_group[wicket_delivery[non_striker_out]]])) > 0
+        batted = total(np.concatenate([batter_group, non_striker_group])) > 0
+        result['out'] = np.where(dismissed, 'out', np.where(batted, 'not out', 'DNB'))
+
+    # Rows by match, then by first touch; keys never touched are not rows
+    kept = np.flatnonzero(unique_first_touch < NOT_TOUCHED)
+    return result.iloc[kept[np.lexsort((unique_first_touch[kept], unique_keys[kept] // player_count))]].reset_index(drop=True)
+
+
+def format_matches(store, format_name, start_date=None, end_date=None):
+    """
+    Codes of the store's matches of one format, optionally within a date range, in archive order.
+    """
+    matches = store['matches']
+    wanted = np.array([match_format(match_type) == format_name for match_type in matches['match_type']], dtype=bool)
+    dates = pd.to_datetime(matches['date'], format="%Y-%m-%d")
+    if start_date:
+        wanted &= (dates >= pd.Timestamp(start_date)).to_numpy()
+    if end_date:
+        wanted &= (dates <= pd.Timestamp(end_date)).to_numpy()
+    return matches['match'].to_numpy()[wanted]
+
+
+def matchwise_table(store, format_name, start_date=None, end_date=None):
+    """
+    The MatchWise rows of one format, as player_match_stats() would produce them for every match of the store.
+
+    Args:
+        store (dict): Tables from load_delivery_store().
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        start_date (str, optional): Start date (inclusive) for filtering (YYYY-MM-DD).
+        end_date (str, optional): End date (inclusive) for filtering (YYYY-MM-DD).
+
+    Returns:
+        pd.DataFrame: The csv_fields(format_name) columns, matches in archive order.
+    """
+    store = select_matches(store, format_matches(store, format_name, start_date, end_date))
+
+    rows = aggregate_player_stats(store, MATCH_FORMATS[format_name]['track_out'])
+
+    # Registry ids and teams of registered players; players only met in the deliveries have neither
+    people = store['people'][store['people']['registered']]
+    team_names = np.append(store['teams']['name'].to_numpy(dtype=object), None)
+    people = pd.DataFrame({
+        'match': people['match'], 'player': people['player'], 'player_id': people['person_id'],
+        'team_name': team_names[people['team'].to_numpy()],
+    })
+    rows = rows.merge(people, on=['match', 'player'], how='left', sort=False)
+    for column in ('player_id', 'team_name'):
+        rows[column] = rows[column].astype(object).where(rows[column].notna(), None)
+
+    match_info = store['matches'].set_index('match')
+    rows['match_id'] = match_info['match_id'].reindex(rows['match']).to_numpy()
+    rows['player_name'] = store['players']['name'].to_numpy(dtype=object)[rows['player'].to_numpy()]
+    rows['date'] = match_info['date'].reindex(rows['match']).to_numpy()
+    rows['venue'] = match_info['city'].reindex(rows['match']).fillna("Unknown Venue").to_numpy()
+    rows['match_type'] = match_info['match_type'].astype(object).reindex(rows['match']).to_numpy()
+    rows['gender'] = match_info['gender'].astype(object).reindex(rows['match']).to_numpy()
+    return rows[csv_fields(format_name)]
+
+
+def MatchWise_from_store(store_dir, output_csvs, start_date=None, end_date=None):
+    """
+    Writes the MatchWise CSVs of several formats from a delivery store (see data_processing/delivery_store.py)
+    instead of walking the JSON again. Each CSV is identical to the one MatchWise() writes from the archive the
+    store was built from.
+
+    Every match of a format in the date range goes through aggregate_player_stats() in one call: the reductions
+    have a fixed cost per call, so they only beat the per-match dict walk on batches of matches.
+
+    Args:
+        store_dir (str): Directory of the delivery store.
+        output_csvs (dict): Output CSV path per format, e.g. {'ODI': ..., 'T20': ..., 'Test': ...}.
+        start_date (str, optional): Start date (inclusive) for filtering (YYYY-MM-DD).
+        end_date (str, optional): End date (inclusive) for filtering (YYYY-MM-DD).
+
+    Returns:
+        dict: Number of matches written per format.
+    """
+    store = load_delivery_store(store_dir)
+    match_counts = {}
+    for format_name, output_csv in output_csvs.items():
+        table = matchwise_table(store, format_name, start_date, end_date)
+        write_table(output_csv, table)
+        match_counts[format_name] = table['match_id'].nunique()
+        print(f"Data saved to {output_csv}")
+    return match_counts
+
+
+def head_to_head_table(store, format_name):
+    """
+    The head-to-head rows of one format, as head_to_head_stats() in data_processing/H2H.py would produce them for
+    every match of the store: one row per (match, batsman, bowler) pair, in order of the pair's first delivery.
+
+    Args:
+        store (dict): Tables from load_delivery_store().
+        format_name (str): 'ODI', 'T20' or 'Test'.
+
+    Returns:
+        pd.DataFrame: The h2h_fields(format_name) columns, matches in archive order.
+    """
+    store = select_matches(store, format_matches(store, format_name))
+    deliveries, wickets = store['deliveries'], store['wickets']
+    player_count = np.int64(max(len(store['players']), 1))
+
+    match = deliveries['match'].to_numpy(np.int64)
+    batter = deliveries['batter'].to_numpy(np.int64)
+    bowler = deliveries['bowler'].to_numpy(np.int64)
+    runs_batter = deliveries['runs_batter'].to_numpy(np.int64)
+    runs_total = deliveries['runs_total'].to_numpy(np.int64)
+
+    # Extras precedence: byes, then legbyes, then wides, then no-balls
+    extras_mask = deliveries['extras_mask'].to_numpy()
+    bye = (extras_mask & EXTRAS_BITS['byes']) != 0
+    legbye = ~bye & ((extras_mask & EXTRAS_BITS['legbyes']) != 0)
+    wide = ~bye & ~legbye & ((extras_mask & EXTRAS_BITS['wides']) != 0)
+    noball = ~bye & ~legbye & ~wide & ((extras_mask & EXTRAS_BITS['noballs']) != 0)
+    plain = ~(bye | legbye | wide | noball)
+    scoring = noball | plain
+
+    # One group per (match, batter, bowler), numbered in order of its first delivery
+    keys = (match * player_count + batter) * player_count + bowler
+    unique_keys, first, group = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    group = rank[group]
+    unique_keys, first = unique_keys[order], first[order]
+
+    def total(mask, weights=None):
+        return np.bincount(group[mask], None if weights is None else weights[mask], minlength=len(first)).astype(np.int64)
+
+    # A dismissal counts against the pair when it names the batter; its kind is the last such dismissal's
+    wicket_delivery = wickets['delivery'].to_numpy(np.int64)
+    batter_out = wickets['player_out'].to_numpy(np.int64) == batter[wicket_delivery]
+    out_delivery = wicket_delivery[batter_out]
+    out_kind = store['wicket_kinds'].set_index('kind')['name'].reindex(wickets['kind'][batter_out]).to_numpy(dtype=object)
+    innings = deliveries['innings'].to_numpy()[out_delivery]
+
+    def last_kind(mask):
+        kinds = np.full(len(first), "", dtype=object)
+        reversed_groups = group[out_delivery[mask]][::-1]
+        reversed_groups, last = np.unique(reversed_groups, return_index=True)
+        kinds[reversed_groups] = out_kind[mask][::-1][last]
+        return kinds
+
+    # Every registered or listed player's team in each match; the JSON walker falls back to "Unknown"
+    people = store['people']
+    team_names = np.append(store['teams']['name'].to_numpy(dtype=object), "Unknown")
+    people_keys = people['match'].to_numpy(np.int64) * player_count + people['player'].to_numpy(np.int64)
+    player_teams = pd.Series(team_names[people['team'].to_numpy()], index=people_keys)
+    registered = people[people['registered']]
+    player_ids = pd.Series(registered['person_id'].to_numpy(), index=people_keys[people['registered'].to_numpy()])
+
+    pair_match = unique_keys // (player_count * player_count)
+    pair_batter = match[first] * player_count + batter[first]
+    pair_bowler = match[first] * player_count + bowler[first]
+    player_names = store['players']['name'].to_numpy(dtype=object)
+    match_info = store['matches'].set_index('match')
+    venue_names = np.append(store['venues']['name'].to_numpy(dtype=object), None)
+    table = pd.DataFrame({
+        'match_id': match_info['match_id'].reindex(pair_match).to_numpy(),
+        'batsman_id': player_ids.reindex(pair_batter).to_numpy(),
+        'batsman_name': player_names[batter[first]],
+        'batsman_team': player_teams.reindex(pair_batter).fillna("Unknown").to_numpy(),
+        'bowler_id': player_ids.reindex(pair_bowler).to_numpy(),
+        'bowler_name': player_names[bowler[first]],
+        'bowler_team': player_teams.reindex(pair_bowler).fillna("Unknown").to_numpy(),
+        'runs_scored': total(scoring, runs_batter * noball + runs_total * plain),
+        'balls_faced': total(bye | legbye | scoring),
+        'runs_conceded': np.bincount(group, deliveries['byes'].to_numpy(np.int64) * bye
+                                     + deliveries['legbyes'].to_numpy(np.int64) * legbye
+                                     + deliveries['wides'].to_numpy(np.int64) * wide
+                                     + (deliveries['noballs'].to_numpy(np.int64) + runs_batter) * noball
+                                     + runs_total * plain, minlength=len(first)).astype(np.int64),
+        'balls_bowled': total(bye | legbye | wide | plain),
+        '4s': total(scoring & (runs_batter == 4)),
+        '6s': total(scoring & (runs_batter == 6)),
+        'wickets': np.bincount(group[out_delivery], minlength=len(first)).astype(np.int64),
+        'gender': match_info['gender'].astype(object).reindex(pair_match).to_numpy(),
+        'venue': venue_names[match_info['venue'].reindex(pair_match).to_numpy()],
+        'date': match_info['date'].reindex(pair_match).to_numpy(),
+        'match_type': match_info['match_type'].astype(object).reindex(pair_match).to_numpy(),
+    })
+    if format_name == 'Test':
+        table['wicket_type_1'] = last_kind(np.isin(innings, (1, 2)))
+        table['wicket_type_2'] = last_kind(np.isin(innings, (3, 4)))
+    else:
+        table['wicket_type'] = last_kind(np.ones(len(out_delivery), dtype=bool))
+    return table[h2h_fields(format_name)]
+
+
+def H2H_from_store(store_dir, output_csvs):
+    """
+    Writes the head-to-head CSVs of several formats from a delivery store instead of walking the JSON again. Each
+    CSV is identical to the one H2H() in data_processing/H2H.py writes from the archive the store was built from.
+
+    Args:
+        store_dir (str): Directory of the delivery store.
+        output_csvs (dict): Output CSV path per format, e.g. {'T20': 'CSVs/T20_H2H.csv'}.
+
+    Returns:
+        dict: Number of matches written per format.
+    """
+    store = load_delivery_store(store_dir)
+    match_counts = {}
+    for format_name, output_csv in output_csvs.items():
+        write_table(output_csv, head_to_head_table(store, format_name))
+        match_counts[format_name] = len(format_matches(store, format_name))
+        print(f"Data has been written to {output_csv}")
+    return match_counts
+
+
+def overall_player_table(store):
+    """
+    Every player's overall totals across the matches of a store, as Overall_PlayerStats() in
+    data_processing/PlayerStats.py would total them from the JSON.
+
+    Its rules differ from the MatchWise ones: every delivery is a ball faced and bowled, the total is conceded,
+    every dismissal (run outs included) is a wicket to the bowler and every named fielder of a catch, run out or
+    stumping is credited. An innings is counted once per (match, innings) a player batted or bowled in. Players
+    are identified by name, ordered by the first delivery that touches them, and carry the registry id of the
+    last match they appear in ("Unknown" when it has none).
+
+    Args:
+        store (dict): Tables from load_delivery_store().
+
+    Returns:
+        pd.DataFrame: The OVERALL_CSV_FIELDS columns, one row per player.
+    """
+    deliveries, wickets, fielders = store['deliveries'], store['wickets'], store['fielders']
+    kinds = dict(zip(store['wicket_kinds']['name'], store['wicket_kinds']['kind']))
+    player_names = store['players']['name'].to_numpy(dtype=object)
+    player_count = len(player_names)
+
+    match = deliveries['match'].to_numpy(np.int64)
+    innings = match * 128 + deliveries['innings'].to_numpy(np.int64)
+    batter = deliveries['batter'].to_numpy(np.int64)
+    bowler = deliveries['bowler'].to_numpy(np.int64)
+    runs_batter = deliveries['runs_batter'].to_numpy(np.int64)
+    runs_total = deliveries['runs_total'].to_numpy(np.int64)
+
+    wicket_delivery = wickets['delivery'].to_numpy(np.int64)
+    wicket_kind = wickets['kind'].to_numpy()
+    fielder_wicket = fielders['wicket'].to_numpy(np.int64)
+    fielder = fielders['fielder'].to_numpy(np.int64)
+    named = (fielder >= 0) & (player_names[np.maximum(fielder, 0)] != "") if player_count else np.zeros(len(fielder), dtype=bool)
+    fielder, fielder_wicket = fielder[named], fielder_wicket[named]
+    fielder_kind = wicket_kind[fielder_wicket]
+    fielder_delivery = wicket_delivery[fielder_wicket]
+
+    def total(players, weights=None):
+        return np.bincount(players, weights, minlength=player_count).astype(np.int64)
+
+    def innings_count(players):
+        return total(np.unique(innings * player_count + players) % player_count)
+
+    totals = {
+        'batting_innings': innings_count(batter),
+        'bowling_innings': innings_count(bowler),
+        'total_runs_scored': total(batter, runs_batter),
+        'total_balls_faced': total(batter),
+        'total_fours': total(batter[runs_batter == 4]),
+        'total_sixes': total(batter[runs_batter == 6]),
+        'total_catches': total(fielder[fielder_kind == kinds.get('caught', -1)]),
+        'total_runouts': total(fielder[fielder_kind == kinds.get('run out', -1)]),
+        'total_balls_bowled': total(bowler),
+        'total_dot_balls': total(bowler[runs_total == 0]),
+        'total_wickets': total(bowler[wicket_delivery]),
+        'total_LBWs/Bowled': total(bowler[wicket_delivery[np.isin(wicket_kind, [kinds.get('bowled', -1), kinds.get('lbw', -1)])]]),
+        'total_runs_conceded': total(bowler, runs_total),
+        'total_stumpings': total(fielder[fielder_kind == kinds.get('stumped', -1)]),
+    }
+
+    # Each delivery touches its batter, then its bowler, then its named fielders in order
+    fielder_rank = np.arange(len(fielder), dtype=np.int64) - np.searchsorted(fielder_delivery, fielder_delivery)
+    touched = np.concatenate([batter, bowler, fielder])
+    touch_step = np.concatenate([np.arange(len(batter), dtype=np.int64) * 1024, np.arange(len(bowler), dtype=np.int64) * 1024 + 1,
+                                 fielder_delivery * 1024 + 2 + np.minimum(fielder_rank, 1021)])
+    touch_match = np.concatenate([match, match, match[fielder_delivery]])
+    first_step = np.full(player_count, np.iinfo(np.int64).max)
+    np.minimum.at(first_step, touched, touch_step)
+    last_match = np.full(player_count, -1, dtype=np.int64)
+    np.maximum.at(last_match, touched, touch_match)
+    players = np.flatnonzero(last_match >= 0)
+    players = players[np.argsort(first_step[players], kind='stable')]
+
+    people = store['people'][store['people']['registered']]
+    person_ids = pd.Series(people['person_id'].to_numpy(),
+                           index=people['match'].to_numpy(np.int64) * player_count + people['player'].to_numpy(np.int64))
+    table = pd.DataFrame({
+        'player_id': person_ids.reindex(last_match[players] * player_count + players).fillna("Unknown").astype(str).to_numpy(),
+        'player_name': player_names[players],
+        **{field: values[players] for field, values in totals.items()},
+    })
+    return table[OVERALL_CSV_FIELDS]
+
+
+def Overall_PlayerStats_from_store(store_dir, output_csv):
+    """
+    Writes every player's overall totals from a delivery store instead of walking the JSON again. The CSV is
+    identical to the one Overall_PlayerStats() writes from the archive the store was built from.
+
+    Args:
+        store_dir (str): Directory of the delivery store.
+        output_csv (str): Path of the overall stats CSV.
+
+    Returns:
+        int: Number of players written.
+    """
+    table = overall_player_table(load_delivery_store(store_dir, ['deliveries', 'wickets', 'fielders', 'people', 'players', 'wicket_kinds']))
+    write_table(output_csv, table)
+    print(f"Overall stats written to {output_csv}")
+    return len(table)
+
+
+def write_table(output_csv, table):
+    """
+    Writes a table to CSV the way csv.writer writes Python values, as the JSON walkers do.
+    """
+    write_rows(output_csv, table.columns, zip(*(table[column].tolist() for column in table.columns)))
+
+
+def write_rows(output_csv, fields, rows):
+    """
+    Writes a header and rows of Python values to a CSV, creating its directory if needed.
+    """
+    os.makedirs(os.path.dirname(output_csv) or '.', exist_ok=True)
+    with open(output_csv, mode="w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(fields)
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    # Per-match cost of the dict walk against the grouped reductions over every match of a format at once, as the
+    # ingest runs them (MatchWise_from_store), and on smaller batches
+    import time
+    from data_processing.MatchWise import player_match_stats
+    from data_processing.delivery_store import update_delivery_store
+    from data_processing.match_json import loads
+    from data_processing.match_source import match_id_of, read_match_file
+
+    json_dir = sys.argv[1] if len(sys.argv) > 1 else "../ipl_json.zip"
+    store_dir = sys.argv[2] if len(sys.argv) > 2 else "../data/interim/delivery_store"
+
+    update_delivery_store(json_dir, store_dir)
+    store = load_delivery_store(store_dir)
+    format_name = max(MATCH_FORMATS, key=lambda format_name: len(format_matches(store, format_name)))
+    match_codes = format_matches(store, format_name)
+    files = store['matches']['file'].to_numpy()[match_codes]
+    parsed = [loads(read_match_file(json_dir, file_name)) for file_name in files]
+    track_out = MATCH_FORMATS[format_name]['track_out']
+
+    start = time.perf_counter()
+    for file_name, match_data in zip(files, parsed):
+        player_match_stats(match_data, match_id_of(file_name), track_out)
+    walk = (time.perf_counter() - start) / len(files)
+    print(f"{len(files)} {format_name} matches, {len(select_matches(store, match_codes)['deliveries']) / len(files):.0f} deliveries/match")
+    print(f"dict walk                    {walk * 1e6:9.1f} us/match")
+
+    start = time.perf_counter()
+    matchwise_table(store, format_name)
+    table = (time.perf_counter() - start) / len(files)
+    print(f"matchwise_table, all at once {table * 1e6:9.1f} us/match ({walk / table:.2f}x)")
+
+    for batch_size in (1, 10, 100, len(files)):
+        batches = [select_matches(store, match_codes[i:i + batch_size]) for i in range(0, len(files), batch_size)]
+        start = time.perf_counter()
+        for batch in batches:
+            aggregate_player_stats(batch, track_out)
+        grouped = (time.perf_counter() - start) / len(files)
+        print(f"grouped, {batch_size:4d} per call      {grouped * 1e6:9.1f} us/match ({walk / grouped:.2f}x)")
@@ -0,0 +1,410 @@
+import os
+import sys
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+# pyarrow is optional for the rest of the pipeline but the store is written as Feather files
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.ingest_manifest import is_unchanged
+from data_processing.match_json import loads
+from data_processing.match_source import list_match_files, map_match_files, match_file_stat, match_id_of, read_match_file
+
+STORE_VERSION = 2
+
+# Cricsheet dismissal kinds in enum order; kinds not listed here are appended to the store's wicket_kinds table
+WICKET_KINDS = [
+    'bowled', 'caught', 'caught and bowled', 'lbw', 'stumped', 'run out', 'hit wicket', 'retired hurt',
+    'retired out', 'retired not out', 'obstructing the field', 'hit the ball twice', 'handled the ball', 'timed out'
+]
+
+# Extras types, each with its own int8 column and a bit in extras_mask marking that the key was present
+EXTRAS_TYPES = ['byes', 'legbyes', 'wides', 'noballs', 'penalty']
+EXTRAS_BITS = {extras_type: 1 << bit for bit, extras_type in enumerate(EXTRAS_TYPES)}
+
+# Tables of a store and their column dtypes; player, team and venue columns hold codes into the name tables
+# (-1 where the JSON has no name), match holds a row of matches, delivery a row of deliveries, wicket a row of wickets
+STORE_SCHEMA = {
+    'matches': {
+        'match': np.int32, 'match_id': object, 'file': object, 'date': object, 'match_type': 'category',
+        'gender': 'category', 'venue': np.int16, 'city': object, 'team_1': np.int16, 'team_2': np.int16,
+        # The file as it was parsed, so update_delivery_store() only parses files that changed since
+        'mtime_ns': np.int64, 'size': np.int64, 'sha256': object,
+    },
+    # Every name in the registry, in registry order, then players listed in a team but missing from the registry
+    'people': {
+        'match': np.int32, 'player': np.int32, 'person_id': object, 'team': np.int16, 'registered': bool,
+    },
+    'deliveries': {
+        'match': np.int32, 'innings': np.int8, 'super_over': bool, 'over': np.int16, 'ball': np.int16,
+        'batting_team': np.int16, 'batter': np.int32, 'bowler': np.int32, 'non_striker': np.int32,
+        'runs_batter': np.int8, 'runs_extras': np.int8, 'runs_total': np.int8,
+        'byes': np.int8, 'legbyes': np.int8, 'wides': np.int8, 'noballs': np.int8, 'penalty': np.int8,
+        'extras_mask': np.int8,
+    },
+    'wickets': {'delivery': np.int64, 'kind': np.int8, 'player_out': np.int32},
+    'fielders': {'wicket': np.int32, 'fielder': np.int32, 'substitute': bool},
+    'players': {'player': np.int32, 'name': object},
+    'teams': {'team': np.int16, 'name': object},
+    'venues': {'venue': np.int16, 'name': object},
+    'wicket_kinds': {'kind': np.int8, 'name': object},
+}
+
+
+# Columns holding names (or enum names) in match_deliveries() output, coded by build_delivery_store()
+_NAME_COLUMNS = {
+    'deliveries': {'batting_team': 'teams', 'batter': 'players', 'bowler': 'players', 'non_striker': 'players'},
+    'wickets': {'kind': 'wicket_kinds', 'player_out': 'players'},
+    'fielders': {'fielder': 'players'},
+}
+
+
+def match_deliveries(source, file_name):
+    """
+    Flattens one Cricsheet match file into per-delivery, per-wicket and per-fielder columns.
+
+    Names are returned as strings; build_delivery_store() turns them into integer codes shared across the archive.
+
+    Args:
+        source (str): Directory or zip / tar archive holding the file (see data_processing/match_source.py).
+        file_name (str): File (or archive member) name.
+
+    Returns:
+        dict: 'match', 'people', 'deliveries', 'wickets' and 'fielders' of the match (numeric columns as typed
+        arrays, name columns as lists), or None if the file is not valid JSON.
+    """
+    content = read_match_file(source, file_name)
+    try:
+        match_data = loads(content)
+    except json.JSONDecodeError:
+        return None
+    info = match_data['info']
+    teams = info.get('teams', [])
+
+    match = {
+        'match_id': match_id_of(file_name),
+        'file': file_name,
+        'date': info['dates'][0],
+        'match_type': info['match_type'],
+        'gender': info.get('gender'),
+        'venue': info.get('venue'),
+        'city': info.get('city'),
+        'team_1': teams[0] if len(teams) > 0 else None,
+        'team_2': teams[1] if len(teams) > 1 else None,
+        'sha256': hashlib.sha256(content).hexdigest(),
+    }
+
+    # A player listed in several teams keeps the last one, as the MatchWise and H2H walkers do
+    player_teams = {}
+    for team_name, team_players in info.get('players', {}).items():
+        for player_name in team_players:
+            player_teams[player_name] = team_name
+    registry = info.get('registry', {}).get('people', {})
+    people = [(name, str(person_id), player_teams.get(name), True) for name, person_id in registry.items()]
+    people += [(name, None, team_name, False) for name, team_name in player_teams.items() if name not in registry]
+
+    deliveries = {column: [] for column in STORE_SCHEMA['deliveries'] if column != 'match'}
+    wickets = {'delivery': [], 'kind': [], 'player_out': []}
+    fielders = {'wicket': [], 'fielder': [], 'substitute': []}
+    no_extras = (0,) * len(EXTRAS_TYPES)
+    for innings_number, inning in enumerate(match_data.get('innings', []), start=1):
+        super_over = bool(inning.get('super_over', False))
+        batting_team = inning.get('team')
+        for over in inning.get('overs', []):
+            over_number = over['over']
+            for ball, delivery in enumerate(over.get('deliveries', []), start=1):
+                deliveries['innings'].append(innings_number)
+                deliveries['super_over'].append(super_over)
+                deliveries['over'].append(over_number)
+                deliveries['ball'].append(ball)
+                deliveries['batting_team'].append(batting_team)
+                deliveries['batter'].append(delivery['batter'])
+                deliveries['bowler'].append(delivery['bowler'])
+                deliveries['non_striker'].append(delivery['non_striker'])
+                runs = delivery['runs']
+                deliveries['runs_batter'].append(runs['batter'])
+                deliveries['runs_extras'].append(runs['extras'])
+                deliveries['runs_total'].append(runs['total'])
+
+                extras = delivery.get('extras')
+                extras_values, extras_mask = no_extras, 0
+                if extras:
+                    extras_values = tuple(extras.get(extras_type, 0) for extras_type in EXTRAS_TYPES)
+                    for extras_type in extras:
+                        extras_mask |= EXTRAS_BITS.get(extras_type, 0)
+                for extras_type, value in zip(EXTRAS_TYPES, extras_values):
+                    deliveries[extras_type].append(value)
+                deliveries['extras_mask'].append(extras_mask)
+
+                for wicket_info in delivery.get('wickets', ()):
+                    for fielder_info in wicket_info.get('fielders', ()):
+                        fielders['wicket'].append(len(wickets['kind']))
+                        fielders['fielder'].append(fielder_info.get('name'))
+                        fielders['substitute'].append(bool(fielder_info.get('substitute', False)))
+                    wickets['delivery'].append(len(deliveries['batter']) - 1)
+                    wickets['kind'].append(wicket_info['kind'])
+                    wickets['player_out'].append(wicket_info.get('player_out') or None)
+
+    # Numeric columns travel back from worker processes as typed arrays; names stay strings until coded
+    for table, columns in (('deliveries', deliveries), ('wickets', wickets), ('fielders', fielders)):
+        for column, values in columns.items():
+            if column not in _NAME_COLUMNS[table]:
+                columns[column] = np.array(values, dtype=STORE_SCHEMA[table][column])
+
+    return {'match': match, 'people': people, 'deliveries': deliveries, 'wickets': wickets, 'fielders': fielders}
+
+
+class _Codes(dict):
+    """
+    name -> integer code, assigned in order of first appearance; None maps to -1.
+    """
+
+    def encode(self, names, dtype):
+        return np.array([-1 if name is None else self.setdefault(name, len(self)) for name in names], dtype=dtype)
+
+    def table(self, code_column, dtype):
+        return pd.DataFrame({code_column: np.arange(len(self), dtype=dtype), 'name': list(self)})
+
+
+def _parse_matches(json_dir, file_names, codes, counts, workers=1, chunksize=64):
+    """
+    Flattens match files with match_deliveries() and codes their names, numbering matches, deliveries and wickets
+    on from counts, the row counts of the matches, deliveries and wickets tables they are appended to.
+
+    Returns:
+        dict: The 'matches', 'people', 'deliveries', 'wickets' and 'fielders' rows of the files that are valid JSON.
+    """
+    match_count, delivery_count, wicket_count = counts
+    matches = []
+    columns = {table: {column: [] for column in STORE_SCHEMA[table]} for table in ('people', 'deliveries', 'wickets', 'fielders')}
+
+    for file_name, parsed in zip(file_names, map_match_files(match_deliveries, json_dir, file_names, workers, chunksize)):
+        if parsed is None:
+            continue
+        match_code = match_count + len(matches)
+        stat = match_file_stat(json_dir, file_name)
+        match = dict(parsed['match'], match=match_code, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        match['venue'] = codes['venues'].encode([match['venue']], np.int16)[0]
+        match['team_1'], match['team_2'] = codes['teams'].encode([match['team_1'], match['team_2']], np.int16)
+        matches.append(match)
+
+        names, person_ids, team_names, registered = zip(*parsed['people']) if parsed['people'] else ((), (), (), ())
+        people = columns['people']
+        people['match'].append(np.full(len(names), match_code, dtype=np.int32))
+        people['player'].append(codes['players'].encode(names, np.int32))
+        people['person_id'].append(np.array(person_ids, dtype=object))
+        people['team'].append(codes['teams'].encode(team_names, np.int16))
+        people['registered'].append(np.array(registered, dtype=bool))
+
+        parsed['deliveries']['match'] = np.full(len(parsed['deliveries']['batter']), match_code, dtype=np.int32)
+        parsed['wickets']['delivery'] += delivery_count
+        parsed['fielders']['wicket'] += wicket_count
+        for table in ('deliveries', 'wickets', 'fielders'):
+            for column, values in parsed[table].items():
+                if column in _NAME_COLUMNS[table]:
+                    values = codes[_NAME_COLUMNS[table][column]].encode(values, STORE_SCHEMA[table][column])
+                columns[table][column].append(values)
+        delivery_count += len(parsed['deliveries']['batter'])
+        wicket_count += len(parsed['wickets']['kind'])
+
+    tables = {'matches': pd.DataFrame(matches, columns=list(STORE_SCHEMA['matches']))}
+    for table, table_columns in columns.items():
+        tables[table] = pd.DataFrame({
+            column: np.concatenate(parts) if parts else np.array([], dtype=STORE_SCHEMA[table][column])
+            for column, parts in table_columns.items()
+        })
+    return tables
+
+
+def _write_store(json_dir, store_dir, tables, codes):
+    """
+    Writes the match tables and the name tables of codes as a store of json_dir.
+    """
+    tables = dict(tables)
+    tables['players'] = codes['players'].table('player', np.int32)
+    tables['teams'] = codes['teams'].table('team', np.int16)
+    tables['venues'] = codes['venues'].table('venue', np.int16)
+    tables['wicket_kinds'] = codes['wicket_kinds'].table('kind', np.int8)
+
+    # Write each table to a temporary file first so readers never see a half-written store
+    os.makedirs(store_dir, exist_ok=True)
+    for table, df in tables.items():
+        df = df.astype(STORE_SCHEMA[table])
+        path = os.path.join(store_dir, f"{table}.feather")
+        feather.write_feather(df, path + '.tmp')
+        os.replace(path + '.tmp', path)
+    with open(os.path.join(store_dir, 'store.json'), "w") as f:
+        json.dump({'version': STORE_VERSION, 'json_dir': os.path.abspath(json_dir)}, f)
+
+    print(f"Delivery store written to {store_dir}")
+    return {table: len(df) for table, df in tables.items()}
+
+
+def build_delivery_store(json_dir, store_dir, workers=1, chunksize=64):
+    """
+    Converts a Cricsheet directory or archive into a delivery-level columnar store.
+
+    Every match file is walked once and flattened into Feather tables (see STORE_SCHEMA): matches, the people of
+    each match (registry id and team), one row per delivery, per wicket and per fielder of a wicket, plus the name
+    tables that the integer player, team, venue and wicket-kind codes index. Runs and extras are int8 columns, so
+    the whole archive fits in memory and per-player aggregations become group-bys over the deliveries table
+    instead of another walk over the JSON.
+
+    Args:
+        json_dir (str): Directory, or zip / tar archive such as ipl_json.zip, containing the JSON match data.
+        store_dir (str): Directory the store's Feather files are written to, created if missing.
+        workers (int, optional): Number of parsing processes; 1 parses in this process, None uses every CPU.
+        chunksize (int, optional): Files per task sent to a worker process.
+
+    Returns:
+        dict: Row count per table.
+    """
+    if feather is None:
+        raise ImportError("build_delivery_store needs pyarrow to write Feather files")
+
+    codes = {'players': _Codes(), 'teams': _Codes(), 'venues': _Codes()}
+    codes['wicket_kinds'] = _Codes((kind, code) for code, kind in enumerate(WICKET_KINDS))
+    tables = _parse_matches(json_dir, list_match_files(json_dir), codes, (0, 0, 0), workers, chunksize)
+    return _write_store(json_dir, store_dir, tables, codes)
+
+
+def update_delivery_store(json_dir, store_dir, workers=1, chunksize=64):
+    """
+    Brings the delivery store of a Cricsheet directory or archive up to date, building it if there is none.
+
+    Every match of the store records the mtime, size and SHA-256 of the file it was parsed from, so only new or
+    changed files are parsed (compared as in data_processing/ingest_manifest.py). Their matches are appended after
+    the others in archive order, and the matches of changed or deleted files are dropped, so the store holds the
+    same matches as a rebuild, with the newly parsed ones at the end. Names keep their codes. A store written by
+    another version or for another json_dir is rebuilt. When nothing changed the store is not rewritten.
+
+    Args:
+        json_dir (str): Directory, or zip / tar archive such as ipl_json.zip, containing the JSON match data.
+        store_dir (str): The store's directory, created if missing.
+        workers (int, optional): Number of parsing processes; 1 parses in this process, None uses every CPU.
+        chunksize (int, optional): Files per task sent to a worker process.
+
+    Returns:
+        dict: Number of matches 'parsed' (files that are not valid JSON are not counted), 'dropped' and 'kept'.
+    """
+    if feather is None:
+        raise ImportError("update_delivery_store needs pyarrow to read and write Feather files")
+    try:
+        with open(os.path.join(store_dir, 'store.json'), "r") as f:
+            store_info = json.load(f)
+    except (OSError, ValueError):
+        store_info = {}
+    if store_info.get('version') != STORE_VERSION or store_info.get('json_dir') != os.path.abspath(json_dir):
+        match_count = build_delivery_store(json_dir, store_dir, workers, chunksize)['matches']
+        return {'parsed': match_count, 'dropped': 0, 'kept': 0}
+
+    store = load_delivery_store(store_dir)
+    matches = store['matches']
+    rows = dict(zip(matches['file'], range(len(matches))))
+    mtimes = matches['mtime_ns'].to_numpy(np.int64).copy()
+    keep = np.zeros(len(matches), dtype=bool)
+    to_parse = []
+    for file_name in list_match_files(json_dir):
+        row = rows.get(file_name)
+        if row is not None:
+            entry = {'mtime_ns': int(mtimes[row]), 'size': int(matches['size'].iat[row]), 'sha256': matches['sha256'].iat[row]}
+            if is_unchanged(entry, json_dir, file_name):
+                keep[row] = True
+                mtimes[row] = entry['mtime_ns']
+                continue
+        to_parse.append(file_name)
+
+    # Kept matches are renumbered in store order; the new ones are numbered on from them
+    kept = select_matches(store, np.flatnonzero(keep))
+    renumbered = np.full(len(matches), -1, dtype=np.int64)
+    renumbered[keep] = np.arange(keep.sum())
+    kept['matches'] = kept['matches'].assign(match=renumbered[keep], mtime_ns=mtimes[keep])
+    kept['people'] = kept['people'].assign(match=renumbered[kept['people']['match'].to_numpy()])
+    kept['deliveries'] = kept['deliveries'].assign(match=renumbered[kept['deliveries']['match'].to_numpy()])
+
+    codes = {
+        'players': _Codes(zip(store['players']['name'], store['players']['player'])),
+        'teams': _Codes(zip(store['teams']['name'], store['teams']['team'])),
+        'venues': _Codes(zip(store['venues']['name'], store['venues']['venue'])),
+        'wicket_kinds': _Codes(zip(store['wicket_kinds']['name'], store['wicket_kinds']['kind'])),
+    }
+    counts = (len(kept['matches']), len(kept['deliveries']), len(kept['wickets']))
+    parsed = _parse_matches(json_dir, to_parse, codes, counts, workers, chunksize)
+    changes = {'parsed': len(parsed['matches']), 'dropped': int(len(matches) - keep.sum()), 'kept': int(keep.sum())}
+    if changes['parsed'] or changes['dropped'] or (mtimes != matches['mtime_ns'].to_numpy()).any():
+        tables = {table: pd.concat([kept[table], parsed[table]], ignore_index=True) for table in parsed}
+        _write_store(json_dir, store_dir, tables, codes)
+    return changes
+
+
+def select_matches(store, match_codes):
+    """
+    Restricts the match tables of a delivery store to some matches, renumbering the wicket and fielder links.
+
+    Args:
+        store (dict): Tables from load_delivery_store().
+        match_codes (array-like): Codes (the 'match' column) of the matches to keep.
+
+    Returns:
+        dict: The same tables, with only the rows of those matches (in store order); name tables are shared.
+    """
+    keep = np.zeros(len(store['matches']), dtype=bool)
+    keep[np.asarray(match_codes, dtype=np.int64)] = True
+    deliveries, wickets, fielders = store['deliveries'], store['wickets'], store['fielders']
+
+    delivery_kept = keep[deliveries['match'].to_numpy()]
+    delivery_index = np.cumsum(delivery_kept) - 1
+    wicket_kept = delivery_kept[wickets['delivery'].to_numpy()]
+    wicket_index = np.cumsum(wicket_kept) - 1
+    fielder_kept = wicket_kept[fielders['wicket'].to_numpy()]
+
+    selected = dict(store)
+    selected['matches'] = store['matches'][keep[store['matches']['match'].to_numpy()]]
+    selected['people'] = store['people'][keep[store['people']['match'].to_numpy()]]
+    selected['deliveries'] = deliveries[delivery_kept]
+    selected['wickets'] = wickets[wicket_kept].assign(delivery=delivery_index[wickets['delivery'].to_numpy()[wicket_kept]])
+    selected['fielders'] = fielders[fielder_kept].assign(
+        wicket=wicket_index[fielders['wicket'].to_numpy()[fielder_kept]].astype(np.int32)
+    )
+    return selected
+
+
+def load_delivery_store(store_dir, tables=None):
+    """
+    Loads the tables of a store written by build_delivery_store() or update_delivery_store().
+
+    Args:
+        store_dir (str): The store's directory.
+        tables (Iterable[str], optional): Tables to load (keys of STORE_SCHEMA); all of them by default.
+
+    Returns:
+        dict: table name -> pd.DataFrame.
+    """
+    if feather is None:
+        raise ImportError("load_delivery_store needs pyarrow to read Feather files")
+    with open(os.path.join(store_dir, 'store.json'), "r") as f:
+        if json.load(f).get('version') != STORE_VERSION:
+            raise ValueError(f"{store_dir} was written by another version of the delivery store; rebuild it")
+    return {table: feather.read_feather(os.path.join(store_dir, f"{table}.feather")) for table in (tables or STORE_SCHEMA)}
+
+
+if __name__ == "__main__":
+    import time
+
+    json_dir = "../ipl_json.zip"
+    store_dir = "../data/interim/delivery_store"
+
+    start = time.perf_counter()
+    print(update_delivery_store(json_dir, store_dir))
+    print(f"Updated in {time.perf_counter() - start:.2f}s")
+
+    # Any aggregation is now a group-by over the codes, e.g. the top run scorers of the archive
+    store = load_delivery_store(store_dir, ['deliveries', 'players'])
+    runs = store['deliveries'].groupby('batter')['runs_batter'].sum().nlargest(5)
+    print(pd.Series(runs.values, index=store['players']['name'].values[runs.index]))
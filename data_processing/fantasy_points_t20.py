@@ -1,5 +1,10 @@
+import os
+import sys
 import pandas as pd
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.fantasy_scoring import fantasy_points
+
 
 def calculate_fantasy_points(player: pd.core.series.Series):
     """
@@ -127,8 +132,8 @@ def add_fantasy_points(input_file: str, output_file: str):
     # Load the data
     df = pd.read_csv(input_file)
     
-    # Calculate fantasy points for each player
-    df['fantasy_points'] = df.apply(calculate_fantasy_points, axis=1)
+    # Calculate fantasy points for each player, column-wise (same points as calculate_fantasy_points)
+    df['fantasy_points'] = fantasy_points(df)
     
     # Sort the dataframe by 'date' and 'match_id' to ensure that matches with the same match_id are grouped together
     df = df.sort_values(by=['date', 'match_id'], ascending=[True, True])
@@ -0,0 +1,193 @@
+import json
+import operator
+import numpy as np
+import pandas as pd
+
+LIMITED_OVERS_TYPES = ('IT20', 'ODM', 'ODI', 'T20')
+T20_TYPES = ('T20', 'IT20')
+ODI_TYPES = ('ODI', 'ODM')
+
+# Ratio metrics that bands can be defined on: numerator / (denominator / per) * scale, the exact expressions
+# calculate_fantasy_points() uses, so values on a band edge fall on the same side
+RATIO_METRICS = {
+    'strike_rate': {'numerator': 'runs_scored', 'denominator': 'balls_faced', 'per': 1, 'scale': 100},
+    'economy_rate': {'numerator': 'runs_conceded', 'denominator': 'balls_bowled', 'per': 6, 'scale': 1},
+}
+
+# Columns of a rule set's bands table. Within one rule, the first band whose match types, requirements and
+# interval match a row gives its points; rules add up. match_types None applies to every match type, low / high
+# None leave the interval open, closed is 'left' [low, high), 'right' (low, high] or 'both' [low, high], and
+# requires is a (column, operator, value) condition, false when the column is missing.
+BAND_COLUMNS = ['rule', 'match_types', 'metric', 'low', 'high', 'closed', 'points', 'requires']
+
+_OPERATORS = {'==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+
+
+def _bands(rule, match_types, metric, requires, bands):
+    return [dict(zip(BAND_COLUMNS, (rule, match_types, metric, low, high, closed, points, requires)))
+            for low, high, closed, points in bands]
+
+
+# The scoring of calculate_fantasy_points() in data_processing/fantasy_points_*.py, as a rule set
+DREAM11_RULES = {
+    'per_unit': {
+        'runs_scored': 1, 'no_of_fours': 1, 'no_of_sixes': 2,
+        'wickets': 25, 'LBWs/Bowled': 8,
+        'no_of_catches': 8, 'stumpings': 12, 'runouts': (6 + 12) // 2,
+    },
+    'bands': (
+        _bands('milestone', None, 'runs_scored', None, [(100, None, 'left', 16), (50, 100, 'left', 8)])
+        + _bands('milestone', T20_TYPES, 'runs_scored', None, [(30, 50, 'left', 4)])
+        + _bands('duck', LIMITED_OVERS_TYPES, 'runs_scored', ('out', '==', 'out'), [(0, 0, 'both', -2)])
+        + _bands('strike_rate', T20_TYPES, 'strike_rate', ('balls_faced', '>=', 10), [
+            (170, None, 'right', 6), (150, 170, 'right', 4), (130, 150, 'right', 2),
+            (60, 70, 'left', -2), (50, 60, 'left', -4), (None, 50, 'left', -6)])
+        + _bands('strike_rate', ODI_TYPES, 'strike_rate', ('balls_faced', '>=', 10), [
+            (140, None, 'right', 6), (120, 140, 'right', 4), (100, 120, 'right', 2),
+            (40, 50, 'left', -2), (30, 40, 'left', -4), (None, 30, 'left', -6)])
+        + _bands('wicket_haul', None, 'wickets', None, [(5, None, 'left', 16), (4, 5, 'left', 8), (3, 4, 'left', 4)])
+        # Economy from 2 overs bowled; the ODI bands apply to 'ODI' only, not 'ODM', as in calculate_fantasy_points()
+        + _bands('economy_rate', T20_TYPES, 'economy_rate', ('balls_bowled', '>=', 12), [
+            (None, 5, 'left', 6), (5, 6, 'left', 4), (6, 7, 'left', 2),
+            (10, 11, 'left', -2), (11, 12, 'left', -4), (12, None, 'left', -6)])
+        + _bands('economy_rate', ('ODI',), 'economy_rate', ('balls_bowled', '>=', 12), [
+            (None, 2.5, 'left', 6), (2.5, 3.5, 'left', 4), (3.5, 4.5, 'left', 2),
+            (7, 8, 'left', -2), (8, 9, 'left', -4), (9, None, 'left', -6)])
+    ),
+}
+
+
+def load_rules(path):
+    """
+    Loads a rule set from a JSON file: {"per_unit": {column: points}, "bands": [{BAND_COLUMNS...}]}, with null
+    for open interval ends and match_types, and requires as [column, operator, value].
+
+    Args:
+        path (str): Path of the JSON file.
+
+    Returns:
+        dict: The rule set, usable with compile_scoring() and fantasy_points().
+    """
+    with open(path, "r") as f:
+        rules = json.load(f)
+    for band in rules.get('bands', []):
+        if band.get('match_types') is not None:
+            band['match_types'] = tuple(band['match_types'])
+        if band.get('requires') is not None:
+            band['requires'] = tuple(band['requires'])
+    return rules
+
+
+def compile_scoring(rule_sets):
+    """
+    Compiles rule sets into a vectorized scoring kernel.
+
+    Every band becomes a boolean mask built from shared pieces: each metric, match-type set, requirement and
+    interval is evaluated once per call however many bands and rule sets use it, and each rule is one np.select
+    over its bands. Scoring several rule sets therefore costs little more than scoring one.
+
+    Args:
+        rule_sets (dict): name -> rule set ({'per_unit': ..., 'bands': ...}, see DREAM11_RULES).
+
+    Returns:
+        callable: kernel(df) -> pd.DataFrame with one column of points per rule set, in rule_sets order.
+    """
+    compiled = {}
+    for name, rules in rule_sets.items():
+        rule_bands = {}
+        for band in rules.get('bands', []):
+            band = dict(zip(BAND_COLUMNS, (band.get(column) for column in BAND_COLUMNS)))
+            if band['closed'] not in ('left', 'right', 'both'):
+                raise ValueError(f"Rule set {name!r}: closed must be 'left', 'right' or 'both', not {band['closed']!r}")
+            if band['requires'] is not None and band['requires'][1] not in _OPERATORS:
+                raise ValueError(f"Rule set {name!r}: unknown operator {band['requires'][1]!r}")
+            band['match_types'] = None if band['match_types'] is None else tuple(band['match_types'])
+            band['requires'] = None if band['requires'] is None else tuple(band['requires'])
+            rule_bands.setdefault(band['rule'], []).append(band)
+        compiled[name] = (dict(rules.get('per_unit', {})), list(rule_bands.values()))
+
+    def kernel(df):
+        cache = {}
+
+        def metric(name):
+            if ('metric', name) not in cache:
+                if name in df:
+                    cache['metric', name] = df[name].to_numpy()
+                else:
+                    spec = RATIO_METRICS[name]
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        cache['metric', name] = (df[spec['numerator']] / (df[spec['denominator']] / spec['per']) * spec['scale']).to_numpy()
+            return cache['metric', name]
+
+        def mask(band):
+            key = ('band', band['match_types'], band['metric'], band['low'], band['high'], band['closed'], band['requires'])
+            if key not in cache:
+                values = metric(band['metric'])
+                selected = np.ones(len(df), dtype=bool)
+                if band['match_types'] is not None:
+                    if ('types', band['match_types']) not in cache:
+                        cache['types', band['match_types']] = df['match_type'].isin(band['match_types']).to_numpy()
+                    selected = selected & cache['types', band['match_types']]
+                if band['requires'] is not None:
+                    column, op, value = band['requires']
+                    if ('requires', band['requires']) not in cache:
+                        cache['requires', band['requires']] = (
+                            np.asarray(_OPERATORS[op](df[column], value), dtype=bool) if column in df else np.zeros(len(df), dtype=bool)
+                        )
+                    selected = selected & cache['requires', band['requires']]
+                if band['low'] is not None:
+                    selected = selected & (values >= band['low'] if band['closed'] in ('left', 'both') else values > band['low'])
+                if band['high'] is not None:
+                    selected = selected & (values <= band['high'] if band['closed'] in ('right', 'both') else values < band['high'])
+                cache[key] = selected
+            return cache[key]
+
+        scores = {}
+        for name, (per_unit, rules) in compiled.items():
+            points = np.zeros(len(df), dtype=np.int64)
+            for column, weight in per_unit.items():
+                if column in df:
+                    points = points + df[column].to_numpy() * weight
+            for bands in rules:
+                points = points + np.select([mask(band) for band in bands], [band['points'] for band in bands], 0)
+            scores[name] = points
+        return pd.DataFrame(scores, index=df.index)
+
+    return kernel
+
+
+_dream11_kernel = compile_scoring({'points': DREAM11_RULES})
+
+
+def fantasy_points(df: pd.DataFrame, rules=None) -> pd.Series:
+    """
+    Scores every row of a MatchWise table at once under a rule set (DREAM11_RULES by default, which gives the same
+    points as calculate_fantasy_points() in data_processing/fantasy_points_*.py).
+
+    Args:
+        df (pd.DataFrame): MatchWise rows (Test tables may leave out the 'out' column).
+        rules (dict, optional): Rule set, see DREAM11_RULES and load_rules().
+
+    Returns:
+        pd.Series: Fantasy points of each row, identical to df.apply(calculate_fantasy_points, axis=1) by default.
+    """
+    kernel = _dream11_kernel if rules is None else compile_scoring({'points': rules})
+    return kernel(df)['points']
+
+
+def add_rule_set_points(input_file: str, output_file: str, rule_sets):
+    """
+    Scores a MatchWise CSV under several rule sets in one pass, e.g. to A/B-test rule variants without re-parsing
+    the match data, adding a fantasy_points_<name> column per rule set.
+
+    Args:
+        input_file (str): MatchWise (or MatchWise fantasy points) CSV.
+        output_file (str): Path of the scored CSV.
+        rule_sets (dict): name -> rule set, or name -> path of a JSON rule set (see load_rules()).
+    """
+    rule_sets = {name: load_rules(rules) if isinstance(rules, str) else rules for name, rules in rule_sets.items()}
+    df = pd.read_csv(input_file)
+    scores = compile_scoring(rule_sets)(df)
+    for name in rule_sets:
+        df[f'fantasy_points_{name}'] = scores[name]
+    df.to_csv(output_file, index=False)
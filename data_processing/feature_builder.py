@@ -0,0 +1,1070 @@
+import os
+import sys
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.columnar_cache import append_columnar_cache, is_cache_fresh, truncate_columnar_cache, write_columnar_cache
+
+# MatchWise columns summed into the features, by the names used below
+SUMMED_COLUMNS = {
+    'runs': 'runs_scored', 'balls': 'balls_faced', 'fours': 'no_of_fours', 'sixes': 'no_of_sixes',
+    'runs_conceded': 'runs_conceded', 'balls_bowled': 'balls_bowled', 'wickets': 'wickets',
+    'catches': 'no_of_catches', 'runouts': 'runouts'
+}
+
+# How each format counts its features:
+#   suffix:            ending of every feature column, e.g. career_batsman_total_runs_odi
+#   thirties:          whether the batsman_30s columns exist
+#   rates:             whether the strike rate and economy rate columns exist
+#   average_over:      what career and venue batting averages divide by: 'outs' (dismissals) or 'matches'
+#   career_milestones: 'cumulative' (a hundred also counts as a fifty) or 'exclusive' (each innings counts once)
+# Recent milestones are always cumulative and venue milestones always exclusive.
+FORMAT_FEATURES = {
+    'ODI': {'suffix': 'odi', 'thirties': False, 'rates': True, 'average_over': 'outs',
+            'career_milestones': 'cumulative'},
+    'T20': {'suffix': 't20', 'thirties': True, 'rates': True, 'average_over': 'outs',
+            'career_milestones': 'exclusive'},
+    'Test': {'suffix': 'test', 'thirties': False, 'rates': False, 'average_over': 'matches',
+             'career_milestones': 'cumulative'},
+}
+
+FEATURE_KINDS = ('career', 'recent', 'venue')
+
+# Matches in the recent form window
+RECENT_WINDOW = 5
+
+# MatchWise columns averaged by the form features, by the names used in their columns
+FORM_COLUMNS = {'fantasy_points': 'fantasy_points', 'runs': 'runs_scored', 'wickets': 'wickets'}
+
+# Half-lives of the form features' exponential decay, in matches and in calendar days
+FORM_MATCH_HALFLIVES = (5,)
+FORM_DAY_HALFLIVES = (180,)
+
+# Every table build_feature_tables() can write: the FEATURE_KINDS and the exponentially weighted form
+TABLE_KINDS = FEATURE_KINDS + ('form',)
+
+# MatchWise columns left out of the processed career / recent / venue tables
+DROP_COLUMNS = ['player_name', 'team_name', 'runs_scored', 'balls_faced', 'no_of_fours', 'no_of_sixes',
+                'no_of_catches', 'runouts', 'balls_bowled', 'dot_balls', 'wickets', 'LBWs/Bowled',
+                'runs_conceded', 'stumpings', 'out', 'date', 'venue', 'match_type', 'gender', 'fantasy_points']
+
+# Columns of the player match table, the MatchWise rows of players with a designation (role)
+PLAYER_MATCH_COLUMNS = ['match_id', 'player_id', 'player_name', 'fantasy_points', 'team_name', 'role', 'date', 'venue']
+
+_SAVED_MESSAGES = {
+    'career': "Career statistics added to the DataFrame with optimized performance!",
+    'recent': "Recent form metrics added to the DataFrame with optimized performance!",
+    'venue': "Venue-specific performance added to the DataFrame with optimized performance!",
+    'form': "Exponentially weighted form added to the DataFrame!",
+}
+
+
+def feature_columns(kind, format_name):
+    """
+    Names of the feature columns of one processed table, in CSV order.
+
+    Args:
+        kind (str): 'career', 'recent' or 'venue'.
+        format_name (str): 'ODI', 'T20' or 'Test'.
+
+    Returns:
+        list: e.g. ['career_batsman_total_runs_odi', 'career_batsman_100s_odi', ...]
+    """
+    spec = FORMAT_FEATURES[format_name]
+    names = ['batsman_total_runs', 'batsman_100s', 'batsman_50s']
+    if spec['thirties']:
+        names.append('batsman_30s')
+    names += ['batsman_total_sixes', 'batsman_total_fours', 'batsman_average_runs']
+    if spec['rates']:
+        names.append('batsman_strike_rate')
+    names += ['bowler_wickets', 'bowler_average']
+    if spec['rates']:
+        names.append('bowler_economy_rate')
+    names += ['fielder_total_catches', 'fielder_total_runouts']
+    return [f"{kind}_{name}_{spec['suffix']}" for name in names]
+
+
+def sort_matchwise(df):
+    """
+    Orders MatchWise rows by date and match_id, the order every feature is accumulated in (df['date'] is converted
+    in place). The sort is stable, so the rows of a match keep their order and rows already in this order, as
+    add_fantasy_points writes them, are not moved.
+    """
+    df['date'] = pd.to_datetime(df['date'])
+    return df.sort_values(by=['date', 'match_id'], kind='stable')
+
+
+def load_matchwise(input_file):
+    """
+    Reads a MatchWise fantasy points CSV and orders it by date and match_id, the order every feature is accumulated in.
+    """
+    return sort_matchwise(pd.read_csv(input_file, low_memory=False))
+
+
+def match_counts(df, milestones, thirties):
+    """
+    Per-row contributions of a match to the running sums: the summed MatchWise columns, the innings milestones,
+    one match and, where there is an 'out' column, one dismissal.
+
+    Args:
+        df (pd.DataFrame): MatchWise rows.
+        milestones (str): 'cumulative' or 'exclusive', see FORMAT_FEATURES.
+        thirties (bool): Whether to count thirties.
+
+    Returns:
+        pd.DataFrame: One column per counted quantity, on df's index.
+    """
+    counts = pd.DataFrame({name: df[column] for name, column in SUMMED_COLUMNS.items()}, index=df.index)
+    runs = df['runs_scored']
+    counts['hundreds'] = (runs >= 100).astype(np.int64)
+    if milestones == 'cumulative':
+        counts['fifties'] = (runs >= 50).astype(np.int64)
+        if thirties:
+            counts['thirties'] = (runs >= 30).astype(np.int64)
+    else:
+        counts['fifties'] = ((runs >= 50) & (runs < 100)).astype(np.int64)
+        if thirties:
+            counts['thirties'] = ((runs >= 30) & (runs < 50)).astype(np.int64)
+    counts['matches'] = np.int64(1)
+    if 'out' in df.columns:
+        counts['outs'] = (df['out'] == 'out').astype(np.int64)
+    return counts
+
+
+def running_sums(counts, keys, windows=(None,)):
+    """
+    Sums of counts over each group's earlier rows, for several windows in one pass.
+
+    The running sums before every row are computed once; the sum over a group's last w rows is then those sums minus
+    the group's running sums w rows earlier (what leaves the window), so each window costs one grouped shift and
+    one subtraction per row whatever its length.
+
+    Args:
+        counts (pd.DataFrame): Rows in accumulation order.
+        keys (list): Columns (Series on counts' index) identifying a group; missing values form a group too.
+        windows (tuple, optional): Numbers of earlier rows to sum; None sums all of them.
+
+    Returns:
+        dict: Window -> pd.DataFrame of the sums before each row, on counts' index.
+    """
+    prior = counts.groupby(keys, sort=False, dropna=False).cumsum() - counts
+    sums = {}
+    for window in windows:
+        if window is None:
+            sums[window] = prior
+        else:
+            sums[window] = prior - prior.groupby(keys, sort=False, dropna=False).shift(window, fill_value=0)
+    return sums
+
+
+def prior_sums(counts, keys):
+    """
+    Running sums of counts within each group, over the group's earlier rows only (0 on a group's first row).
+
+    Args:
+        counts (pd.DataFrame): Rows in accumulation order.
+        keys (list): Columns (Series on counts' index) identifying a group; missing values form a group too.
+
+    Returns:
+        pd.DataFrame: Sums before each row, on counts' index.
+    """
+    return running_sums(counts, keys)[None]
+
+
+def window_sums(counts, keys, window):
+    """
+    Sums of counts over each group's last `window` rows before every row.
+
+    Args:
+        counts (pd.DataFrame): Rows in accumulation order.
+        keys (list): Columns (Series on counts' index) identifying a group; missing values form a group too.
+        window (int): Number of earlier rows summed.
+
+    Returns:
+        pd.DataFrame: Window sums before each row, on counts' index.
+    """
+    return running_sums(counts, keys, (window,))[window]
+
+
+def _ratio(numerator, denominator):
+    """
+    numerator / denominator as floats, 0 where the denominator is 0.
+    """
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.zeros(len(numerator))
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _feature_frame(kind, format_name, sums, innings):
+    """
+    Lays out summed counts as the columns of a processed table.
+
+    Args:
+        kind (str): 'career', 'recent' or 'venue'.
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        sums (pd.DataFrame): Counts summed over the matches each row's features cover.
+        innings (array-like): What the batting average divides by.
+
+    Returns:
+        pd.DataFrame: The feature columns, on sums' index.
+    """
+    spec = FORMAT_FEATURES[format_name]
+    values = [sums['runs'], sums['hundreds'], sums['fifties']]
+    if spec['thirties']:
+        values.append(sums['thirties'])
+    values += [sums['sixes'], sums['fours'], _ratio(sums['runs'], innings)]
+    if spec['rates']:
+        values.append(_ratio(sums['runs'], sums['balls']) * 100)
+    values += [sums['wickets'], _ratio(sums['runs_conceded'], sums['wickets'])]
+    if spec['rates']:
+        values.append(_ratio(sums['runs_conceded'], sums['balls_bowled'] / 6))
+    values += [sums['catches'], sums['runouts']]
+    return pd.DataFrame(
+        {name: np.asarray(value) for name, value in zip(feature_columns(kind, format_name), values)},
+        index=sums.index
+    )
+
+
+def career_features(df, format_name):
+    """
+    Each player's career totals and averages before every match.
+
+    Args:
+        df (pd.DataFrame): MatchWise fantasy points rows, sorted as by load_matchwise().
+        format_name (str): 'ODI', 'T20' or 'Test'.
+
+    Returns:
+        pd.DataFrame: The career feature columns, on df's index.
+    """
+    spec = FORMAT_FEATURES[format_name]
+    counts = match_counts(df, spec['career_milestones'], spec['thirties'])
+    sums = prior_sums(counts, [df['player_id']])
+    return _feature_frame('career', format_name, sums, sums[spec['average_over']])
+
+
+def recent_kind(window):
+    """
+    Column prefix of the recent form features over `window` matches: 'recent' for the standard RECENT_WINDOW,
+    e.g. 'recent10' for others.
+    """
+    return 'recent' if window == RECENT_WINDOW else f'recent{window}'
+
+
+def recent_features(df, format_name, windows=(RECENT_WINDOW,)):
+    """
+    Each player's totals and averages over their last matches before every match, for one or more window lengths.
+
+    All windows come from the same running sums (see running_sums()), so extra windows add little to the cost; each
+    window's batting average divides by the number of matches in it.
+
+    Args:
+        df (pd.DataFrame): MatchWise fantasy points rows, sorted as by load_matchwise().
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        windows (tuple, optional): Numbers of matches in the windows, e.g. (5, 3, 10).
+
+    Returns:
+        pd.DataFrame: The recent feature columns of every window in turn (named as by recent_kind()), on df's index.
+    """
+    spec = FORMAT_FEATURES[format_name]
+    counts = match_counts(df, 'cumulative', spec['thirties'])
+    return _recent_frame(format_name, running_sums(counts, [df['player_id']], windows))
+
+
+def _recent_frame(format_name, sums):
+    """
+    Lays out the window sums of running_sums() as the recent feature columns, window after window.
+    """
+    return pd.concat(
+        [_feature_frame(recent_kind(window), format_name, window_sums, window_sums['matches'])
+         for window, window_sums in sums.items()],
+        axis=1
+    )
+
+
+def venue_features(df, format_name):
+    """
+    Each player's totals and averages at the match's venue before every match.
+
+    Args:
+        df (pd.DataFrame): MatchWise fantasy points rows, sorted as by load_matchwise().
+        format_name (str): 'ODI', 'T20' or 'Test'.
+
+    Returns:
+        pd.DataFrame: The venue feature columns, on df's index.
+    """
+    spec = FORMAT_FEATURES[format_name]
+    counts = match_counts(df, 'exclusive', spec['thirties'])
+    sums = prior_sums(counts, [df['player_id'], df['venue']])
+    return _feature_frame('venue', format_name, sums, sums[spec['average_over']])
+
+
+def form_columns(format_name, match_halflives=FORM_MATCH_HALFLIVES, day_halflives=FORM_DAY_HALFLIVES):
+    """
+    Names of the form feature columns, in CSV order: per match half-life h the averages decayed by match count
+    (form_ewm<h>m_<value>_<suffix>), then per day half-life h the averages decayed by calendar days
+    (form_ewm<h>d_<value>_<suffix>) followed by the decayed number of matches (form_ewm<h>d_matches_<suffix>).
+    """
+    suffix = FORMAT_FEATURES[format_name]['suffix']
+    names = []
+    for halflife in match_halflives:
+        names += [f'form_ewm{halflife}m_{value}_{suffix}' for value in FORM_COLUMNS]
+    for halflife in day_halflives:
+        names += [f'form_ewm{halflife}d_{value}_{suffix}' for value in FORM_COLUMNS]
+        names.append(f'form_ewm{halflife}d_matches_{suffix}')
+    return names
+
+
+class FormState:
+    """
+    Exponentially decayed sums of the FORM_COLUMNS values of every player's matches so far: per half-life one decayed
+    sum per value and the decayed number of matches, plus the day of the player's last match, so a fixed amount of
+    state per player whatever the length of their career.
+
+    With a half-life of h matches each earlier match weighs half as much as the one after it every h matches; with a
+    half-life of h days a match weighs 2 ** -(d / h) d days later. The methods take players as the integer codes
+    given by codes(); the state starts with no players.
+    """
+
+    def __init__(self, match_halflives=FORM_MATCH_HALFLIVES, day_halflives=FORM_DAY_HALFLIVES):
+        self.match_halflives = tuple(match_halflives)
+        self.day_halflives = tuple(day_halflives)
+        n_values, n_halflives = len(FORM_COLUMNS), len(self.match_halflives) + len(self.day_halflives)
+        self.players = pd.Index([], dtype=object)
+        self.sums = np.zeros((n_halflives, 0, n_values))
+        self.weights = np.zeros((n_halflives, 0))
+        self.last_day = np.zeros(0, dtype=np.int64)
+
+    def codes(self, player_ids):
+        """
+        Codes of player_ids (missing ids included), adding state for players not seen before.
+        """
+        codes = self.players.get_indexer(player_ids)
+        new = codes < 0
+        if new.any():
+            self.players = self.players.append(pd.Index(pd.unique(np.asarray(player_ids, dtype=object)[new])))
+            extra = len(self.players) - len(self.last_day)
+            self.sums = np.concatenate([self.sums, np.zeros((self.sums.shape[0], extra, self.sums.shape[2]))], axis=1)
+            self.weights = np.concatenate([self.weights, np.zeros((self.weights.shape[0], extra))], axis=1)
+            self.last_day = np.concatenate([self.last_day, np.zeros(extra, dtype=np.int64)])
+            codes[new] = self.players.get_indexer(np.asarray(player_ids, dtype=object)[new])
+        return codes
+
+    def _day_decay(self, players, days, halflife):
+        return np.exp2(-(days - self.last_day[players]) / halflife)
+
+    def features(self, players, days):
+        """
+        Form features of players (distinct codes) before their matches on days (day numbers), laid out as the
+        form_columns().
+        """
+        columns = []
+        n_match = len(self.match_halflives)
+        for i in range(n_match):
+            columns.append(self._means(i, players))
+        for i, halflife in enumerate(self.day_halflives, n_match):
+            # Decaying a player's sums and weight alike leaves their averages unchanged
+            columns.append(self._means(i, players))
+            columns.append((self.weights[i, players] * self._day_decay(players, days, halflife))[:, None])
+        return np.hstack(columns) if columns else np.zeros((len(players), 0))
+
+    def _means(self, i, players):
+        weights = self.weights[i, players]
+        out = np.zeros(self.sums[i, players].shape)
+        np.divide(self.sums[i, players], weights[:, None], out=out, where=weights[:, None] > 0)
+        return out
+
+    def add(self, players, days, values):
+        """
+        Folds one match of each of players (distinct codes), played on days, with the FORM_COLUMNS values given, into
+        their state.
+        """
+        n_match = len(self.match_halflives)
+        for i, halflife in enumerate(self.match_halflives):
+            decay = 2 ** (-1 / halflife)
+            self.sums[i, players] = self.sums[i, players] * decay + values
+            self.weights[i, players] = self.weights[i, players] * decay + 1
+        for i, halflife in enumerate(self.day_halflives, n_match):
+            decay = self._day_decay(players, days, halflife)
+            self.sums[i, players] = self.sums[i, players] * decay[:, None] + values
+            self.weights[i, players] = self.weights[i, players] * decay + 1
+        self.last_day[players] = days
+
+
+def form_values(df):
+    """
+    The FORM_COLUMNS values of MatchWise rows and their match days (days since 1970-01-01), as arrays.
+    """
+    values = df[list(FORM_COLUMNS.values())].to_numpy(dtype=np.float64)
+    days = df['date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return values, days
+
+
+def run_form(state, codes, days, values):
+    """
+    Pre-match form features of MatchWise rows in accumulation order, updating state with every row.
+
+    Rows are taken by their position in their player's sequence: all players' first new matches at once, then all
+    their second ones, and so on, so the loop runs as many times as the most matches any one player has, with every
+    step vectorised over players.
+
+    Args:
+        state (FormState): State of the players before these rows; updated in place.
+        codes (np.ndarray): Player code of each row.
+        days (np.ndarray): Match day of each row.
+        values (np.ndarray): FORM_COLUMNS values of each row, one row each.
+
+    Returns:
+        np.ndarray: One row of form features per row, laid out as the form_columns().
+    """
+    nth = pd.Series(codes).groupby(codes, sort=False).cumcount().to_numpy()
+    order = np.argsort(nth, kind='stable')
+    out = None
+    start = 0
+    for stop in np.cumsum(np.bincount(nth, minlength=1)):
+        rows = order[start:stop]
+        start = stop
+        features = state.features(codes[rows], days[rows])
+        if out is None:
+            out = np.zeros((len(codes), features.shape[1]))
+        out[rows] = features
+        state.add(codes[rows], days[rows], values[rows])
+    return out
+
+
+def form_features(df, format_name, match_halflives=FORM_MATCH_HALFLIVES, day_halflives=FORM_DAY_HALFLIVES,
+                  state=None):
+    """
+    Each player's exponentially weighted form before every match: averages of the FORM_COLUMNS decayed by match count
+    and by calendar days, and the number of matches decayed by days (see FormState).
+
+    Args:
+        df (pd.DataFrame): MatchWise fantasy points rows, sorted as by load_matchwise().
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        match_halflives (tuple, optional): Half-lives in matches.
+        day_halflives (tuple, optional): Half-lives in days.
+        state (FormState, optional): State of the players before df's rows, carried on from and updated in place
+            (its own half-lives are used); when None the players start with no matches.
+
+    Returns:
+        pd.DataFrame: The form feature columns, on df's index.
+    """
+    if state is None:
+        state = FormState(match_halflives, day_halflives)
+    values, days = form_values(df)
+    out = run_form(state, state.codes(df['player_id']), days, values)
+    columns = form_columns(format_name, state.match_halflives, state.day_halflives)
+    return pd.DataFrame(out, columns=columns, index=df.index)
+
+
+FEATURE_BUILDERS = {'career': career_features, 'recent': recent_features, 'venue': venue_features,
+                    'form': form_features}
+
+
+def processed_table(df, features):
+    """
+    The rows of df with the MatchWise stats dropped and the feature columns appended, as written to the CSVs.
+    """
+    df = pd.concat([df, features], axis=1)
+    return df.drop(columns=[col for col in DROP_COLUMNS if col in df.columns])
+
+
+def player_match_table(df, designation_df, format_name):
+    """
+    Joins MatchWise rows with the players' designations, keeping the rows of designated players in input order.
+
+    Args:
+        df (pd.DataFrame): MatchWise fantasy points rows, with their dates as read from the CSV.
+        designation_df (pd.DataFrame): Designation table (player_id, player_name, role).
+        format_name (str): Format of the rows, for error messages.
+
+    Returns:
+        pd.DataFrame: The PLAYER_MATCH_COLUMNS of the joined rows.
+    """
+    # Ensure both 'player_id' and 'player_name' are present in both dataframes
+    required_columns = {'player_id', 'player_name'}
+    if not required_columns.issubset(df.columns):
+        raise ValueError(f"'player_id' or 'player_name' not found in {format_name} MatchWise data.")
+    if not required_columns.issubset(designation_df.columns):
+        raise ValueError("'player_id' or 'player_name' not found in Designation data.")
+
+    # Inner join on both 'player_id' and 'player_name' to ensure accurate matches
+    return df.merge(designation_df, on=['player_id', 'player_name'], how='inner')[PLAYER_MATCH_COLUMNS]
+
+
+def build_feature_tables(format_name, input_file, output_files, designation_file=None, wide_file=None,
+                         recent_windows=(RECENT_WINDOW,), checkpoint_file=None):
+    """
+    Writes the processed tables of a format from one read and one date sort of its MatchWise fantasy points CSV,
+    instead of one read and sort per table.
+
+    The career, recent, venue and form tables are the ones build_feature_table() writes, the player match table the
+    one process_player_match_data() writes. The optional wide table holds the career, recent, venue and form features
+    of each row side by side, inner-joined with the player match table on (match_id, player_id).
+
+    Args:
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        input_file (str): Path of the MatchWise fantasy points CSV.
+        output_files (dict): Output CSV path by table: 'career', 'recent', 'venue', 'form' and / or 'player_match'.
+        designation_file (str, optional): Designation CSV, needed for the player match and wide tables.
+        wide_file (str, optional): Path of the wide table CSV; not written when None.
+        recent_windows (tuple, optional): Match windows of the recent table's features, computed in the same pass;
+            features over RECENT_WINDOW matches keep their recent_ names, the others are named e.g. recent10_.
+        checkpoint_file (str, optional): Where to save the builders' running state at the end of input_file, from
+            which update_feature_tables() appends the rows of matches added later; not saved when None.
+
+    Returns:
+        None: Every table is saved to its path, with a columnar cache next to it.
+    """
+    # Size and SHA-256 of the rows the checkpoint covers, taken before they are read
+    position = _scan_file(input_file)[:2] if checkpoint_file is not None else None
+    df = pd.read_csv(input_file, low_memory=False)
+    text_columns = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+
+    player_match = None
+    if 'player_match' in output_files or wide_file is not None:
+        if designation_file is None:
+            raise ValueError("A designation file is needed for the player match table")
+        designation_df = pd.read_csv(designation_file)
+        # Built before the date conversion, so the table keeps the dates as read
+        player_match = player_match_table(df, designation_df, format_name)
+        if 'player_match' in output_files:
+            _write_table(output_files['player_match'], player_match)
+            print(f"CSV file '{output_files['player_match']}' created successfully!")
+
+    df = sort_matchwise(df)
+    kinds = [kind for kind in TABLE_KINDS if kind in output_files or wide_file is not None]
+    features = {kind: FEATURE_BUILDERS[kind](df, format_name) for kind in kinds if kind not in ('recent', 'form')}
+    if 'recent' in kinds:
+        features['recent'] = recent_features(df, format_name, recent_windows)
+    form_state = FormState()
+    if 'form' in kinds:
+        features['form'] = form_features(df, format_name, state=form_state)
+
+    for kind in TABLE_KINDS:
+        if kind in output_files:
+            _write_table(output_files[kind], processed_table(df, features[kind]))
+            print(_SAVED_MESSAGES[kind])
+
+    if wide_file is not None:
+        wide = processed_table(df, pd.concat([features[kind] for kind in TABLE_KINDS], axis=1))
+        wide = wide.merge(player_match, on=['match_id', 'player_id'], how='inner')
+        _write_table(wide_file, wide)
+        print(f"Wide {format_name} feature table written to {wide_file}")
+
+    if checkpoint_file is not None:
+        if 'form' not in kinds:
+            form_features(df, format_name, state=form_state)
+        with open(input_file, 'rb') as f:
+            header = f.readline()
+        player_match_rows = len(player_match) if 'player_match' in output_files else 0
+        days = None
+        # Days are only kept for a CSV whose lines are in the sorted order, where a day's rows are a block of lines
+        if len(df) and df.index.is_monotonic_increasing:
+            counts = (_player_match_counts(df, designation_df) if 'player_match' in output_files
+                      else np.zeros(len(df), dtype=np.int64))
+            days = _days(input_file, len(header), 0, (df['date'].iloc[0], 0, 0), df, (0, 0), counts)
+        checkpoint = {
+            'format_name': format_name, 'recent_windows': tuple(recent_windows), 'columns': list(df.columns),
+            'text_columns': text_columns, 'position': position, 'header': header, 'last_key': _last_key(df),
+            'rows': len(df), 'player_match_rows': player_match_rows, 'days': days,
+            'outputs': _output_sizes(output_files),
+            **feature_state(df, format_name, recent_windows),
+            'form': form_state,
+        }
+        _save_checkpoint(checkpoint_file, checkpoint)
+        print(f"Feature checkpoint saved to {checkpoint_file}")
+
+
+def _write_table(path, table, append=False):
+    """
+    Writes a processed table to its CSV and columnar cache, or appends its rows to both.
+    """
+    if append:
+        was_fresh = is_cache_fresh(path)
+        table.to_csv(path, mode='a', header=False, index=False)
+        append_columnar_cache(path, table, was_fresh)
+    else:
+        table.to_csv(path, index=False)
+        write_columnar_cache(path, table)
+
+
+def _truncate_table(path, rows):
+    """
+    Cuts a processed table back to its header and first rows, in its CSV and columnar cache.
+    """
+    was_fresh = is_cache_fresh(path)
+    offsets, _ = _day_blocks(path, 0, [0, rows + 1])
+    with open(path, 'r+b') as f:
+        f.truncate(offsets[1])
+    truncate_columnar_cache(path, rows, was_fresh)
+
+
+def build_feature_table(kind, format_name, input_file, output_file):
+    """
+    Writes the career, recent, venue or form table of a format from its MatchWise fantasy points CSV.
+
+    Args:
+        kind (str): 'career', 'recent', 'venue' or 'form'.
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        input_file (str): Path of the MatchWise fantasy points CSV.
+        output_file (str): Path of the processed CSV (a columnar cache is written next to it).
+
+    Returns:
+        None: The table is saved to output_file.
+    """
+    df = load_matchwise(input_file)
+    _write_table(output_file, processed_table(df, FEATURE_BUILDERS[kind](df, format_name)))
+
+    print(_SAVED_MESSAGES[kind])
+
+
+def feature_state(df, format_name, recent_windows=(RECENT_WINDOW,)):
+    """
+    The career, recent and venue builders' running state after the rows of df: each player's career sums, each
+    player's last rows of recent form counts (as many as the longest window) and each (player, venue)'s sums.
+
+    Args:
+        df (pd.DataFrame): MatchWise fantasy points rows, sorted as by load_matchwise().
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        recent_windows (tuple, optional): Match windows of the recent features.
+
+    Returns:
+        dict: 'career' (sums indexed by player_id), 'recent' (count rows with their player_id, in accumulation order)
+            and 'venue' (sums indexed by player_id and venue), as pd.DataFrames.
+    """
+    spec = FORMAT_FEATURES[format_name]
+    player = df['player_id']
+    career = match_counts(df, spec['career_milestones'], spec['thirties'])
+    recent = match_counts(df, 'cumulative', spec['thirties'])
+    recent.insert(0, 'player_id', player)
+    venue = match_counts(df, 'exclusive', spec['thirties'])
+    return {
+        'career': career.groupby(player, sort=False, dropna=False).sum(),
+        'recent': recent.groupby('player_id', sort=False, dropna=False).tail(max(recent_windows)),
+        'venue': venue.groupby([player, df['venue']], sort=False, dropna=False).sum(),
+    }
+
+
+def _merge_state(state, new_state, recent_windows):
+    """
+    feature_state() over two consecutive sets of rows, from the state after each.
+    """
+    recent = pd.concat([state['recent'], new_state['recent']], ignore_index=True)
+    return {
+        'career': pd.concat([state['career'], new_state['career']]).groupby(level=0, sort=False, dropna=False).sum(),
+        'recent': recent.groupby('player_id', sort=False, dropna=False).tail(max(recent_windows)),
+        'venue': pd.concat([state['venue'], new_state['venue']]).groupby(level=[0, 1], sort=False, dropna=False).sum(),
+    }
+
+
+def _state_rows(sums, keys, index):
+    """
+    The rows of sums for each of keys (zeros for keys without one), on index.
+    """
+    return sums.reindex(keys, fill_value=0).set_axis(index)
+
+
+def incremental_features(df, format_name, checkpoint):
+    """
+    Career, recent, venue and form features of MatchWise rows that follow the ones a checkpoint was saved after,
+    computed from the checkpointed state and these rows only. The form state in the checkpoint is moved on past
+    the rows; the others are left as they are.
+
+    Args:
+        df (pd.DataFrame): The new MatchWise fantasy points rows, sorted as by load_matchwise().
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        checkpoint (dict): As saved by build_feature_tables() or update_feature_tables().
+
+    Returns:
+        dict: Table kind -> pd.DataFrame of its feature columns, on df's index.
+    """
+    spec = FORMAT_FEATURES[format_name]
+    player = df['player_id']
+    features = {}
+
+    counts = match_counts(df, spec['career_milestones'], spec['thirties'])
+    sums = prior_sums(counts, [player]) + _state_rows(checkpoint['career'], pd.Index(player), df.index)
+    features['career'] = _feature_frame('career', format_name, sums, sums[spec['average_over']])
+
+    # Each player's last checkpointed rows go first, so the windows reach back past the new rows
+    tail = checkpoint['recent'][checkpoint['recent']['player_id'].isin(player)]
+    counts = pd.concat([tail.drop(columns='player_id'), match_counts(df, 'cumulative', spec['thirties'])],
+                       ignore_index=True)
+    keys = pd.concat([tail['player_id'], player], ignore_index=True)
+    sums = running_sums(counts, [keys], checkpoint['recent_windows'])
+    features['recent'] = _recent_frame(
+        format_name, {window: window_sums.iloc[len(tail):].set_axis(df.index) for window, window_sums in sums.items()}
+    )
+
+    counts = match_counts(df, 'exclusive', spec['thirties'])
+    venue_keys = pd.MultiIndex.from_arrays([player, df['venue']])
+    sums = prior_sums(counts, [player, df['venue']]) + _state_rows(checkpoint['venue'], venue_keys, df.index)
+    features['venue'] = _feature_frame('venue', format_name, sums, sums[spec['average_over']])
+
+    features['form'] = form_features(df, format_name, state=checkpoint['form'])
+    return features
+
+
+def _scan_file(path, offset=None):
+    """
+    Size and SHA-256 of a file, plus the SHA-256 of its first offset bytes (None if it is shorter), in one read.
+    Hashing is a plain byte scan, far cheaper than parsing the rows it covers.
+    """
+    sha256 = hashlib.sha256()
+    prefix_sha256 = None
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            if size == offset:
+                prefix_sha256 = sha256.hexdigest()
+            limit = offset - size if offset is not None and size < offset else 1 << 20
+            chunk = f.read(min(limit, 1 << 20))
+            if not chunk:
+                break
+            sha256.update(chunk)
+            size += len(chunk)
+    return size, sha256.hexdigest(), prefix_sha256
+
+
+def _output_sizes(output_files):
+    """
+    Path and size of each processed table (size None if it does not exist), which update_feature_tables() checks
+    are still as checkpointed before appending to them.
+    """
+    return {kind: (os.path.abspath(path), os.path.getsize(path) if os.path.exists(path) else None)
+            for kind, path in output_files.items()}
+
+
+def _last_key(df):
+    """
+    (date, match_id) of the last of sorted MatchWise rows, which rows appended later must come after.
+    """
+    return (df['date'].iloc[-1], df['match_id'].iloc[-1]) if len(df) else None
+
+
+def _player_match_counts(df, designation_df):
+    """
+    Number of player match table rows of each MatchWise row, as joined by player_match_table().
+    """
+    keys = ['player_id', 'player_name']
+    joined = df[keys].reset_index(drop=True).reset_index().merge(designation_df[keys], on=keys, how='inner')
+    return np.bincount(joined['index'], minlength=len(df))
+
+
+def _day_blocks(path, offset, lines):
+    """
+    Byte offset and SHA-256 of consecutive blocks of a file's lines, read from offset (the start of a line): block i
+    runs from line lines[i] (counted from offset, lines[0] being 0) to the start of the next block or the end of
+    the file.
+    """
+    offsets, digests = [], []
+    sha256 = None
+    seen = 0
+    position = offset
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            # Where each line starting in this chunk starts
+            starts = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord('\n')) + 1
+            if position == offset:
+                starts = np.concatenate([[0], starts])
+            start = 0
+            while len(offsets) < len(lines) and lines[len(offsets)] < seen + len(starts):
+                cut = int(starts[lines[len(offsets)] - seen])
+                if sha256 is not None:
+                    sha256.update(chunk[start:cut])
+                    digests.append(sha256.hexdigest())
+                sha256 = hashlib.sha256()
+                offsets.append(position + cut)
+                start = cut
+            if sha256 is not None:
+                sha256.update(chunk[start:])
+            seen += len(starts)
+            position += len(chunk)
+    if sha256 is not None:
+        digests.append(sha256.hexdigest())
+    return offsets, digests
+
+
+def _days(path, offset, lead, day, df, rows, player_match_counts):
+    """
+    The checkpointed days of the MatchWise CSV from a day on: each day's date, the number of rows and player match
+    rows before it and the byte offset and SHA-256 of its lines, from which update_feature_tables() finds the first
+    day a rewrite of the CSV changed.
+
+    Args:
+        path (str): Path of the MatchWise fantasy points CSV, in the order of its sorted rows.
+        offset (int): Byte offset of the first line of day.
+        lead (int): Number of lines from offset to df's first row (the rows of day already accounted for).
+        day (tuple): (date, rows before, player match rows before) of the day whose lines start at offset.
+        df (pd.DataFrame): The sorted MatchWise rows that follow.
+        rows (tuple): (rows before df, player match rows before df).
+        player_match_counts (np.ndarray): Number of player match rows of each of df's rows.
+
+    Returns:
+        pd.DataFrame: 'rows', 'player_match_rows', 'offset' and 'sha256' of each day, indexed by date.
+    """
+    dates = df['date']
+    starts = np.flatnonzero(dates.ne(dates.shift(1, fill_value=day[0])).to_numpy())
+    player_match_rows = rows[1] + np.concatenate([[0], np.cumsum(player_match_counts)])[starts]
+    offsets, digests = _day_blocks(path, offset, [0] + (lead + starts).tolist())
+    return pd.DataFrame({'rows': [day[1]] + (rows[0] + starts).tolist(),
+                         'player_match_rows': [day[2]] + player_match_rows.tolist(),
+                         'offset': offsets, 'sha256': digests},
+                        index=pd.DatetimeIndex([day[0]] + dates.iloc[starts].tolist(), name='date'))
+
+
+def _unchanged_days(path, checkpoint):
+    """
+    Number of checkpointed days at the start of the MatchWise CSV whose lines (and the header before them) still
+    have their checkpointed bytes.
+    """
+    days = checkpoint['days']
+    ends = days['offset'].tolist()[1:] + [checkpoint['position'][0]]
+    with open(path, 'rb') as f:
+        if f.read(len(checkpoint['header'])) != checkpoint['header']:
+            return 0
+        for day, (start, end, digest) in enumerate(zip(days['offset'], ends, days['sha256'])):
+            f.seek(start)
+            sha256 = hashlib.sha256()
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(remaining, 1 << 20))
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                remaining -= len(chunk)
+            if remaining or sha256.hexdigest() != digest:
+                return day
+    return len(days)
+
+
+def read_appended(input_file, checkpoint):
+    """
+    The MatchWise rows appended to input_file since a checkpoint, read from where the checkpointed part ends.
+
+    Args:
+        input_file (str): Path of the MatchWise fantasy points CSV.
+        checkpoint (dict): As saved by build_feature_tables() or update_feature_tables().
+
+    Returns:
+        tuple: (pd.DataFrame of the new rows with the checkpointed columns, (size, SHA-256) of input_file).
+
+    Raises:
+        ValueError: If input_file no longer starts with the checkpointed bytes.
+    """
+    offset, checkpointed_sha256 = checkpoint['position']
+    size, sha256, prefix_sha256 = _scan_file(input_file, offset)
+    if prefix_sha256 != checkpointed_sha256:
+        raise ValueError(f"{input_file} was changed before its checkpointed end; rebuild the tables "
+                         f"with build_feature_tables()")
+    if offset == size:
+        df = pd.DataFrame(columns=checkpoint['columns'])
+    else:
+        with open(input_file, 'rb') as f:
+            f.seek(offset)
+            df = pd.read_csv(f, header=None, names=checkpoint['columns'], low_memory=False,
+                             dtype={col: str for col in checkpoint['text_columns']})
+    return df, (size, sha256)
+
+
+def _save_checkpoint(checkpoint_file, checkpoint):
+    """
+    Pickles a checkpoint, through a temporary file so a failed save leaves the previous checkpoint in place.
+    """
+    with open(checkpoint_file + '.tmp', 'wb') as f:
+        pickle.dump(checkpoint, f)
+    os.replace(checkpoint_file + '.tmp', checkpoint_file)
+
+def _update_from_day(format_name, input_file, output_files, checkpoint, designation_file, day):
+    """
+    Rewrites the rows of the processed tables from a checkpointed day on: the tables are cut back to the rows of the
+    days before it, whose running state is recomputed from their MatchWise rows, and the features of every later row
+    are appended. The checkpoint is moved on to the end of input_file (the caller saves it).
+
+    Args:
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        input_file (str): Path of the MatchWise fantasy points CSV.
+        output_files (dict): Tables by kind, as given to build_feature_tables() with the checkpoint.
+        checkpoint (dict): As saved by build_feature_tables() or update_feature_tables(); updated in place.
+        designation_file (str, optional): Designation CSV, needed for the player match table.
+        day (int): Position of the day in checkpoint['days']; the rows of earlier days must be unchanged.
+
+    Returns:
+        int: Number of MatchWise rows whose features were rewritten.
+
+    Raises:
+        ValueError: If no day is kept, or the kept rows no longer come first in the sorted order.
+    """
+    if day == 0:
+        raise ValueError(f"{input_file} was changed from its first day; rebuild the tables with build_feature_tables()")
+    days = checkpoint['days']
+    position = _scan_file(input_file)[:2]
+    df = pd.read_csv(input_file, low_memory=False)
+    if list(df.columns) != checkpoint['columns']:
+        raise ValueError(f"The columns of {input_file} changed; rebuild the tables with build_feature_tables()")
+    dates = df['date']
+    df = sort_matchwise(df)
+
+    # Rows added after the lines of the day before are rewritten with that whole day, so each day stays one block
+    first_row = int(days['rows'].iloc[day])
+    if first_row < len(df) and df['date'].iloc[first_row] == days.index[day - 1]:
+        day -= 1
+        if day == 0:
+            raise ValueError(f"{input_file} was changed from its first day; rebuild the tables with "
+                             f"build_feature_tables()")
+    offset, rows, player_match_rows = (int(days[column].iloc[day]) for column in ('offset', 'rows', 'player_match_rows'))
+    # The kept rows must still be the first lines of the CSV and come before every other row
+    if not (df.index[:rows] == np.arange(rows)).all():
+        raise ValueError(f"Rows of {input_file} now sort among its first {rows}; rebuild the tables with "
+                         f"build_feature_tables()")
+    kept, df = df.iloc[:rows], df.iloc[rows:]
+
+    player_match = None
+    if 'player_match' in output_files:
+        if designation_file is None:
+            raise ValueError("A designation file is needed for the player match table")
+        designation_df = pd.read_csv(designation_file)
+        # In CSV order, with the dates as read, as build_feature_tables() writes it
+        player_match = player_match_table(df.sort_index().assign(date=dates), designation_df, format_name)
+
+    form_state = FormState(checkpoint['form'].match_halflives, checkpoint['form'].day_halflives)
+    form_features(kept, format_name, state=form_state)
+    checkpoint.update(feature_state(kept, format_name, checkpoint['recent_windows']), form=form_state)
+    features = incremental_features(df, format_name, checkpoint)
+
+    if player_match is not None:
+        _truncate_table(output_files['player_match'], player_match_rows)
+        _write_table(output_files['player_match'], player_match, append=True)
+    for kind in TABLE_KINDS:
+        if kind in output_files:
+            _truncate_table(output_files[kind], rows)
+            _write_table(output_files[kind], processed_table(df, features[kind]), append=True)
+    print(f"{len(df)} {format_name} rows after the first {rows} rewritten in the processed tables")
+
+    checkpoint.update(_merge_state(checkpoint, feature_state(df, format_name, checkpoint['recent_windows']),
+                                   checkpoint['recent_windows']))
+    new_days = days.iloc[:day]
+    if len(df) and df.index.is_monotonic_increasing:
+        counts = (_player_match_counts(df, designation_df) if player_match is not None
+                  else np.zeros(len(df), dtype=np.int64))
+        new_days = pd.concat([new_days, _days(input_file, offset, 0, (df['date'].iloc[0], rows, player_match_rows), df,
+                                              (rows, player_match_rows), counts)])
+    elif len(df):
+        new_days = None
+    checkpoint.update({
+        'position': position, 'last_key': _last_key(pd.concat([kept.tail(1), df])), 'rows': rows + len(df),
+        'player_match_rows': player_match_rows + (len(player_match) if player_match is not None else 0),
+        'days': new_days,
+    })
+    return len(df)
+
+
+def update_feature_tables(format_name, input_file, output_files, checkpoint_file, designation_file=None):
+    """
+    Appends the rows of matches added to a MatchWise fantasy points CSV since its checkpoint to the processed tables,
+    computing their features from the checkpointed running state instead of rebuilding from the whole history, and
+    moves the checkpoint on past them. Only the new rows are read, so the cost follows their number (plus the number
+    of players and venues in the state), not the length of the history.
+
+    Rows appended at the end of the CSV that sort after the last checkpointed one by (date, match_id), as later
+    matches and later matches of the same day do, are appended to the tables. When the CSV was rewritten before its
+    checkpointed end (add_fantasy_points rewrites it whole, sorted), or rows that sort among the checkpointed ones
+    were appended, the tables are rewritten from the first day that changed on: the checkpoint keeps where each day
+    starts in the CSV and in the tables. This needs a CSV whose lines were in the sorted order when the checkpoint
+    was saved; for one that was not, a CSV changed from its first day, or processed tables that are not as the
+    checkpoint left them (a run that stopped between writing them and saving the checkpoint), ValueError is raised
+    and the tables need a fresh build_feature_tables() with a new checkpoint.
+
+    Args:
+        format_name (str): 'ODI', 'T20' or 'Test'.
+        input_file (str): Path of the MatchWise fantasy points CSV the checkpoint was saved from.
+        output_files (dict): Tables to append to by kind, as given to build_feature_tables() with the checkpoint.
+        checkpoint_file (str): Checkpoint saved by build_feature_tables() or a previous update; overwritten.
+        designation_file (str, optional): Designation CSV, needed for the player match table.
+
+    Returns:
+        int: Number of MatchWise rows whose features were appended or rewritten.
+    """
+    with open(checkpoint_file, 'rb') as f:
+        checkpoint = pickle.load(f)
+    if checkpoint['format_name'] != format_name:
+        raise ValueError(f"{checkpoint_file} is a {checkpoint['format_name']} checkpoint, not {format_name}")
+    if 'days' not in checkpoint:
+        raise ValueError(f"{checkpoint_file} was saved before rows were ordered by date and match_id; rebuild the "
+                         f"tables with build_feature_tables()")
+    if _output_sizes(output_files) != checkpoint.get('outputs'):
+        raise ValueError(f"The processed {format_name} tables are not the ones {checkpoint_file} was saved with; "
+                         f"rebuild the tables with build_feature_tables()")
+
+    try:
+        df, position = read_appended(input_file, checkpoint)
+    except ValueError:
+        if checkpoint['days'] is None:
+            raise
+        # The days before the first one whose lines changed keep their rows in the tables
+        updated = _update_from_day(format_name, input_file, output_files, checkpoint, designation_file,
+                                   _unchanged_days(input_file, checkpoint))
+        checkpoint['outputs'] = _output_sizes(output_files)
+        _save_checkpoint(checkpoint_file, checkpoint)
+        return updated
+    if df.empty:
+        print(f"No new {format_name} rows in {input_file}")
+        return 0
+
+    player_match = None
+    if 'player_match' in output_files:
+        if designation_file is None:
+            raise ValueError("A designation file is needed for the player match table")
+        designation_df = pd.read_csv(designation_file)
+        player_match = player_match_table(df, designation_df, format_name)
+
+    df = sort_matchwise(df)
+    first_key = (df['date'].iloc[0], df['match_id'].iloc[0])
+    if checkpoint['last_key'] is not None and first_key <= checkpoint['last_key']:
+        if checkpoint['days'] is None:
+            raise ValueError(f"New {format_name} rows date back to {first_key[0]:%Y-%m-%d}, not after the "
+                             f"checkpointed rows; rebuild the tables with build_feature_tables()")
+        # Rows appended out of order: the tables are rewritten from their day on
+        updated = _update_from_day(format_name, input_file, output_files, checkpoint, designation_file,
+                                   int(checkpoint['days'].index.searchsorted(first_key[0])))
+        checkpoint['outputs'] = _output_sizes(output_files)
+        _save_checkpoint(checkpoint_file, checkpoint)
+        return updated
+    features = incremental_features(df, format_name, checkpoint)
+
+    if player_match is not None:
+        _write_table(output_files['player_match'], player_match, append=True)
+    for kind in TABLE_KINDS:
+        if kind in output_files:
+            _write_table(output_files[kind], processed_table(df, features[kind]), append=True)
+    print(f"{len(df)} new {format_name} rows appended to the processed tables")
+
+    checkpoint.update(_merge_state(checkpoint, feature_state(df, format_name, checkpoint['recent_windows']),
+                                   checkpoint['recent_windows']))
+    days = checkpoint['days']
+    if days is not None and df.index.is_monotonic_increasing:
+        # The last checkpointed day's lines run on into the new rows when they are of the same day
+        counts = (_player_match_counts(df, designation_df) if player_match is not None
+                  else np.zeros(len(df), dtype=np.int64))
+        last = days.iloc[-1]
+        days = pd.concat([days.iloc[:-1], _days(input_file, int(last['offset']), checkpoint['rows'] - int(last['rows']),
+                                                (days.index[-1], int(last['rows']), int(last['player_match_rows'])),
+                                                df, (checkpoint['rows'], checkpoint['player_match_rows']), counts)])
+    else:
+        days = None
+    checkpoint.update({
+        'position': position, 'last_key': _last_key(df), 'rows': checkpoint['rows'] + len(df),
+        'player_match_rows': checkpoint['player_match_rows'] + (len(player_match) if player_match is not None else 0),
+        'days': days, 'outputs': _output_sizes(output_files),
+    })
+    _save_checkpoint(checkpoint_file, checkpoint)
+    return len(df)
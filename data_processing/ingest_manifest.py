@@ -0,0 +1,101 @@
+import os
+import sys
+import csv
+import json
+import hashlib
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.match_source import match_file_stat, read_match_file
+
+MANIFEST_VERSION = 2
+
+
+def load_manifest(manifest_path, json_dir):
+    """
+    Loads an ingestion manifest written by save_manifest().
+
+    A manifest records, for every Cricsheet file of json_dir (a directory or archive) that was ingested, its match_id, file name, mtime,
+    size, SHA-256, match type and date, and how many rows it wrote to which format's MatchWise CSV. A missing,
+    unreadable or outdated manifest, or one written for another json_dir, is treated as empty so the next
+    ingest starts from scratch.
+
+    Args:
+        manifest_path (str): Path of the manifest JSON file.
+        json_dir (str): Directory the manifest should describe.
+
+    Returns:
+        dict: {'version', 'json_dir', 'outputs': {format: output record}, 'files': {match_id: entry}}, where
+        an output record (see output_record()) is the CSV path with its size and mtime when the manifest was saved.
+    """
+    empty = {'version': MANIFEST_VERSION, 'json_dir': os.path.abspath(json_dir), 'outputs': {}, 'files': {}}
+    if not manifest_path or not os.path.exists(manifest_path):
+        return empty
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('json_dir') != empty['json_dir']:
+        return empty
+    return manifest
+
+
+def save_manifest(manifest_path, manifest):
+    """
+    Writes a manifest atomically (to a temporary file first, then renamed over the old one).
+    """
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    with open(manifest_path + '.tmp', "w") as f:
+        json.dump(manifest, f)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
+def is_unchanged(entry, source, file_name):
+    """
+    Whether a match file still has the content recorded in its manifest entry.
+
+    The mtime and size are compared first; only when they differ is the file hashed, so a touched but
+    identical file is not ingested again. On a match the entry's mtime is refreshed.
+    """
+    if entry is None:
+        return False
+    stat = match_file_stat(source, file_name)
+    if entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return True
+    if entry['size'] == stat.st_size and entry['sha256'] == hashlib.sha256(read_match_file(source, file_name)).hexdigest():
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return True
+    return False
+
+
+def output_record(output_csv):
+    """
+    Returns the manifest record of a MatchWise CSV: its absolute path, size and mtime.
+    """
+    stat = os.stat(output_csv)
+    return {'path': os.path.abspath(output_csv), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def is_output_unchanged(record):
+    """
+    Whether a MatchWise CSV is still exactly as the manifest saw it. An output written after the manifest was
+    last saved (a run that crashed before saving it) does not match, so it is rebuilt rather than trusted.
+    """
+    if not record or not os.path.exists(record['path']):
+        return False
+    stat = os.stat(record['path'])
+    return record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns
+
+
+def remove_match_rows(output_csv, match_ids, target_csv=None):
+    """
+    Writes a MatchWise CSV without the rows of the given match_ids (the first column), keeping the other
+    rows in order, to target_csv; without a target_csv the CSV is rewritten in place.
+    """
+    match_ids = set(match_ids)
+    staged_csv = target_csv or output_csv + '.tmp'
+    with open(output_csv, "r", newline="") as source, open(staged_csv, "w", newline="") as target:
+        writer = csv.writer(target)
+        writer.writerows(row for row in csv.reader(source) if row[0] not in match_ids)
+    if target_csv is None:
+        os.replace(staged_csv, output_csv)
@@ -0,0 +1,122 @@
+import os
+import csv
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.match_json import decode_match_info
+from data_processing.match_source import list_match_files, map_match_files, match_file_stat, match_id_of, read_match_file
+
+# Columns of the sidecar index; teams are joined with INDEX_TEAM_SEPARATOR
+INDEX_FIELDS = ['match_id', 'file', 'mtime_ns', 'size', 'date', 'match_type', 'gender', 'venue', 'city', 'teams']
+INDEX_TEAM_SEPARATOR = '|'
+
+
+def read_match_info(source, file_name):
+    """
+    Reads the 'info' block of a Cricsheet match file without decoding its innings (see
+    data_processing/match_json.py).
+
+    Args:
+        source (str): Directory or zip / tar archive holding the file (see data_processing/match_source.py).
+        file_name (str): File (or archive member) name.
+
+    Returns:
+        dict: The match's info block.
+    """
+    return decode_match_info(read_match_file(source, file_name))
+
+
+def index_entry(source, file_name):
+    """
+    Builds the index row of one match file.
+    """
+    info = read_match_info(source, file_name)
+    stat = match_file_stat(source, file_name)
+    return {
+        'match_id': match_id_of(file_name),
+        'file': file_name,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'date': info['dates'][0],
+        'match_type': info['match_type'],
+        'gender': info.get('gender', ''),
+        'venue': info.get('venue', ''),
+        'city': info.get('city', ''),
+        'teams': INDEX_TEAM_SEPARATOR.join(info.get('teams', [])),
+    }
+
+
+def load_match_index(index_path):
+    """
+    Loads a sidecar index written by update_match_index().
+
+    Args:
+        index_path (str): Path of the index CSV.
+
+    Returns:
+        dict: file name -> index row (mtime_ns and size as int), or {} if the index does not exist.
+    """
+    if not index_path or not os.path.exists(index_path):
+        return {}
+    with open(index_path, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames != INDEX_FIELDS:
+            return {}
+        index = {}
+        for row in reader:
+            row['mtime_ns'] = int(row['mtime_ns'])
+            row['size'] = int(row['size'])
+            index[row['file']] = row
+        return index
+
+
+def update_match_index(json_dir, index_path, workers=1, chunksize=64):
+    """
+    Brings the sidecar index of a Cricsheet directory (or zip / tar archive) up to date and returns it.
+
+    The index maps every match file to its date, match type, gender, venue, city and teams, so date-range and
+    format filters can pick files without opening them. Only files that are new or whose mtime or size changed
+    since the last update are read (just their info block); entries of deleted files are dropped.
+
+    Args:
+        json_dir (str): Directory, or zip / tar archive, containing the JSON match data.
+        index_path (str): Path of the index CSV, created if missing.
+        workers (int, optional): Number of processes reading new files; None uses every CPU.
+        chunksize (int, optional): Files per task sent to a worker process.
+
+    Returns:
+        dict: file name -> index row, for every JSON file of json_dir.
+    """
+    previous = load_match_index(index_path)
+    index = {}
+    stale = []
+    for file_name in list_match_files(json_dir):
+        entry = previous.get(file_name)
+        stat = match_file_stat(json_dir, file_name)
+        if entry is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            index[file_name] = entry
+        else:
+            stale.append(file_name)
+
+    for entry in map_match_files(index_entry, json_dir, stale, workers, chunksize):
+        index[entry['file']] = entry
+
+    if stale or len(index) != len(previous):
+        os.makedirs(os.path.dirname(index_path) or '.', exist_ok=True)
+        with open(index_path + '.tmp', "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=INDEX_FIELDS)
+            writer.writeheader()
+            writer.writerows(sorted(index.values(), key=lambda entry: entry['file']))
+        os.replace(index_path + '.tmp', index_path)
+    return index
+
+
+if __name__ == "__main__":
+    import time
+
+    json_dir = "../data/raw/cricksheet_data/all_json"
+    index_path = "../data/interim/match_index.csv"
+
+    start = time.perf_counter()
+    index = update_match_index(json_dir, index_path)
+    print(f"Indexed {len(index)} matches in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,120 @@
+import os
+import sys
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_loads(content):
+    """
+    orjson.loads, retried with the standard library on input orjson rejects (NaN / Infinity literals, integers
+    beyond 64 bits), so both backends accept and return exactly the same documents.
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(content)
+
+
+# Decoders of a whole match file (bytes or str -> Python objects), by name
+JSON_BACKENDS = {'json': json.loads}
+if orjson is not None:
+    JSON_BACKENDS['orjson'] = _orjson_loads
+
+# The fastest installed backend, unless CRICSHEET_JSON_BACKEND names another one
+_backend = os.environ.get('CRICSHEET_JSON_BACKEND') or ('orjson' if orjson is not None else 'json')
+if _backend not in JSON_BACKENDS:
+    _backend = 'json'
+
+_decoder = json.JSONDecoder()
+
+
+def json_backend():
+    """
+    Name of the backend loads() currently uses.
+    """
+    return _backend
+
+
+def set_json_backend(name):
+    """
+    Selects the backend used by loads() in this process (and in worker processes forked after the call).
+
+    Args:
+        name (str): A key of JSON_BACKENDS: 'json', or 'orjson' when it is installed.
+
+    Returns:
+        str: The previously selected backend, so callers can restore it.
+    """
+    global _backend
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}; available: {', '.join(JSON_BACKENDS)}")
+    previous, _backend = _backend, name
+    return previous
+
+
+def loads(content):
+    """
+    Decodes a whole match file with the selected backend. Invalid documents raise json.JSONDecodeError
+    (orjson's error type subclasses it).
+    """
+    return JSON_BACKENDS[_backend](content)
+
+
+def decode_match_info(content):
+    """
+    Decodes only the 'info' block of a Cricsheet match file, without decoding its innings.
+
+    Cricsheet files start with 'meta' and 'info' and end with the (much larger) 'innings', so the info object is
+    decoded on its own from where its key starts. Files laid out differently fall back to a full loads().
+
+    Args:
+        content (bytes): The match file's content.
+
+    Returns:
+        dict: The match's info block.
+    """
+    text = content.decode("utf-8") if isinstance(content, bytes) else content
+    key = text.find('"info"')
+    if key >= 0:
+        start = text.index(':', key) + 1
+        while text[start].isspace():
+            start += 1
+        try:
+            info, _ = _decoder.raw_decode(text, start)
+            if isinstance(info, dict) and 'dates' in info and 'match_type' in info:
+                return info
+        except ValueError:
+            pass
+    return loads(content)['info']
+
+
+if __name__ == "__main__":
+    # Per-file decode time of every backend, by format, on a Cricsheet directory or archive
+    import time
+    from collections import defaultdict
+
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from data_processing.MatchWise import match_format
+    from data_processing.match_source import list_match_files, read_match_file
+
+    json_dir = sys.argv[1] if len(sys.argv) > 1 else "../ipl_json.zip"
+    samples = defaultdict(list)
+    for file_name in list_match_files(json_dir):
+        content = read_match_file(json_dir, file_name)
+        samples[match_format(decode_match_info(content)['match_type'])].append(content)
+
+    decoders = dict(JSON_BACKENDS, info_only=decode_match_info)
+    print(f"{'format':<8}{'files':>7}{'KB/file':>9}" + ''.join(f"{name:>12}" for name in decoders) + "  (ms/file)")
+    for format_name, contents in sorted(samples.items(), key=lambda item: str(item[0])):
+        timings = []
+        for decode in decoders.values():
+            start = time.perf_counter()
+            for content in contents:
+                decode(content)
+            timings.append((time.perf_counter() - start) * 1000 / len(contents))
+        size = sum(map(len, contents)) / len(contents) / 1024
+        print(f"{str(format_name):<8}{len(contents):>7}{size:>9.1f}" + ''.join(f"{ms:>12.3f}" for ms in timings))
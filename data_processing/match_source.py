@@ -0,0 +1,132 @@
+import os
+import tarfile
+import zipfile
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from types import SimpleNamespace
+
+# Archives opened by this process, kept open so reading many members does not reopen (or rescan) them.
+# Entries carry the pid so a forked worker opens its own file handle instead of sharing the parent's offset.
+_open_archives = {}
+
+
+def archive_kind(source):
+    """
+    Returns 'zip' or 'tar' when source is a zip or tar (optionally compressed) archive, or None for a directory.
+    """
+    if os.path.isdir(source):
+        return None
+    if zipfile.is_zipfile(source):
+        return 'zip'
+    if tarfile.is_tarfile(source):
+        return 'tar'
+    raise ValueError(f"{source} is neither a directory nor a zip or tar archive")
+
+
+def _archive(source):
+    """
+    (kind, archive, members by name) of an archive source, opened once per process and reopened if the file
+    changed, or None for a directory.
+    """
+    if os.path.isdir(source):
+        return None
+    key = os.path.abspath(source)
+    stat = os.stat(key)
+    signature = (os.getpid(), stat.st_mtime_ns, stat.st_size)
+    cached = _open_archives.get(key)
+    if cached is None or cached[0] != signature:
+        if cached is not None and cached[0][0] == os.getpid():
+            cached[2].close()
+        kind = archive_kind(source)
+        if kind == 'zip':
+            archive = zipfile.ZipFile(source)
+            members = {info.filename: info for info in archive.infolist()}
+        else:
+            archive = tarfile.open(source)
+            members = {member.name: member for member in archive.getmembers()}
+        cached = _open_archives[key] = (signature, kind, archive, members)
+    return cached[1:]
+
+
+def list_match_files(source):
+    """
+    Lists the Cricsheet JSON files of a directory, or the JSON members of a zip or tar archive.
+
+    Args:
+        source (str): Directory, or path of a zip / tar(.gz, .bz2, .xz) archive such as ipl_json.zip.
+
+    Returns:
+        list: File names (member names for archives), in directory or archive order.
+    """
+    archive = _archive(source)
+    if archive is None:
+        return [file_name for file_name in os.listdir(source) if file_name.endswith(".json")]
+    kind, archive, members = archive
+    if kind == 'zip':
+        return [name for name, info in members.items() if name.endswith(".json") and not info.is_dir()]
+    return [name for name, member in members.items() if name.endswith(".json") and member.isfile()]
+
+
+def match_id_of(file_name):
+    """
+    Match id of a match file: its base name up to the first dot (archive members may sit in a folder).
+    """
+    return os.path.basename(file_name).split('.')[0]
+
+
+def read_match_file(source, file_name):
+    """
+    Reads one match file's bytes, straight from the archive for zip and tar sources (nothing is extracted to disk).
+    """
+    archive = _archive(source)
+    if archive is None:
+        with open(os.path.join(source, file_name), "rb") as f:
+            return f.read()
+    kind, archive, members = archive
+    if kind == 'zip':
+        return archive.read(members[file_name])
+    return archive.extractfile(members[file_name]).read()
+
+
+def match_file_stat(source, file_name):
+    """
+    mtime (in ns) and size of one match file, as st_mtime_ns / st_size like os.stat().
+    """
+    archive = _archive(source)
+    if archive is None:
+        return os.stat(os.path.join(source, file_name))
+    kind, archive, members = archive
+    if kind == 'zip':
+        # zip stores local time to 2 seconds, which is enough to notice a replaced member
+        info = members[file_name]
+        return SimpleNamespace(st_mtime_ns=int(datetime(*info.date_time).timestamp() * 1e9), st_size=info.file_size)
+    member = members[file_name]
+    return SimpleNamespace(st_mtime_ns=int(member.mtime * 1e9), st_size=member.size)
+
+
+def map_match_files(func, source, file_names, workers=1, chunksize=64):
+    """
+    Applies func(source, file_name) to every file, in a process pool when workers > 1, and yields the results in
+    the order of file_names.
+
+    Workers read their files themselves (archives are opened once per worker process), so only file names go to
+    the pool and only func's results come back.
+
+    Args:
+        func (callable): Picklable function of (source, file_name), e.g. one that reads and parses a match.
+        source (str): Directory or archive, as for list_match_files().
+        file_names (list): Files to process.
+        workers (int, optional): Number of processes; 1 runs in this process, None uses every CPU.
+        chunksize (int, optional): Files per task sent to a worker process.
+
+    Returns:
+        Iterator: func's result for each file, in order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(file_names) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(partial(func, source), file_names, chunksize=chunksize)
+    else:
+        for file_name in file_names:
+            yield func(source, file_name)
@@ -1,5 +1,11 @@
+import os
+import sys
 import pandas as pd
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.columnar_cache import write_columnar_cache
+from data_processing.feature_builder import player_match_table
+
 
 def process_player_match_data(designation_file, odi_matchwise_file, output_file):
     """
@@ -19,20 +25,12 @@ def process_player_match_data(designation_file, odi_matchwise_file, output_file)
         print("ODI MatchWise Columns:", odi_matchwise_df.columns)
         print("Designation Columns:", designation_df.columns)
 
-        # Ensure both 'player_id' and 'player_name' are present in both dataframes
-        required_columns = {'player_id', 'player_name'}
-        if not required_columns.issubset(odi_matchwise_df.columns):
-            raise ValueError("'player_id' or 'player_name' not found in ODI MatchWise data.")
-        if not required_columns.issubset(designation_df.columns):
-            raise ValueError("'player_id' or 'player_name' not found in Designation data.")
-
-        # Perform an inner join on both 'player_id' and 'player_name' to ensure accurate matches
-        player_match_data = odi_matchwise_df.merge(designation_df, on=['player_id', 'player_name'], how='inner')[
-            ['match_id', 'player_id', 'player_name', 'fantasy_points', 'team_name', 'role', 'date','venue']
-        ]
+        # Inner join on both 'player_id' and 'player_name' to ensure accurate matches
+        player_match_data = player_match_table(odi_matchwise_df, designation_df, 'ODI')
 
         # Save the resulting dataframe to a CSV file
         player_match_data.to_csv(output_file, index=False)
+        write_columnar_cache(output_file, player_match_data)
         print(f"CSV file '{output_file}' created successfully!")
 
     except Exception as e:
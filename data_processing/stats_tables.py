@@ -1,7 +1,11 @@
-from ODI import *
-from Test import *
-from T20 import *
-from venue import *
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.ODI import *
+from data_processing.Test import *
+from data_processing.T20 import *
+from data_processing.venue import *
 """
 Cricket Match Data Processing
 
@@ -0,0 +1,247 @@
+import os
+import sys
+import hashlib
+import logging
+import pandas as pd
+from typing import Dict, List, Optional
+
+# pyarrow is optional: without it every table is read from its CSV as before
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+CACHE_SUFFIX = '.feather'
+# Columns a cache built from a CSV holds as text, so ids like '01234567' keep their leading zeros
+ID_COLUMNS = ('match_id', 'player_id')
+
+# Schema metadata keys tying a cache file to the exact CSV it was written from
+_SOURCE_SHA256 = b'source_sha256'
+_SOURCE_SIZE = b'source_size'
+_SOURCE_MTIME_NS = b'source_mtime_ns'
+
+
+def cache_path(csv_path: str) -> str:
+    """
+    Path of the columnar copy of a CSV, e.g. career_t20.csv -> career_t20.feather
+    """
+    return os.path.splitext(csv_path)[0] + CACHE_SUFFIX
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file's content, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _as_written(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    df with datetimes stored the way to_csv writes them, so a cache hit returns what reading the CSV returns.
+    """
+    df = df.reset_index(drop=True)
+    for col in df.columns[[pd.api.types.is_datetime64_any_dtype(dtype) for dtype in df.dtypes]]:
+        df[col] = df[col].astype(str)
+    return df
+
+
+def write_columnar_cache(csv_path: str, df: pd.DataFrame) -> Optional[str]:
+    """
+    Write df as an uncompressed Feather file next to csv_path, stamped with the CSV's content hash.
+    Call it right after df.to_csv(csv_path) so the cache and the CSV hold the same table.
+
+    Args:
+        csv_path (str): The CSV that df was just written to.
+        df (pd.DataFrame): The table written to csv_path.
+
+    Returns:
+        Optional[str]: Path of the cache file, or None if it could not be written (the CSV is still usable).
+    """
+    if pa is None:
+        return None
+    try:
+        df = _as_written(df)
+        stat = os.stat(csv_path)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _SOURCE_SHA256: file_sha256(csv_path).encode(),
+            _SOURCE_SIZE: str(stat.st_size).encode(),
+            _SOURCE_MTIME_NS: str(stat.st_mtime_ns).encode(),
+        })
+
+        # Write to a temporary file first so readers never see a half-written cache
+        path = cache_path(csv_path)
+        feather.write_feather(table, path + '.tmp', compression='uncompressed')
+        os.replace(path + '.tmp', path)
+        return path
+    except Exception as e:
+        logging.warning(f"Could not write columnar cache for {csv_path}: {e}")
+        return None
+
+
+def _is_fresh(csv_path: str, path: str) -> bool:
+    """
+    Whether the cache at path was written from the current content of csv_path.
+    Size and mtime are checked first; the content hash is only computed when they differ.
+    """
+    with pa.memory_map(path, 'r') as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    if _SOURCE_SHA256 not in metadata:
+        return False
+    stat = os.stat(csv_path)
+    if metadata.get(_SOURCE_SIZE) == str(stat.st_size).encode() and metadata.get(_SOURCE_MTIME_NS) == str(stat.st_mtime_ns).encode():
+        return True
+    return metadata[_SOURCE_SHA256] == file_sha256(csv_path).encode()
+
+
+def is_cache_fresh(csv_path: str) -> bool:
+    """
+    Whether csv_path has a cache written from its current content.
+    """
+    path = cache_path(csv_path)
+    try:
+        return pa is not None and os.path.exists(path) and _is_fresh(csv_path, path)
+    except Exception:
+        return False
+
+
+def append_columnar_cache(csv_path: str, rows: pd.DataFrame, was_fresh: bool) -> Optional[str]:
+    """
+    Bring the cache of csv_path up to date after rows were appended to the CSV. A cache that was fresh before the
+    append is extended with rows (in the cache's column types); any other is rewritten from the whole CSV.
+
+    Args:
+        csv_path (str): The CSV that rows were just appended to.
+        rows (pd.DataFrame): The appended rows.
+        was_fresh (bool): is_cache_fresh(csv_path) from before the append.
+
+    Returns:
+        Optional[str]: Path of the cache file, or None if it could not be written (the CSV is still usable).
+    """
+    if pa is None:
+        return None
+    if was_fresh:
+        try:
+            cached = feather.read_table(cache_path(csv_path)).to_pandas()
+            rows = _as_written(rows)[list(cached.columns)].astype(cached.dtypes.to_dict())
+            return write_columnar_cache(csv_path, pd.concat([cached, rows], ignore_index=True))
+        except Exception as e:
+            logging.info(f"Could not extend columnar cache of {csv_path}, rewriting it: {e}")
+    return write_columnar_cache(csv_path, read_csv_for_cache(csv_path))
+
+
+def truncate_columnar_cache(csv_path: str, rows: int, was_fresh: bool) -> Optional[str]:
+    """
+    Bring the cache of csv_path up to date after the CSV was cut back to its first rows. A cache that was fresh
+    before the cut keeps its first rows; any other is rewritten from the whole CSV.
+
+    Args:
+        csv_path (str): The CSV that was just cut back.
+        rows (int): Number of rows left in the CSV.
+        was_fresh (bool): is_cache_fresh(csv_path) from before the cut.
+
+    Returns:
+        Optional[str]: Path of the cache file, or None if it could not be written (the CSV is still usable).
+    """
+    if pa is None:
+        return None
+    if was_fresh:
+        try:
+            cached = feather.read_table(cache_path(csv_path)).slice(0, rows).to_pandas()
+            return write_columnar_cache(csv_path, cached)
+        except Exception as e:
+            logging.info(f"Could not cut back columnar cache of {csv_path}, rewriting it: {e}")
+    return write_columnar_cache(csv_path, read_csv_for_cache(csv_path))
+
+
+def _asks_ids_as_text(columns: List[str], dtype: Optional[Dict[str, str]]) -> bool:
+    """
+    Whether dtype reads every id column among columns as text. Caches may hold ids as text, which only then gives
+    what pd.read_csv gives (without a dtype it would infer numbers).
+    """
+    return all(col not in columns or pd.api.types.is_string_dtype(pd.Series(dtype=(dtype or {}).get(col, 'float64')))
+               for col in ID_COLUMNS)
+
+
+def _apply_read_options(df: pd.DataFrame, dtype: Optional[Dict[str, str]], parse_dates: Optional[List[str]]) -> pd.DataFrame:
+    """
+    Give a cached table the dtypes pd.read_csv(dtype=..., parse_dates=...) would have produced.
+    """
+    if dtype:
+        df = df.astype({col: col_dtype for col, col_dtype in dtype.items() if col in df.columns})
+    for col in parse_dates or []:
+        df[col] = pd.to_datetime(df[col])
+    return df
+
+
+def read_table(csv_path: str, dtype: Optional[Dict[str, str]] = None, parse_dates: Optional[List[str]] = None, **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Read a processed table, preferring its memory-mapped Feather copy and falling back to the CSV.
+
+    The cache holds the whole table as the pipeline wrote it (see write_columnar_cache and build_columnar_caches);
+    dtype and parse_dates are applied to it per call. Reads with any other pd.read_csv option (usecols, nrows, ...)
+    go to the CSV, as does a read whose cache is missing or stale. Reads never write a cache, so what one caller
+    asked for is never handed to the next.
+
+    Args:
+        csv_path (str): Path of the CSV table.
+        dtype (Optional[Dict[str, str]]): Column dtypes, as for pd.read_csv.
+        parse_dates (Optional[List[str]]): Columns to parse as datetimes, as for pd.read_csv.
+        **read_csv_kwargs: Passed to pd.read_csv; given any, the table is read from the CSV.
+
+    Returns:
+        pd.DataFrame: The table.
+    """
+    path = cache_path(csv_path)
+    if pa is not None and not read_csv_kwargs and os.path.exists(path):
+        try:
+            if not _is_fresh(csv_path, path):
+                logging.info(f"Columnar cache {path} is stale, reading {csv_path}")
+            else:
+                table = feather.read_table(path, memory_map=True)
+                if _asks_ids_as_text(table.column_names, dtype):
+                    return _apply_read_options(table.to_pandas(), dtype, parse_dates)
+        except Exception as e:
+            logging.warning(f"Could not read columnar cache {path}, reading {csv_path}: {e}")
+
+    return pd.read_csv(csv_path, dtype=dtype, parse_dates=parse_dates, **read_csv_kwargs)
+
+
+def read_csv_for_cache(csv_path: str) -> pd.DataFrame:
+    """
+    The whole table of a CSV as its cache holds it: every column, with types inferred as pd.read_csv does,
+    except the ids, which stay text so ids like '01234567' keep their leading zeros.
+    """
+    return pd.read_csv(csv_path, dtype={col: 'string' for col in ID_COLUMNS}, low_memory=False)
+
+
+def build_columnar_caches(directory: str) -> List[str]:
+    """
+    Write (or refresh) the columnar copy of every CSV under directory.
+
+    Returns:
+        List[str]: Paths of the cache files written.
+    """
+    written = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if name.endswith('.csv'):
+                csv_path = os.path.join(root, name)
+                path = write_columnar_cache(csv_path, read_csv_for_cache(csv_path))
+                if path:
+                    written.append(path)
+    return written
+
+
+if __name__ == '__main__':
+    # Example Usage: python columnar_cache.py ../data/processed
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), '../data/processed')
+    for path in build_columnar_caches(directory):
+        print(f"Wrote {path}")
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+from model.team_optimizer import CAPTAIN_MULTIPLIERS, ROLES, optimal_team_indices
+
+
+def select_dream_teams(data: pd.DataFrame, points_col: str, team_size: int = 11, max_per_team: int = 10) -> Tuple[pd.DataFrame, List[Tuple[object, str]]]:
+    """
+    Pick the dream team of every match in one pass, with the same result as running
+    select_dream_team() on each match's players separately.
+
+    Players are ranked within each match by one stable lexsort on (match, points). The top team_size of a
+    match are its optimal team whenever they are feasible (every role of the pool represented, at most
+    max_per_team from one side); that is checked for all matches at once with grouped counts. Only the
+    matches that fail the check go through the branch and bound optimizer.
+
+    Args:
+        data (pd.DataFrame): One row per player per match, with match_id, date, role, team_name and points_col.
+        points_col (str): Column to maximize, e.g. 'predicted_fantasy_points' or 'actual_fantasy_points'.
+        team_size (int): Players per team.
+        max_per_team (int): Maximum players from one side.
+
+    Returns:
+        Tuple[pd.DataFrame, List[Tuple[object, str]]]: The selected rows, grouped by match_id in ascending order and
+        best first within a match (date is the first date listed for the match), and the (match_id, status) of
+        matches where no team could be formed.
+    """
+    match_codes, match_ids = pd.factorize(data['match_id'], sort=True)
+    n_matches = len(match_ids)
+    points = data[points_col].to_numpy(dtype='float64')
+    role_index = {role.lower(): code for code, role in enumerate(ROLES)}
+    role_codes = np.array([role_index.get(str(role).lower(), -1) for role in data['role'].to_numpy(dtype=object)], dtype=np.int64)
+    team_codes, team_names = pd.factorize(data['team_name'], use_na_sentinel=False)
+
+    # Rank players within each match, best first; lexsort is stable so ties keep the file order
+    order = np.lexsort((-points, match_codes))
+    sorted_codes = match_codes[order]
+    starts = np.searchsorted(sorted_codes, np.arange(n_matches))
+    sizes = np.bincount(match_codes, minlength=n_matches)
+    ranks = np.arange(len(order)) - starts[sorted_codes]
+    top = order[ranks < team_size]
+    top_codes = match_codes[top]
+
+    # Every role present in a match's pool must appear in its top team
+    has_role = role_codes >= 0
+    present = np.zeros((n_matches, len(ROLES)), dtype=bool)
+    present[match_codes[has_role], role_codes[has_role]] = True
+    in_top = np.zeros((n_matches, len(ROLES)), dtype=np.int64)
+    top_has_role = has_role[top]
+    np.add.at(in_top, (top_codes[top_has_role], role_codes[top][top_has_role]), 1)
+    roles_ok = ~(present & (in_top == 0)).any(axis=1)
+
+    # Largest number of players from one side in each top team
+    n_teams = max(len(team_names), 1)
+    side_keys, side_counts = np.unique(top_codes.astype(np.int64) * n_teams + team_codes[top], return_counts=True)
+    max_side = np.zeros(n_matches, dtype=np.int64)
+    np.maximum.at(max_side, side_keys // n_teams, side_counts)
+
+    feasible = (sizes >= team_size) & roles_ok & (max_side <= max_per_team)
+    selected = [top[feasible[top_codes]]]
+
+    # The few matches whose top players break a constraint go through the exact optimizer
+    failed = []
+    roles = data['role'].to_numpy(dtype=object)
+    for code in np.flatnonzero(~feasible):
+        rows = order[starts[code]:starts[code] + sizes[code]]
+        indices = optimal_team_indices(points[rows], roles[rows], team_codes[rows],
+                                       team_size=team_size, max_per_team=max_per_team)
+        if indices is None:
+            failed.append((match_ids[code], "Infeasible"))
+        else:
+            selected.append(rows[indices])
+
+    rows = np.concatenate(selected) if selected else np.array([], dtype=np.int64)
+    rows = rows[np.argsort(match_codes[rows], kind='stable')]
+
+    teams = data.iloc[rows].reset_index(drop=True)
+    if 'date' in data.columns:
+        first_rows = np.unique(match_codes, return_index=True)[1]
+        teams['date'] = data['date'].to_numpy()[first_rows][match_codes[rows]]
+    return teams, failed
+
+
+def captain_weighted_points(team_df: pd.DataFrame, match_ids: pd.Index) -> np.ndarray:
+    """
+    For each match in match_ids, the team's predicted points with the captain and vice-captain (the two
+    highest predicted) doubled and x1.5, like calculate_team_points() on each match's rows.
+    """
+    codes = match_ids.get_indexer(team_df['match_id'])
+    predicted = team_df['predicted_fantasy_points'].to_numpy(dtype='float64')
+    order = np.lexsort((-predicted, codes))
+    sorted_codes = codes[order]
+    ranks = np.arange(len(order)) - np.searchsorted(sorted_codes, sorted_codes)
+    weights = np.ones(len(order))
+    for rank, multiplier in enumerate(CAPTAIN_MULTIPLIERS):
+        weights[ranks == rank] = multiplier
+    known = sorted_codes >= 0
+    return np.bincount(sorted_codes[known], weights=(predicted[order] * weights)[known], minlength=len(match_ids))
+
+
+def summarize_dream_teams(predicted_df: pd.DataFrame, actual_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-match summary of the predicted and actual dream teams, computed with grouped sums instead of
+    filtering both tables once per match.
+
+    Args:
+        predicted_df (pd.DataFrame): Teams picked by predicted points (dream_team_with_predicted_fantasy_points.csv).
+        actual_df (pd.DataFrame): Teams picked by actual points (dream_team_with_actual_fantasy_points.csv).
+
+    Returns:
+        pd.DataFrame: match_id and the four sum_* columns, in the order matches appear in predicted_df.
+    """
+    match_ids = pd.Index(predicted_df['match_id'].unique())
+
+    def actual_points(team_df: pd.DataFrame) -> np.ndarray:
+        # groupby keeps the column's dtype, so integer points stay integers as with Series.sum()
+        sums = team_df.groupby('match_id', sort=False)['actual_fantasy_points'].sum()
+        return sums.reindex(match_ids, fill_value=0).to_numpy()
+
+    return pd.DataFrame({
+        'match_id': match_ids,
+        'sum_predicted_points_predicted_team': captain_weighted_points(predicted_df, match_ids),
+        'sum_predicted_points_actual_team': captain_weighted_points(actual_df, match_ids),
+        'sum_actual_points_predicted_team': actual_points(predicted_df),
+        'sum_actual_points_actual_team': actual_points(actual_df),
+    })
@@ -0,0 +1,253 @@
+import re
+import threading
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Composite sort keys are (code << 32) + day, so one searchsorted resolves every (player, date) query at once
+_KEY_SHIFT = np.int64(1) << np.int64(32)
+
+# Form columns holding a number of matches decayed by calendar days (form_ewm<half-life>d_matches_<format>)
+_DECAYED_MATCHES = re.compile(r'^form_ewm(\d+)d_matches_')
+
+
+class IndexedTable:
+    """
+    A career/recent/venue/form table held as a float matrix plus a (player_id, match_id) -> row index.
+
+    Args:
+        data (pd.DataFrame): Table with 'player_id', 'match_id' and one column per feature.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.feature_names = [col for col in data.columns if col not in ['player_id', 'match_id']]
+        self.values = data[self.feature_names].to_numpy(dtype='float64')
+
+        keys = zip(data['player_id'].astype(str).to_numpy(dtype=object), data['match_id'].astype(str).to_numpy(dtype=object))
+        # Keep the first row for a key, like generate_tuple_from_data() does
+        self.index = {}
+        for row, key in enumerate(keys):
+            self.index.setdefault(key, row)
+
+    def rows_for(self, player_ids: np.ndarray, match_ids: np.ndarray) -> np.ndarray:
+        """
+        Row positions for each (player_id, match_id) pair, -1 where the pair is not in the table.
+        """
+        return np.fromiter((self.index.get(key, -1) for key in zip(player_ids, match_ids)), dtype=np.int64, count=len(player_ids))
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Gather feature rows; positions of -1 become rows of zeros.
+        """
+        out = np.zeros((len(rows), len(self.feature_names)), dtype='float64')
+        found = rows >= 0
+        out[found] = self.values[rows[found]]
+        return out
+
+
+class FeatureStore:
+    """
+    Point-in-time lookup over the processed tables of one tournament type.
+
+    The career, recent and venue tables are indexed by (player_id, match_id). The player match data
+    is kept as arrays sorted by (player, date) and by ((player, venue), date) under integer composite
+    keys, so resolving "latest match on or before a date" for a whole squad is a single vectorized
+    binary search (an as-of join) instead of a scan over the whole table per player.
+
+    The optional form table (exponentially weighted form, see data_processing/feature_builder.py) is resolved
+    through the same latest match as the career and recent tables, its features following theirs in feature_names.
+    Its numbers of matches decayed by calendar days are aged from that match's date to the queried date on the way
+    out, so they are as of the queried match rather than the player's last one.
+
+    Args:
+        career_data (pd.DataFrame): career_<format>.csv
+        recent_data (pd.DataFrame): recent_<format>.csv
+        venue_data (pd.DataFrame): venue_<format>.csv
+        player_match_data (pd.DataFrame): player_match_data_<format>.csv (needs 'date' and 'venue')
+        form_data (pd.DataFrame, optional): form_<format>.csv
+    """
+
+    def __init__(self, career_data: pd.DataFrame, recent_data: pd.DataFrame, venue_data: pd.DataFrame, player_match_data: pd.DataFrame,
+                 form_data: Optional[pd.DataFrame] = None):
+        # The source tables stay reachable for callers that still want the raw DataFrames
+        self.career_data = career_data
+        self.recent_data = recent_data
+        self.venue_data = venue_data
+        self.player_match_data = player_match_data
+        self.form_data = form_data
+
+        self.career = IndexedTable(career_data)
+        self.recent = IndexedTable(recent_data)
+        self.venue = IndexedTable(venue_data)
+        self.form = IndexedTable(form_data) if form_data is not None else None
+        # Career + recent + venue columns, the inputs of models trained without form features
+        self.base_feature_names = self.career.feature_names + self.recent.feature_names + self.venue.feature_names
+        self.feature_names = self.base_feature_names
+        if self.form is not None:
+            self.feature_names = self.feature_names + self.form.feature_names
+            # Column positions and half-lives (days) of the form table's decayed numbers of matches
+            decayed = [(i, _DECAYED_MATCHES.match(name)) for i, name in enumerate(self.form.feature_names)]
+            self._decayed_columns = np.array([i for i, match in decayed if match], dtype=np.int64)
+            self._decayed_halflives = np.array([float(match.group(1)) for _, match in decayed if match])
+
+        player_ids = player_match_data['player_id'].astype(str).to_numpy(dtype=object)
+        match_ids = player_match_data['match_id'].astype(str).to_numpy(dtype=object)
+        days = pd.to_datetime(player_match_data['date']).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+        player_codes, player_uniques = pd.factorize(player_ids)
+        venue_codes, venue_uniques = pd.factorize(player_match_data['venue'].to_numpy(dtype=object))
+        self._player_codes = {player_id: code for code, player_id in enumerate(player_uniques)}
+        self._venue_codes = {venue: code for code, venue in enumerate(venue_uniques)}
+        self._n_venues = max(len(venue_uniques), 1)
+        self._base_day = int(days.min()) - 1 if len(days) else 0
+
+        # lexsort is stable, so for same-day matches the later row in the file wins
+        order = np.lexsort((days, player_codes))
+        self._match_ids = match_ids[order]
+        self._player_keys = self._keys(player_codes[order], days[order])
+        self._career_rows = self.career.rows_for(player_ids[order], self._match_ids)
+        self._recent_rows = self.recent.rows_for(player_ids[order], self._match_ids)
+        if self.form is not None:
+            self._days = days[order]
+            self._form_rows = self.form.rows_for(player_ids[order], self._match_ids)
+
+        # Rows without a venue can never match a venue query, so they are left out of the venue index
+        has_venue = venue_codes >= 0
+        pair_codes = player_codes[has_venue].astype(np.int64) * self._n_venues + venue_codes[has_venue]
+        order = np.lexsort((days[has_venue], pair_codes))
+        self._venue_match_ids = match_ids[has_venue][order]
+        self._venue_keys = self._keys(pair_codes[order], days[has_venue][order])
+        self._venue_rows = self.venue.rows_for(player_ids[has_venue][order], self._venue_match_ids)
+
+    def _keys(self, codes: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """
+        Composite (code, day) sort keys. Days are offset so stored rows are >= 1 and clipped so queries
+        before the first stored date land on 0 and match nothing.
+        """
+        offset = np.clip(days - self._base_day, 0, _KEY_SHIFT - 1)
+        return codes.astype(np.int64) * _KEY_SHIFT + offset
+
+    def _asof(self, keys: np.ndarray, codes: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """
+        For each (code, day) query, the position of the last stored row with the same code and a date
+        on or before day, or -1.
+        """
+        positions = np.searchsorted(keys, self._keys(codes, days), side='right') - 1
+        found = (codes >= 0) & (positions >= 0)
+        found[found] = keys[positions[found]] // _KEY_SHIFT == codes[found]
+        return np.where(found, positions, -1)
+
+    def _resolve(self, player_ids: Sequence[str], match_date, venue) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Positions of the latest match overall and at the venue for every queried player, and the queried days.
+        match_date and venue may be scalars or per-player sequences.
+        """
+        n = len(player_ids)
+        dates = pd.to_datetime(match_date if np.ndim(match_date) else [match_date])
+        days = np.broadcast_to(dates.values.astype('datetime64[D]').astype(np.int64), (n,))
+        venues = [venue] * n if isinstance(venue, str) or np.ndim(venue) == 0 else list(venue)
+
+        player_codes = np.fromiter((self._player_codes.get(str(player_id), -1) for player_id in player_ids), dtype=np.int64, count=n)
+        venue_codes = np.fromiter((self._venue_codes.get(v, -1) for v in venues), dtype=np.int64, count=n)
+        pair_codes = np.where((player_codes >= 0) & (venue_codes >= 0), player_codes * self._n_venues + venue_codes, -1)
+
+        return self._asof(self._player_keys, player_codes, days), self._asof(self._venue_keys, pair_codes, days), days
+
+    def latest_match_ids(self, player_id: str, match_date, venue: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Find the player's latest match on or before match_date, overall and at the given venue.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (match_id for career/recent stats, match_id for venue stats)
+        """
+        position_1, position_2 = (int(p[0]) for p in self._resolve([player_id], match_date, venue)[:2])
+        match_id_1 = self._match_ids[position_1] if position_1 >= 0 else None
+        match_id_2 = self._venue_match_ids[position_2] if position_2 >= 0 else None
+        return match_id_1, match_id_2
+
+    def feature_matrix(self, player_ids: Sequence[str], match_date, venue) -> np.ndarray:
+        """
+        Build the wide (players x feature_names) matrix for a whole squad in one pass.
+
+        Args:
+            player_ids (Sequence[str]): Players to look up, one output row each, in the given order.
+            match_date: Match date, either one for all players or one per player.
+            venue: Venue, either one for all players or one per player.
+
+        Returns:
+            np.ndarray: float64 matrix of career + recent form + venue (+ form) features. Tables without a row
+            for the resolved match contribute zeros.
+        """
+        positions_1, positions_2, days = self._resolve(player_ids, match_date, venue)
+        career_rows = np.where(positions_1 >= 0, self._career_rows[positions_1], -1)
+        recent_rows = np.where(positions_1 >= 0, self._recent_rows[positions_1], -1)
+        venue_rows = np.where(positions_2 >= 0, self._venue_rows[positions_2], -1)
+        blocks = [self.career.take(career_rows), self.recent.take(recent_rows), self.venue.take(venue_rows)]
+        if self.form is not None:
+            blocks.append(self._form_features(positions_1, days))
+        return np.hstack(blocks)
+
+    def _form_features(self, positions: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """
+        Form features of the resolved matches, with their decayed numbers of matches aged to the queried days.
+        """
+        found = positions >= 0
+        form = self.form.take(np.where(found, self._form_rows[positions], -1))
+        elapsed = np.where(found, days - self._days[positions], 0)
+        form[:, self._decayed_columns] *= np.exp2(-elapsed[:, None] / self._decayed_halflives)
+        return form
+
+    def player_features(self, player_id: str, match_date, venue: str) -> List[float]:
+        """
+        Build the career + recent form + venue (+ form) feature vector for a single player, in feature_names order.
+        """
+        return self.feature_matrix([player_id], match_date, venue)[0].tolist()
+
+
+class LazyRegistry:
+    """
+    Thread-safe, load-on-first-use cache of one object per key (e.g. one FeatureStore per tournament type).
+
+    Args:
+        loader (Callable[[str], Any]): Builds the object for a key. Called at most once per key.
+        keys (Iterable[str]): The keys the loader knows about.
+    """
+
+    def __init__(self, loader: Callable[[str], Any], keys: Iterable[str]):
+        self._loader = loader
+        self._keys = list(keys)
+        self._items: Dict[str, Any] = {}
+        self._locks = {key: threading.Lock() for key in self._keys}
+
+    def get(self, key: str) -> Any:
+        """
+        Return the object for key, loading it if this is the first request for it.
+
+        Raises:
+            KeyError: If key is not one of the registry's keys.
+        """
+        if key not in self._locks:
+            raise KeyError(f"Unknown key {key!r}, expected one of {self._keys}")
+        item = self._items.get(key)
+        if item is None:
+            # One lock per key, so concurrent requests for the same format load it only once
+            # while requests for other formats are not blocked
+            with self._locks[key]:
+                item = self._items.get(key)
+                if item is None:
+                    item = self._loader(key)
+                    self._items[key] = item
+        return item
+
+    def warm_up(self, keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Load the given keys (all keys if None) ahead of the first request, e.g. before forking workers.
+        """
+        for key in (self._keys if keys is None else keys):
+            self.get(key)
+
+    def loaded(self) -> List[str]:
+        """
+        Keys that have been loaded so far.
+        """
+        return [key for key in self._keys if key in self._items]
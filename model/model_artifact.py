@@ -0,0 +1,145 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from sklearn.linear_model import ElasticNet, HuberRegressor, Lasso, LinearRegression, Ridge
+from sklearn.preprocessing import StandardScaler
+
+# Keys of a combined model artifact, as pickled by train_model_odi/t20/test
+ARTIFACT_KEYS = {"format", "scaler", "model", "feature_names"}
+# Identity-link linear regressors, whose predictions fold with a StandardScaler into one weight vector
+FOLDABLE_MODELS = (HuberRegressor, LinearRegression, Ridge, Lasso, ElasticNet)
+
+
+def make_model_artifact(tournament_type: str, scaler: StandardScaler, model: Any, feature_names: List[str]) -> Dict[str, Any]:
+    """
+    Bundle a fitted scaler and regressor with the feature order they were trained on.
+
+    Args:
+        tournament_type (str): 'ODI', 'Test' or 'T20'.
+        scaler (StandardScaler): Scaler fitted on the training features.
+        model (Any): Regressor fitted on the scaled training features.
+        feature_names (List[str]): Training feature columns, in order.
+
+    Returns:
+        Dict[str, Any]: The artifact to pickle.
+    """
+    return {"format": tournament_type, "scaler": scaler, "model": model, "feature_names": list(feature_names)}
+
+
+def is_model_artifact(artifact: Any) -> bool:
+    """
+    Whether artifact is a combined artifact rather than a bare pickled regressor.
+    """
+    return isinstance(artifact, dict) and ARTIFACT_KEYS.issubset(artifact)
+
+
+def artifact_regressor(artifact: Any) -> Any:
+    """
+    The regressor of an artifact; older artifacts are the bare regressor itself.
+    """
+    return artifact["model"] if is_model_artifact(artifact) else artifact
+
+
+def scale_features(artifact: Any, features: pd.DataFrame) -> np.ndarray:
+    """
+    Standardize features the way the artifact's regressor expects.
+
+    Combined artifacts use the training-time scaler, so a player's prediction does not depend on who
+    else is in the batch. Bare regressors (the older artifacts) have no saved scaler; for those a
+    scaler is fitted on the batch itself, as inference always did before.
+
+    Args:
+        artifact (Any): Combined artifact or bare regressor.
+        features (pd.DataFrame): Feature columns, by name.
+
+    Returns:
+        np.ndarray: Scaled features, in the artifact's feature order.
+    """
+    if is_model_artifact(artifact):
+        return artifact["scaler"].transform(features[artifact["feature_names"]].to_numpy(dtype='float64'))
+    logging.debug("Model artifact has no saved scaler, standardizing on the current batch")
+    return StandardScaler().fit_transform(features)
+
+
+def predict_with_artifact(artifact: Any, features: pd.DataFrame) -> np.ndarray:
+    """
+    Predict fantasy points for every row of features, through the folded LinearScorer when the
+    artifact has one.
+    """
+    scorer = linear_scorer(artifact)
+    if scorer is not None:
+        return scorer.score(features[scorer.feature_names].to_numpy())
+    return artifact_regressor(artifact).predict(scale_features(artifact, features))
+
+
+class LinearScorer:
+    """
+    A combined artifact whose regressor is linear, folded into one weight vector and a bias.
+
+    For a StandardScaler followed by a linear model,
+        predict(x) = coef . (x - mean) / scale + intercept = x . (coef / scale) + (intercept - coef . mean / scale)
+    so scoring a slate of players is a single float32 matrix-vector product on the raw features,
+    with no pandas or sklearn call on the request path.
+
+    Args:
+        weights (np.ndarray): Folded float32 weights, one per feature.
+        bias (float): Folded bias.
+        feature_names (List[str]): Feature order the weights expect.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float, feature_names: List[str]):
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.bias = np.float32(bias)
+        self.feature_names = list(feature_names)
+
+    @classmethod
+    def from_artifact(cls, artifact: Dict[str, Any]) -> "LinearScorer":
+        scaler, model = artifact["scaler"], artifact["model"]
+        n_features = len(artifact["feature_names"])
+        # A scaler fitted without centering or scaling leaves mean_ or scale_ at None
+        mean = scaler.mean_ if scaler.with_mean and getattr(scaler, "mean_", None) is not None else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.with_std and getattr(scaler, "scale_", None) is not None else np.ones(n_features)
+        coef = np.ravel(model.coef_).astype('float64')
+        weights = coef / scale
+        bias = float(np.ravel(model.intercept_)[0]) - float(weights @ mean)
+        return cls(weights, bias, artifact["feature_names"])
+
+    def score(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Predicted fantasy points for a (players x features) matrix of raw features in feature_names order.
+        """
+        return np.asarray(matrix, dtype=np.float32) @ self.weights + self.bias
+
+    def predict(self, features) -> np.ndarray:
+        """
+        Same as score(), also accepting a DataFrame (columns are picked by name), so the scorer can
+        stand in for the regressor, e.g. in SHAP explainers.
+        """
+        if isinstance(features, pd.DataFrame):
+            features = features[self.feature_names].to_numpy()
+        return self.score(features)
+
+
+def is_foldable(artifact: Any) -> bool:
+    """
+    Whether a combined artifact folds into a LinearScorer: a StandardScaler followed by one of the FOLDABLE_MODELS,
+    whose predict is coef . x + intercept. Other scalers (e.g. MinMaxScaler) and other linear models (e.g.
+    PoissonRegressor, whose log link makes predict exp(coef . x + intercept)) would fold into wrong scores.
+    """
+    return (is_model_artifact(artifact) and type(artifact["scaler"]) is StandardScaler
+            and type(artifact["model"]) in FOLDABLE_MODELS and np.ndim(artifact["model"].coef_) == 1)
+
+
+def linear_scorer(artifact: Any) -> Optional[LinearScorer]:
+    """
+    The folded LinearScorer of a combined artifact that is_foldable() (compiled once and kept on the artifact), or
+    None for bare regressors and every other model, which are served through sklearn.
+    """
+    if not is_foldable(artifact):
+        return None
+    scorer = artifact.get("linear_scorer")
+    if scorer is None:
+        scorer = LinearScorer.from_artifact(artifact)
+        artifact["linear_scorer"] = scorer
+    return scorer
@@ -0,0 +1,93 @@
+import os
+import time
+import pickle
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+from model.columnar_cache import file_sha256
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of unpickled model artifacts, keyed by (tournament type, artifact path).
+
+    A cached model is reused until its artifact file is replaced. The file's mtime and size are
+    checked at most once every check_interval seconds, so a request normally does no disk I/O for
+    the model at all. When they change, the file's SHA-256 decides whether it really has to be
+    reloaded (a touched but identical file keeps the cached model).
+
+    Args:
+        check_interval (float): Seconds between checks of an artifact file for changes.
+    """
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._stats: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tournament_type: str, path: str) -> Any:
+        """
+        Return the model stored at path, unpickling it only on first use or after the file changed.
+
+        Args:
+            tournament_type (str): 'ODI', 'Test' or 'T20'.
+            path (str): Path of the pickled model artifact.
+
+        Returns:
+            Any: The unpickled model.
+        """
+        key = (tournament_type, os.path.abspath(path))
+        with self._lock:
+            stats = self._stats.setdefault(key, {"hits": 0, "loads": 0, "load_seconds": 0.0, "last_load_seconds": 0.0})
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is not None and now - entry["checked_at"] < self.check_interval:
+                stats["hits"] += 1
+                return entry["model"]
+
+            stat = os.stat(key[1])
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if entry is not None and (entry["signature"] == signature or entry["sha256"] == file_sha256(key[1])):
+                entry["signature"] = signature
+                entry["checked_at"] = now
+                stats["hits"] += 1
+                return entry["model"]
+
+            start = time.perf_counter()
+            with open(key[1], 'rb') as model_file:
+                model = pickle.load(model_file)
+            elapsed = time.perf_counter() - start
+
+            self._entries[key] = {"model": model, "signature": signature, "sha256": file_sha256(key[1]), "checked_at": now}
+            stats["loads"] += 1
+            stats["load_seconds"] += elapsed
+            stats["last_load_seconds"] = elapsed
+            logging.info(f"Loaded {tournament_type} model from {key[1]} in {elapsed:.3f}s")
+            return model
+
+    def invalidate(self, tournament_type: str = None) -> None:
+        """
+        Drop cached models (of one tournament type, or all if None) so the next get() reloads them.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if tournament_type is None or key[0] == tournament_type]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Load counts, hit counts and load timings per cached artifact.
+
+        Returns:
+            Dict[str, Dict[str, float]]: '<tournament type>:<path>' -> {'hits', 'loads', 'hit_rate', 'load_seconds', 'last_load_seconds'}
+        """
+        with self._lock:
+            return {
+                f"{tournament_type}:{path}": {**stats, "hit_rate": stats["hits"] / max(stats["hits"] + stats["loads"], 1)}
+                for (tournament_type, path), stats in self._stats.items()
+            }
+
+
+# Shared by every module in the process that loads model artifacts
+model_registry = ModelRegistry()
@@ -1,27 +1,36 @@
 import os
+import sys
 import pandas as pd
-from typing import List, Dict, Tuple, Any
-import pickle  # Use pickle to load the model
+from typing import List, Dict, Tuple, Any, Iterator, Optional
 import logging
 import shap
 # from pprint import pprint
-from sklearn.preprocessing import StandardScaler
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.feature_store import FeatureStore, LazyRegistry
+from model.columnar_cache import read_table
+from model.model_registry import model_registry
+from model.team_optimizer import select_dream_team
+from model.model_artifact import is_model_artifact, artifact_regressor, scale_features, linear_scorer
 
 # Print the resolved paths for debugging
 VENUE_ODI_PATH =  os.path.join(os.path.dirname(__file__), '../data/processed/ODI/venue_odi.csv')
 RECENT_ODI_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/ODI/recent_odi.csv')
 CAREER_ODI_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/ODI/career_odi.csv')
 PLAYER_MATCH_DATA_ODI_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/ODI/player_match_data_odi.csv')
+FORM_ODI_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/ODI/form_odi.csv')
 
 VENUE_TEST_PATH =  os.path.join(os.path.dirname(__file__), '../data/processed/Test/venue_test.csv')
 RECENT_TEST_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/Test/recent_test.csv')
 CAREER_TEST_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/Test/career_test.csv')
 PLAYER_MATCH_DATA_TEST_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/Test/player_match_data_test.csv')
+FORM_TEST_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/Test/form_test.csv')
 
 VENUE_T20_PATH =  os.path.join(os.path.dirname(__file__), '../data/processed/T20/venue_t20.csv')
 RECENT_T20_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/T20/recent_t20.csv')
 CAREER_T20_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/T20/career_t20.csv')
 PLAYER_MATCH_DATA_T20_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/T20/player_match_data_t20.csv')
+FORM_T20_PATH = os.path.join(os.path.dirname(__file__), '../data/processed/T20/form_t20.csv')
 
 MODEL_ARTIFACTS = {
     "T20":  os.path.join(os.path.dirname(__file__), '../model_artifacts/T20/model_t20_HBR.pkl'),
@@ -98,10 +107,6 @@ player_dict_odi = {
 }
 
 
-career_data_odi=pd.read_csv(CAREER_ODI_PATH,dtype=career_dict_odi)
-venue_data_odi=pd.read_csv(VENUE_ODI_PATH,dtype=venue_dict_odi)
-recent_data_odi=pd.read_csv(RECENT_ODI_PATH,dtype=recent_dict_odi)
-player_match_data_odi=pd.read_csv(PLAYER_MATCH_DATA_ODI_PATH,dtype=player_dict_odi)
 
 career_dict_test = {
     "match_id": "string",  # Match ID is usually a string type, as it may contain letters or special characters.
@@ -165,10 +170,6 @@ player_dict_test = {
 }
 
 
-career_data_test=pd.read_csv(CAREER_TEST_PATH,dtype=career_dict_test)
-venue_data_test=pd.read_csv(VENUE_TEST_PATH,dtype=venue_dict_test)
-recent_data_test=pd.read_csv(RECENT_TEST_PATH,dtype=recent_dict_test)
-player_match_data_test=pd.read_csv(PLAYER_MATCH_DATA_TEST_PATH,dtype=player_dict_test)
 
 career_dict_t20 = {
     "match_id": "string",  # Match ID is usually a string type, as it may contain letters or special characters.
@@ -235,10 +236,61 @@ player_dict_t20 = {
 }
 
 
-career_data_t20=pd.read_csv(CAREER_T20_PATH,dtype=career_dict_t20)
-venue_data_t20=pd.read_csv(VENUE_T20_PATH,dtype=venue_dict_t20)
-recent_data_t20=pd.read_csv(RECENT_T20_PATH,dtype=recent_dict_t20)
-player_match_data_t20=pd.read_csv(PLAYER_MATCH_DATA_T20_PATH,dtype=player_dict_t20)
+# (career, recent, venue, player match data) paths and dtypes for each tournament type
+FEATURE_TABLES = {
+    "ODI": [(CAREER_ODI_PATH, career_dict_odi), (RECENT_ODI_PATH, recent_dict_odi), (VENUE_ODI_PATH, venue_dict_odi), (PLAYER_MATCH_DATA_ODI_PATH, player_dict_odi)],
+    "Test": [(CAREER_TEST_PATH, career_dict_test), (RECENT_TEST_PATH, recent_dict_test), (VENUE_TEST_PATH, venue_dict_test), (PLAYER_MATCH_DATA_TEST_PATH, player_dict_test)],
+    "T20": [(CAREER_T20_PATH, career_dict_t20), (RECENT_T20_PATH, recent_dict_t20), (VENUE_T20_PATH, venue_dict_t20), (PLAYER_MATCH_DATA_T20_PATH, player_dict_t20)],
+}
+
+# Exponentially weighted form tables, optional: a format without one serves the career, recent and venue features only.
+# Models pick their columns by name (see model_feature_names), so loading the form table never changes their inputs.
+FORM_TABLES = {"ODI": FORM_ODI_PATH, "Test": FORM_TEST_PATH, "T20": FORM_T20_PATH}
+form_dict = {"match_id": "string", "player_id": "string"}
+
+def load_feature_store(tournament_type: str) -> FeatureStore:
+    """
+    Read the processed tables of one tournament type and index them into a FeatureStore.
+    Each table comes from its columnar cache when that is fresh, otherwise from the CSV.
+    """
+    tables = [read_table(path, dtype=dtype) for path, dtype in FEATURE_TABLES[tournament_type]]
+    form_path = FORM_TABLES[tournament_type]
+    form_data = read_table(form_path, dtype=form_dict) if os.path.exists(form_path) else None
+    logging.info(f"Loaded {tournament_type} feature tables" + (" with form" if form_data is not None else ""))
+    return FeatureStore(*tables, form_data=form_data)
+
+# Tables are read on the first request for a format, so a T20-only deployment never loads ODI/Test
+feature_stores = LazyRegistry(load_feature_store, FEATURE_TABLES.keys())
+
+def model_feature_names(tournament_type: str, model) -> List[str]:
+    """
+    The feature columns a model of tournament_type takes, in order: the artifact's training feature_names, or for
+    a bare regressor (trained before form features existed) the career, recent and venue columns.
+    """
+    if is_model_artifact(model):
+        return model["feature_names"]
+    return feature_stores.get(tournament_type).base_feature_names
+
+def warm_up(tournament_types: List[str] = None) -> None:
+    """
+    Load the feature tables of the given tournament types (all if None) ahead of the first request.
+    Call this before forking workers so they share the loaded tables.
+    """
+    feature_stores.warm_up(tournament_types)
+
+# Old module-level names (career_data_odi, feature_store_t20, ...) resolve through the registry
+_LAZY_ATTRIBUTES = {
+    f"{name}_{suffix}": (tournament_type, name)
+    for suffix, tournament_type in [("odi", "ODI"), ("test", "Test"), ("t20", "T20")]
+    for name in ["career_data", "recent_data", "venue_data", "player_match_data", "feature_store"]
+}
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    tournament_type, attribute = _LAZY_ATTRIBUTES[name]
+    feature_store = feature_stores.get(tournament_type)
+    return feature_store if attribute == "feature_store" else getattr(feature_store, attribute)
 
 def generate_tuple_from_data(data: pd.DataFrame, player_id: str, match_id: str) -> Tuple:
     """
@@ -258,136 +310,25 @@ def calculate_player_features_odi(player_id: str, match_date: str, venue: str, f
     """
     Calculate the feature vector for a player based on player_id, match_date, and venue.
     This should return a list of features (numerical values) for the player.
+    The latest match on or before match_date is resolved through the ODI feature store.
     """
-    # Convert the 'date' column to datetime format for easier comparison
-    player_match_data_odi['date'] = pd.to_datetime(player_match_data_odi['date'])
-    input_date = pd.to_datetime(match_date)
-    
-    # Filter player match data for the given player_id
-    player_data = player_match_data_odi[player_match_data_odi['player_id'] == player_id]
-    
-    # Try to find the match_id with the closest date <= input date (regardless of venue)
-    try:
-        match_id_1 = player_data[player_data['date'] <= input_date].sort_values(by='date', ascending=False).iloc[0]['match_id']
-    except IndexError:
-        match_id_1 = None  # No match found for career stats
-    
-    # Try to find the match_id with the closest date <= input date and matching the input venue
-    try:
-        match_id_2 = player_data[(player_data['date'] <= input_date) & (player_data['venue'] == venue)].sort_values(by='date', ascending=False).iloc[0]['match_id']
-    except IndexError:
-        match_id_2 = None  # No match found for recent form or venue
-
-    # Initialize tuples to be empty in case match_ids can't be determined
-    career_tuple = tuple([0] * (14 - 2))
-    recent_form_tuple = tuple([0] * (14 - 2))
-    venue_tuple = tuple([0] * (14 - 2))
-
-    # Generate the career tuple only if match_id_1 is valid
-    if match_id_1:
-        career_tuple = generate_tuple_from_data(career_data_odi, player_id, match_id_1)
-    
-    # Generate the recent form tuple only if match_id_2 is valid
-        recent_form_tuple = generate_tuple_from_data(recent_data_odi, player_id, match_id_1)
-    
-    # Generate the venue tuple only if match_id_2 is valid (because match_id_2 is venue-specific)
-    if match_id_2:
-        venue_tuple = generate_tuple_from_data(venue_data_odi, player_id, match_id_2)
-    
-    # Combine the tuples to form the feature vector
-    feature_vector = list(career_tuple) + list(recent_form_tuple) + list(venue_tuple)
-    
-    return feature_vector
+    return feature_stores.get("ODI").player_features(player_id, match_date, venue)
 
 def calculate_player_features_test(player_id: str, match_date: str, venue: str, feature_names: Dict[str, List[str]]) -> List[float]:
     """
     Calculate the feature vector for a player based on player_id, match_date, and venue.
     This should return a list of features (numerical values) for the player.
+    The latest match on or before match_date is resolved through the Test feature store.
     """
-    # Convert the 'date' column to datetime format for easier comparison
-    player_match_data_test['date'] = pd.to_datetime(player_match_data_test['date'])
-    input_date = pd.to_datetime(match_date)
-    
-    # Filter player match data for the given player_id
-    player_data = player_match_data_test[player_match_data_test['player_id'] == player_id]
-    
-    # Try to find the match_id with the closest date <= input date (regardless of venue)
-    try:
-        match_id_1 = player_data[player_data['date'] <= input_date].sort_values(by='date', ascending=False).iloc[0]['match_id']
-    except IndexError:
-        match_id_1 = None  # No match found for career stats
-    
-    # Try to find the match_id with the closest date <= input date and matching the input venue
-    try:
-        match_id_2 = player_data[(player_data['date'] <= input_date) & (player_data['venue'] == venue)].sort_values(by='date', ascending=False).iloc[0]['match_id']
-    except IndexError:
-        match_id_2 = None  # No match found for recent form or venue
-
-    # Initialize tuples to be empty in case match_ids can't be determined
-    career_tuple = tuple([0] * (12 - 2))
-    recent_form_tuple = tuple([0] * (12 - 2))
-    venue_tuple = tuple([0] * (12 - 2))
-
-    # Generate the career tuple only if match_id_1 is valid
-    if match_id_1:
-        career_tuple = generate_tuple_from_data(career_data_test, player_id, match_id_1)
-    
-    # Generate the recent form tuple only if match_id_2 is valid
-        recent_form_tuple = generate_tuple_from_data(recent_data_test, player_id, match_id_1)
-    
-    # Generate the venue tuple only if match_id_2 is valid (because match_id_2 is venue-specific)
-    if match_id_2:
-        venue_tuple = generate_tuple_from_data(venue_data_test, player_id, match_id_2)
-    
-    # Combine the tuples to form the feature vector
-    feature_vector = list(career_tuple) + list(recent_form_tuple) + list(venue_tuple)
-    
-    return feature_vector
+    return feature_stores.get("Test").player_features(player_id, match_date, venue)
 
 def calculate_player_features_t20(player_id: str, match_date: str, venue: str, feature_names: Dict[str, List[str]]) -> List[float]:
     """
     Calculate the feature vector for a player based on player_id, match_date, and venue.
     This should return a list of features (numerical values) for the player.
+    The latest match on or before match_date is resolved through the T20 feature store.
     """
-    # Convert the 'date' column to datetime format for easier comparison
-    player_match_data_t20['date'] = pd.to_datetime(player_match_data_t20['date'])
-    input_date = pd.to_datetime(match_date)
-    
-    # Filter player match data for the given player_id
-    player_data = player_match_data_t20[player_match_data_t20['player_id'] == player_id]
-    
-    # Try to find the match_id with the closest date <= input date (regardless of venue)
-    try:
-        match_id_1 = player_data[player_data['date'] <= input_date].sort_values(by='date', ascending=False).iloc[0]['match_id']
-    except IndexError:
-        match_id_1 = None  # No match found for career stats
-    
-    # Try to find the match_id with the closest date <= input date and matching the input venue
-    try:
-        match_id_2 = player_data[(player_data['date'] <= input_date) & (player_data['venue'] == venue)].sort_values(by='date', ascending=False).iloc[0]['match_id']
-    except IndexError:
-        match_id_2 = None  # No match found for recent form or venue
-
-    # Initialize tuples to be empty in case match_ids can't be determined
-    career_tuple = tuple([0] * (15 - 2))
-    recent_form_tuple = tuple([0] * (15 - 2))
-    venue_tuple = tuple([0] * (15 - 2))
-
-    # Generate the career tuple only if match_id_1 is valid
-    if match_id_1:
-        career_tuple = generate_tuple_from_data(career_data_t20, player_id, match_id_1)
-    
-    # Generate the recent form tuple only if match_id_2 is valid
-        recent_form_tuple = generate_tuple_from_data(recent_data_t20, player_id, match_id_1)
-    
-    # Generate the venue tuple only if match_id_2 is valid (because match_id_2 is venue-specific)
-    if match_id_2:
-        venue_tuple = generate_tuple_from_data(venue_data_t20, player_id, match_id_2)
-    
-    # Combine the tuples to form the feature vector
-    feature_vector = list(career_tuple) + list(recent_form_tuple) + list(venue_tuple)
-    
-    return feature_vector
+    return feature_stores.get("T20").player_features(player_id, match_date, venue)
 
 def generate_features_for_all_players_odi(players_data: List[dict], match_date: str, venue: str) -> pd.DataFrame:
     """
@@ -396,48 +337,23 @@ def generate_features_for_all_players_odi(players_data: List[dict], match_date:
     Returns:
     - a DataFrame with player_id, player_name, and corresponding feature values.
     """
-    
-    # Extract feature names by removing player_id and match_id
-    career_feature_names = [col for col in career_data_odi.columns if col not in ['player_id', 'match_id']]
-    recent_feature_names = [col for col in recent_data_odi.columns if col not in ['player_id', 'match_id']]
-    venue_feature_names = [col for col in venue_data_odi.columns if col not in ['player_id', 'match_id']]
-    
-    # Combine all feature names
-    all_feature_names = career_feature_names + recent_feature_names + venue_feature_names
-    
-    feature_rows = []  # List to store feature rows for DataFrame
-    
-    # Loop through each player in the list
-    for player in players_data:
-        player_id = player['player_id']
-        player_name = player['player_name']
-        
-        # Step 1: Calculate feature vector for the player
-        feature_vector = calculate_player_features_odi(player_id, match_date, venue, all_feature_names)
-        
-        # Step 2: Append each feature with the player_id, player_name, and corresponding feature name to feature_rows
-        for i, feature_value in enumerate(feature_vector):
-            feature_name = all_feature_names[i]  # Get actual feature name
-            feature_rows.append({
-                'player_id': player_id,
-                'player_name': player_name,
-                'feature_name': feature_name,
-                'feature_value': feature_value
-            })
-    
-    # Step 3: Convert the feature rows to a pandas DataFrame
-    features_df = pd.DataFrame(feature_rows)
 
-    # Pivot the DataFrame to get the desired output format: player_id, player_name, feature_1, feature_2, ...
-    features_df_pivot = features_df.pivot_table(index=['player_id', 'player_name'], columns='feature_name', values='feature_value', aggfunc='first')
+    feature_store = feature_stores.get("ODI")
+
+    # Career + recent form + venue feature names, in model input order
+    all_feature_names = feature_store.feature_names
 
-    # Reset index to flatten the DataFrame
-    features_df_pivot.reset_index(inplace=True)
+    # One row per (player_id, player_name), sorted the same way the old pivot_table output was
+    squad = sorted({(player['player_id'], player['player_name']) for player in players_data})
 
-    # Explicitly reorder columns to maintain the order of features as in 'all_feature_names'
-    features_df_pivot = features_df_pivot[['player_id', 'player_name'] + all_feature_names]
+    # Resolve the latest matches for the whole squad in one as-of lookup and gather the wide matrix directly
+    feature_matrix = feature_store.feature_matrix([player_id for player_id, _ in squad], match_date, venue)
 
-    return features_df_pivot
+    features_df = pd.DataFrame(feature_matrix, columns=all_feature_names)
+    features_df.insert(0, 'player_name', [player_name for _, player_name in squad])
+    features_df.insert(0, 'player_id', [player_id for player_id, _ in squad])
+
+    return features_df
 
 def generate_features_for_all_players_test(players_data: List[dict], match_date: str, venue: str) -> pd.DataFrame:
     """
@@ -445,95 +361,45 @@ def generate_features_for_all_players_test(players_data: List[dict], match_date:
     Returns a DataFrame with player_id, player_name, and corresponding feature values.
     """
 
-    # Extract feature names by removing player_id and match_id
-    career_feature_names = [col for col in career_data_test.columns if col not in ['player_id', 'match_id']]
-    recent_feature_names = [col for col in recent_data_test.columns if col not in ['player_id', 'match_id']]
-    venue_feature_names = [col for col in venue_data_test.columns if col not in ['player_id', 'match_id']]
-    
-    # Combine all feature names
-    all_feature_names = career_feature_names + recent_feature_names + venue_feature_names
-    
-    feature_rows = []  # List to store feature rows for DataFrame
-    
-    # Loop through each player in the list
-    for player in players_data:
-        player_id = player['player_id']
-        player_name = player['player_name']
-        
-        # Step 1: Calculate feature vector for the player
-        feature_vector = calculate_player_features_test(player_id, match_date, venue, all_feature_names)
-        
-        # Step 2: Append each feature with the player_id, player_name, and corresponding feature name to feature_rows
-        for i, feature_value in enumerate(feature_vector):
-            feature_name = all_feature_names[i]  # Get actual feature name
-            feature_rows.append({
-                'player_id': player_id,
-                'player_name': player_name,
-                'feature_name': feature_name,
-                'feature_value': feature_value
-            })
-    
-    # Step 3: Convert the feature rows to a pandas DataFrame
-    features_df = pd.DataFrame(feature_rows)
+    feature_store = feature_stores.get("Test")
+
+    # Career + recent form + venue feature names, in model input order
+    all_feature_names = feature_store.feature_names
 
-    # Pivot the DataFrame to get the desired output format: player_id, player_name, feature_1, feature_2, ...
-    features_df_pivot = features_df.pivot_table(index=['player_id', 'player_name'], columns='feature_name', values='feature_value', aggfunc='first')
+    # One row per (player_id, player_name), sorted the same way the old pivot_table output was
+    squad = sorted({(player['player_id'], player['player_name']) for player in players_data})
 
-    # Reset index to flatten the DataFrame
-    features_df_pivot.reset_index(inplace=True)
+    # Resolve the latest matches for the whole squad in one as-of lookup and gather the wide matrix directly
+    feature_matrix = feature_store.feature_matrix([player_id for player_id, _ in squad], match_date, venue)
 
-    # Explicitly reorder columns to maintain the order of features as in 'all_feature_names'
-    features_df_pivot = features_df_pivot[['player_id', 'player_name'] + all_feature_names]
+    features_df = pd.DataFrame(feature_matrix, columns=all_feature_names)
+    features_df.insert(0, 'player_name', [player_name for _, player_name in squad])
+    features_df.insert(0, 'player_id', [player_id for player_id, _ in squad])
 
-    return features_df_pivot
+    return features_df
 
 def generate_features_for_all_players_t20(players_data: List[dict], match_date: str, venue: str) -> pd.DataFrame:
     """
     Generate feature vectors for all players based on the provided list of player data, match date, and venue.
     Returns a DataFrame with player_id, player_name, and corresponding feature values.
     """
-    
-    # Extract feature names by removing player_id and match_id
-    career_feature_names = [col for col in career_data_t20.columns if col not in ['player_id', 'match_id']]
-    recent_feature_names = [col for col in recent_data_t20.columns if col not in ['player_id', 'match_id']]
-    venue_feature_names = [col for col in venue_data_t20.columns if col not in ['player_id', 'match_id']]
-    
-    # Combine all feature names
-    all_feature_names = career_feature_names + recent_feature_names + venue_feature_names
-    
-    feature_rows = []  # List to store feature rows for DataFrame
-    
-    # Loop through each player in the list
-    for player in players_data:
-        player_id = player['player_id']
-        player_name = player['player_name']
-        
-        # Step 1: Calculate feature vector for the player
-        feature_vector = calculate_player_features_t20(player_id, match_date, venue, all_feature_names)
-        
-        # Step 2: Append each feature with the player_id, player_name, and corresponding feature name to feature_rows
-        for i, feature_value in enumerate(feature_vector):
-            feature_name = all_feature_names[i]  # Get actual feature name
-            feature_rows.append({
-                'player_id': player_id,
-                'player_name': player_name,
-                'feature_name': feature_name,
-                'feature_value': feature_value
-            })
-    
-    # Step 3: Convert the feature rows to a pandas DataFrame
-    features_df = pd.DataFrame(feature_rows)
 
-    # Pivot the DataFrame to get the desired output format: player_id, player_name, feature_1, feature_2, ...
-    features_df_pivot = features_df.pivot_table(index=['player_id', 'player_name'], columns='feature_name', values='feature_value', aggfunc='first')
+    feature_store = feature_stores.get("T20")
 
-    # Reset index to flatten the DataFrame
-    features_df_pivot.reset_index(inplace=True)
+    # Career + recent form + venue feature names, in model input order
+    all_feature_names = feature_store.feature_names
 
-    # Explicitly reorder columns to maintain the order of features as in 'all_feature_names'
-    features_df_pivot = features_df_pivot[['player_id', 'player_name'] + all_feature_names]
-    
-    return features_df_pivot
+    # One row per (player_id, player_name), sorted the same way the old pivot_table output was
+    squad = sorted({(player['player_id'], player['player_name']) for player in players_data})
+
+    # Resolve the latest matches for the whole squad in one as-of lookup and gather the wide matrix directly
+    feature_matrix = feature_store.feature_matrix([player_id for player_id, _ in squad], match_date, venue)
+
+    features_df = pd.DataFrame(feature_matrix, columns=all_feature_names)
+    features_df.insert(0, 'player_name', [player_name for _, player_name in squad])
+    features_df.insert(0, 'player_id', [player_id for player_id, _ in squad])
+
+    return features_df
 
 def predict_fantasy_points_for_all_players_odi(players_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -547,16 +413,20 @@ def predict_fantasy_points_for_all_players_odi(players_df: pd.DataFrame) -> pd.D
     """
     try:
         # Load the pre-trained model (replace with the correct path to your model)
-        with open(MODEL_ARTIFACTS["ODI"], 'rb') as model_file:
-            model = pickle.load(model_file)  # Load the model using pickle
+        model = model_registry.get("ODI", MODEL_ARTIFACTS["ODI"])  # Unpickled once per process, reloaded if the artifact changes
 
-        # Extract features from the DataFrame (assuming the feature columns start from the 3rd column onward)
-        feature_columns = players_df.columns[2:]  # Skip player_id and player_name
+        scorer = linear_scorer(model)
+        if scorer is not None:
+            # Scaler and linear model folded into one weight vector: a single matmul on the raw features
+            predicted_fantasy_points = scorer.score(players_df[scorer.feature_names].to_numpy())
+        else:
+            # Use the training feature order when the artifact has it, otherwise the career, recent and venue columns
+            feature_columns = model_feature_names("ODI", model)
 
-        # Predict fantasy points for all players
-        scaler=StandardScaler()
-        players_df[feature_columns]=scaler.fit_transform(players_df[feature_columns])
-        predicted_fantasy_points = model.predict(players_df[feature_columns])
+            # Predict fantasy points for all players
+            # Standardize with the training-time scaler (bare regressors fall back to fitting on this batch)
+            players_df[feature_columns]=scale_features(model, players_df[feature_columns])
+            predicted_fantasy_points = artifact_regressor(model).predict(players_df[feature_columns])
 
         # Add predicted fantasy points to the DataFrame
         players_df['predicted_fantasy_points'] = predicted_fantasy_points
@@ -586,24 +456,28 @@ def predict_fantasy_points_for_all_players_test(players_df: pd.DataFrame) -> pd.
 
         # Load the pre-trained model (replace with the correct path to your model)
         # print("Loading the pre-trained model...")
-        with open(MODEL_ARTIFACTS["Test"], 'rb') as model_file:
-            model = pickle.load(model_file)  # Load the model using pickle
+        model = model_registry.get("Test", MODEL_ARTIFACTS["Test"])  # Unpickled once per process, reloaded if the artifact changes
         # print("Model loaded successfully.")
 
-        # Extract features from the DataFrame (assuming the feature columns start from the 3rd column onward)
-        feature_columns = players_df.columns[2:]  # Skip player_id and player_name
-        # print(f"Extracted feature columns: {feature_columns}")
-
-        # Check if the correct number of features are present
-        # print(f"Number of features in input DataFrame: {len(feature_columns)}")
-        # print("Input DataFrame preview:")
-        # print(players_df.head())
-
-        # Predict fantasy points for all players
-        # print("Predicting fantasy points for all players...")
-        scaler=StandardScaler()
-        players_df[feature_columns]=scaler.fit_transform(players_df[feature_columns])
-        predicted_fantasy_points = model.predict(players_df[feature_columns])
+        scorer = linear_scorer(model)
+        if scorer is not None:
+            # Scaler and linear model folded into one weight vector: a single matmul on the raw features
+            predicted_fantasy_points = scorer.score(players_df[scorer.feature_names].to_numpy())
+        else:
+            # Use the training feature order when the artifact has it, otherwise the career, recent and venue columns
+            feature_columns = model_feature_names("Test", model)
+            # print(f"Extracted feature columns: {feature_columns}")
+
+            # Check if the correct number of features are present
+            # print(f"Number of features in input DataFrame: {len(feature_columns)}")
+            # print("Input DataFrame preview:")
+            # print(players_df.head())
+
+            # Predict fantasy points for all players
+            # print("Predicting fantasy points for all players...")
+            # Standardize with the training-time scaler (bare regressors fall back to fitting on this batch)
+            players_df[feature_columns]=scale_features(model, players_df[feature_columns])
+            predicted_fantasy_points = artifact_regressor(model).predict(players_df[feature_columns])
         # print(f"Predictions completed. Number of predictions: {len(predicted_fantasy_points)}")
 
         # Add predicted fantasy points to the DataFrame
@@ -640,24 +514,28 @@ def predict_fantasy_points_for_all_players_t20(players_df: pd.DataFrame) -> pd.D
 
         # Load the pre-trained model (replace with the correct path to your model)
         # print("Loading the pre-trained model...")
-        with open(MODEL_ARTIFACTS["T20"], 'rb') as model_file:
-            model = pickle.load(model_file)  # Load the model using pickle
+        model = model_registry.get("T20", MODEL_ARTIFACTS["T20"])  # Unpickled once per process, reloaded if the artifact changes
         # print("Model loaded successfully.")
 
-        # Extract features from the DataFrame (assuming the feature columns start from the 3rd column onward)
-        feature_columns = players_df.columns[2:]  # Skip player_id and player_name
-        # print(f"Extracted feature columns: {feature_columns}")
-
-        # Check if the correct number of features are present
-        # print(f"Number of features in input DataFrame: {len(feature_columns)}")
-        # print("Input DataFrame preview:")
-        # print(players_df.head())
-
-        # Predict fantasy points for all players
-        # print("Predicting fantasy points for all players...")
-        scaler=StandardScaler()
-        players_df[feature_columns]=scaler.fit_transform(players_df[feature_columns])
-        predicted_fantasy_points = model.predict(players_df[feature_columns])
+        scorer = linear_scorer(model)
+        if scorer is not None:
+            # Scaler and linear model folded into one weight vector: a single matmul on the raw features
+            predicted_fantasy_points = scorer.score(players_df[scorer.feature_names].to_numpy())
+        else:
+            # Use the training feature order when the artifact has it, otherwise the career, recent and venue columns
+            feature_columns = model_feature_names("T20", model)
+            # print(f"Extracted feature columns: {feature_columns}")
+
+            # Check if the correct number of features are present
+            # print(f"Number of features in input DataFrame: {len(feature_columns)}")
+            # print("Input DataFrame preview:")
+            # print(players_df.head())
+
+            # Predict fantasy points for all players
+            # print("Predicting fantasy points for all players...")
+            # Standardize with the training-time scaler (bare regressors fall back to fitting on this batch)
+            players_df[feature_columns]=scale_features(model, players_df[feature_columns])
+            predicted_fantasy_points = artifact_regressor(model).predict(players_df[feature_columns])
         # print(f"Predictions completed. Number of predictions: {len(predicted_fantasy_points)}")
 
         # Add predicted fantasy points to the DataFrame
@@ -680,52 +558,25 @@ def predict_fantasy_points_for_all_players_t20(players_df: pd.DataFrame) -> pd.D
         return pd.DataFrame(columns=['player_id', 'player_name', 'predicted_fantasy_points'])
 
 
-def generate_recommended_team(players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def generate_recommended_team(players: List[Dict[str, Any]], **constraints) -> List[Dict[str, Any]]:
     """
     Generate a recommended team based on predicted fantasy points and team diversity.
-    The team should contain 11 players with the highest predicted fantasy points, while maintaining role diversity 
-    and ensuring no more than 5 players from one team.
+    The team is the provably best 11 by predicted fantasy points with captain (x2) and vice-captain (x1.5),
+    with at least one player of every role in the squad and no more than 10 players from one team.
     
     Args:
     - players (List[Dict[str, Any]]): List of players with player_id, player_name, team_name, role, and predicted_fantasy_points.
+    - constraints: Optional overrides of team_size, role_limits, max_per_team, budget (with a 'credits' field per player), see team_optimizer.
     
     Returns:
     - List[Dict[str, Any]]: A list of 11 recommended players for the dream team, including their role and predicted fantasy points.
     """
     try:
-        # Step 1: Pick one player from each role based on predicted fantasy points
-        selected_players = []
-        for role in ["Batsman", "Bowler", "Wicket-Keeper", "All-Rounder"]:
-            role_players = [p for p in players if p["role"].lower() == role.lower()]
-            if role_players:
-                selected_players.append(max(role_players, key=lambda x: x["predicted_fantasy_points"]))
-
-        # Step 2: Select remaining players to make a team of 11
-        remaining_players = [p for p in players if p not in selected_players]
-        remaining_players.sort(key=lambda x: x["predicted_fantasy_points"], reverse=True)
-
+        # Exact branch and bound over role counts, team caps and the optional credit budget
+        selected_players = select_dream_team(players, "predicted_fantasy_points", **constraints)
         logging.debug(selected_players)
-        while len(selected_players) < 11:
-            next_player = remaining_players.pop(0)
-            selected_players.append(next_player)
-            logging.debug(next_player)
-
-        # Step 3: Ensure team diversity (max 5 players from one team)
-        team_counts = pd.DataFrame(selected_players)["team_name"].value_counts()
-        if team_counts.max() == 11:
-
-            other_team = [team for team in pd.DataFrame(selected_players)["team_name"].unique() if team not in team_counts.index][0]
-            lowest_fantasy_player = min(selected_players, key=lambda x: x["predicted_fantasy_points"])
-            replacement_player = max(
-                [p for p in players if p["team_name"] == other_team and p not in selected_players],
-                key=lambda x: x["predicted_fantasy_points"]
-            )
-            selected_players.remove(lowest_fantasy_player)
-            selected_players.append(replacement_player)
-        # Step 4: Sort selected players by predicted fantasy points
-        selected_players.sort(key=lambda x: x["predicted_fantasy_points"], reverse=True)
-
-        # Return the selected players as the final recommended team
+
+        # Return the selected players as the final recommended team, sorted by predicted fantasy points
         return selected_players
 
     except Exception as e:
@@ -733,6 +584,33 @@ def generate_recommended_team(players: List[Dict[str, Any]]) -> List[Dict[str, A
         return []
 
 
+def assign_captains(recommended_team: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Sort the recommended team by predicted points, make the top two captain and vice-captain and
+    rename predicted_fantasy_points to predicted_points.
+    """
+    # Sort players by predicted points in descending order
+    recommended_team.sort(key=lambda x: x['predicted_fantasy_points'], reverse=True)
+    
+    # Assign captain and vice-captain roles
+    if len(recommended_team) > 0:
+        recommended_team[0]['is_captain'] = True
+        recommended_team[0]['is_vice_captain'] = False
+    if len(recommended_team) > 1:
+        recommended_team[1]['is_captain'] = False
+        recommended_team[1]['is_vice_captain'] = True
+    # Mark the rest of the players as False for both captain and vice-captain
+    for player in recommended_team[2:]:
+        player['is_captain'] = False
+        player['is_vice_captain'] = False
+    
+    # Rename predicted_fantasy_points to predicted_points after generating the team
+    for player in recommended_team:
+        player['predicted_points'] = player.pop('predicted_fantasy_points')
+
+    return recommended_team
+
+
 def generate_dream_team(players_data: List[dict], match_date: str, venue: str, tournament_type: str, need_justification: bool=True) -> List[Dict[str, Any]]:
     """
     Generate the recommended dream team for a given squad, match date, venue, and tournament type.
@@ -776,31 +654,15 @@ def generate_dream_team(players_data: List[dict], match_date: str, venue: str, t
     # Generate the recommended team
     recommended_team = generate_recommended_team(players)
     
-    # Sort players by predicted points in descending order
-    recommended_team.sort(key=lambda x: x['predicted_fantasy_points'], reverse=True)
-    
-    # Assign captain and vice-captain roles
-    if len(recommended_team) > 0:
-        recommended_team[0]['is_captain'] = True
-        recommended_team[0]['is_vice_captain'] = False
-    if len(recommended_team) > 1:
-        recommended_team[1]['is_captain'] = False
-        recommended_team[1]['is_vice_captain'] = True
-    # Mark the rest of the players as False for both captain and vice-captain
-    for player in recommended_team[2:]:
-        player['is_captain'] = False
-        player['is_vice_captain'] = False
-    
-    # Rename predicted_fantasy_points to predicted_points after generating the team
-    for player in recommended_team:
-        player['predicted_points'] = player.pop('predicted_fantasy_points')
+    # Assign captain and vice-captain roles and rename predicted_fantasy_points to predicted_points
+    recommended_team = assign_captains(recommended_team)
         # ----------------------------------------------------------------------------------
 
     if need_justification:
         try:
-            with open(MODEL_ARTIFACTS[tournament_type], 'rb') as model_file:
-                model = pickle.load(model_file)
-            recommended_team = generate_player_details_with_shap_values(recommended_team, players_copy, players_df,tournament_type=tournament_type, model=model)
+            # Same cached model instance the prediction step used
+            model = model_registry.get(tournament_type, MODEL_ARTIFACTS[tournament_type])
+            recommended_team = generate_player_details_with_shap_values(recommended_team, players_copy, players_df,tournament_type=tournament_type, model=linear_scorer(model) or artifact_regressor(model), feature_names=model_feature_names(tournament_type, model))
 
         except Exception as e:
             logging.exception(f"generating_dream_team(): {e}")
@@ -814,12 +676,119 @@ def generate_dream_team(players_data: List[dict], match_date: str, venue: str, t
     return recommended_team
 
 
+# Canonical tournament type for each accepted spelling, and the per-format prediction functions
+TOURNAMENT_TYPES = {"odi": "ODI", "test": "Test", "t20": "T20"}
+PREDICT_FUNCTIONS = {
+    "ODI": predict_fantasy_points_for_all_players_odi,
+    "Test": predict_fantasy_points_for_all_players_test,
+    "T20": predict_fantasy_points_for_all_players_t20,
+}
+
+
+def generate_dream_teams(fixtures: List[Dict[str, Any]]) -> Iterator[Tuple[int, List[Dict[str, Any]], Optional[str]]]:
+    """
+    Generate the recommended dream teams for many fixtures in one pass.
+
+    Fixtures of the same tournament type share one feature lookup: every distinct (player, date, venue)
+    across them is resolved once through the feature store, and with a folded linear model every
+    player of every fixture is scored by a single matmul. Team selection then runs per fixture and
+    each team is yielded as soon as it is ready. Teams are the same as generate_dream_team(...,
+    need_justification=False) gives for each fixture on its own.
+
+    A fixture that cannot be served (unknown tournament type, empty squad, or a failure while scoring
+    or selecting its team) is yielded with an error instead of failing the other fixtures.
+
+    Args:
+    - fixtures (List[Dict[str, Any]]): Each with players_data, match_date, venue and tournament_type.
+
+    Yields:
+    - Tuple[int, List[Dict[str, Any]], Optional[str]]: (index of the fixture in fixtures, its dream team,
+      None) or (index, [], error message). Fixtures are grouped by tournament type, so teams may come
+      back out of input order.
+    """
+    indices_by_type = {}
+    for index, fixture in enumerate(fixtures):
+        tournament_type = TOURNAMENT_TYPES.get(str(fixture.get('tournament_type', '')).lower())
+        if tournament_type is None:
+            yield index, [], f"Unknown tournament type {fixture.get('tournament_type')!r}, expected one of {list(TOURNAMENT_TYPES.values())}."
+        elif not fixture.get('players_data'):
+            yield index, [], "The fixture has no players."
+        else:
+            indices_by_type.setdefault(tournament_type, []).append(index)
+
+    for tournament_type, indices in indices_by_type.items():
+        try:
+            feature_store = feature_stores.get(tournament_type)
+            model = model_registry.get(tournament_type, MODEL_ARTIFACTS[tournament_type])
+
+            # One row per (player_id, player_name) per fixture, in the same order generate_features_for_all_players_* uses
+            squads = {index: sorted({(player['player_id'], player['player_name']) for player in fixtures[index]['players_data']}) for index in indices}
+
+            # Players shared between fixtures on the same date and venue are looked up once
+            query_rows = {}
+            fixture_rows = {}
+            for index in indices:
+                match_day = pd.Timestamp(fixtures[index]['match_date']).date()
+                venue = fixtures[index]['venue']
+                fixture_rows[index] = [query_rows.setdefault((str(player_id), match_day, venue), len(query_rows)) for player_id, _ in squads[index]]
+            queries = list(query_rows)
+            feature_matrix = feature_store.feature_matrix([query[0] for query in queries], [query[1] for query in queries], [query[2] for query in queries])
+
+            scorer = linear_scorer(model)
+            if scorer is not None:
+                columns = [feature_store.feature_names.index(name) for name in scorer.feature_names]
+                points = scorer.score(feature_matrix[:, columns])
+        except Exception:
+            logging.exception(f"Could not score the {tournament_type} fixtures")
+            for index in indices:
+                yield index, [], f"Could not score the {tournament_type} fixtures."
+            continue
+
+        for index in indices:
+            try:
+                rows = fixture_rows[index]
+                if scorer is not None:
+                    predicted_points = points[rows]
+                else:
+                    # Models without a saved scaler standardize per fixture, so they are scored one fixture at a time
+                    players_df = pd.DataFrame(feature_matrix[rows], columns=feature_store.feature_names)
+                    players_df.insert(0, 'player_name', [player_name for _, player_name in squads[index]])
+                    players_df.insert(0, 'player_id', [player_id for player_id, _ in squads[index]])
+                    predicted_points = PREDICT_FUNCTIONS[tournament_type](players_df)['predicted_fantasy_points'].to_numpy()
+
+                # Role and team_name come from the request, like the merge in generate_dream_team
+                details = {player['player_id']: player for player in fixtures[index]['players_data']}
+                players = [
+                    {
+                        'player_id': player_id,
+                        'player_name': player_name,
+                        'predicted_fantasy_points': float(predicted),
+                        'role': details[player_id]['role'],
+                        'team_name': details[player_id]['team_name'],
+                    }
+                    for (player_id, player_name), predicted in zip(squads[index], predicted_points)
+                ]
+
+                recommended_team = assign_captains(generate_recommended_team(players))
+                for player in recommended_team:
+                    player['shap_values'] = []
+                    player['career'] = [0]*13
+                    player['recent_form'] = []
+                    player['venue'] = []
+            except Exception:
+                logging.exception(f"Could not select the team of fixture {index}")
+                yield index, [], "Failed to generate recommended team."
+                continue
+            yield index, recommended_team, None
+
+
 def generate_player_details_with_shap_values(
     recommended_team: List[Dict[str, Any]],
     players_original: pd.DataFrame,
     players_df: pd.DataFrame,
     tournament_type: str,
-    model
+    model,
+    feature_names: Optional[List[str]] = None
 ) -> List[Dict[str, Any]]:
     """
     Enrich each player in the recommended team with SHAP values and additional feature details.
@@ -828,6 +797,8 @@ def generate_player_details_with_shap_values(
     - recommended_team (List[Dict[str, Any]]): The recommended team with basic player info.
     - players_df (pd.DataFrame): DataFrame containing all player features.
     - model: Trained model used for predicting fantasy points.
+    - feature_names (List[str], optional): Columns the model takes, in order (see model_feature_names); every
+      feature column of players_original if None.
         
     Returns:
     - List[Dict[str, Any]]: The updated team with additional details.
@@ -835,7 +806,9 @@ def generate_player_details_with_shap_values(
     # Define non-feature columns to exclude
     non_feature_cols = ['player_id', 'player_name', 'team_name', 'role', 'predicted_fantasy_points']
     # Define feature columns used by the model
-    feature_cols = [col for col in players_original.columns if col not in non_feature_cols]
+    feature_cols = list(feature_names) if feature_names is not None else [col for col in players_original.columns if col not in non_feature_cols]
+    # Form features, when the model takes them, come after the career, recent and venue blocks
+    base_feature_count = sum(not col.startswith('form_') for col in feature_cols)
     # Extract player IDs from the recommended team
     team_player_ids = [player['player_id'] for player in recommended_team]
     
@@ -859,8 +832,8 @@ def generate_player_details_with_shap_values(
             
             # Extract SHAP values for the player
             player_shap_values = shap_values[idx].values.tolist()
-            if len(player_shap_values) != SHAP_VALUES_LIST_LEN[tournament_type][0]:
-                logging.warning(f"Player ID {player_id} has {len(player_shap_values)} SHAP values instead of {SHAP_VALUES_LIST_LEN[tournament_type][0]}.")
+            if base_feature_count != SHAP_VALUES_LIST_LEN[tournament_type][0]:
+                logging.warning(f"Player ID {player_id} has {base_feature_count} career, recent and venue SHAP values instead of {SHAP_VALUES_LIST_LEN[tournament_type][0]}.")
             player['shap_values'] = [
                 sum(player_shap_values[:SHAP_VALUES_LIST_LEN[tournament_type][1]]),
                 sum(player_shap_values[SHAP_VALUES_LIST_LEN[tournament_type][1]: 2 * SHAP_VALUES_LIST_LEN[tournament_type][1]]),
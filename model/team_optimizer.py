@@ -0,0 +1,287 @@
+import math
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Captain and vice-captain multipliers of the fantasy points
+CAPTAIN_MULTIPLIERS = (2.0, 1.5)
+ROLES = ["Batsman", "Bowler", "Wicket-Keeper", "All-Rounder"]
+
+
+def optimal_team_indices(
+    points: Sequence[float],
+    roles: Sequence[Any],
+    teams: Sequence[Any],
+    team_size: int = 11,
+    role_limits: Optional[Dict[str, Tuple[int, int]]] = None,
+    max_per_team: int = 10,
+    credits: Optional[Sequence[float]] = None,
+    budget: Optional[float] = None,
+    multipliers: Sequence[float] = CAPTAIN_MULTIPLIERS,
+) -> Optional[List[int]]:
+    """
+    Exact dream team selection by branch and bound.
+
+    Maximizes the team's fantasy points with the captain (the best selected player) and vice-captain
+    (the second best) counted with their multipliers, subject to the team size, a (min, max) count per
+    role, a cap on players from one side and an optional credit budget.
+
+    Players are visited in decreasing order of points. For the players still to pick, the best possible
+    completion is the next k players in that order with the remaining multipliers applied to the first
+    of them, which gives a tight upper bound for pruning. When the top team_size players are already
+    feasible they are returned straight away, which is the common case.
+
+    With a budget that bound ignores what the players cost, so it is paired with a knapsack bound: the
+    most points k of the remaining players can score within the credits left, multipliers included,
+    tabulated once per call by a dynamic program over (players left, credits). The team attaining it at
+    the root is returned straight away when it also meets the role and side limits. A player is also
+    never taken while a cheaper one of the same role and side with at least as many points has been left
+    out.
+
+    Args:
+        points (Sequence[float]): Fantasy points of each player.
+        roles (Sequence[Any]): Role of each player. Matched case-insensitively against role_limits.
+        teams (Sequence[Any]): Side of each player, for max_per_team.
+        team_size (int): Number of players to pick.
+        role_limits (Optional[Dict[str, Tuple[int, int]]]): (min, max) players per role. Defaults to at
+            least one player of every role in ROLES that is present in the pool.
+        max_per_team (int): Maximum players from one side.
+        credits (Optional[Sequence[float]]): Credit cost of each player, used with budget.
+        budget (Optional[float]): Maximum total credits, or None for no budget.
+        multipliers (Sequence[float]): Multipliers of the best, second best, ... selected players.
+
+    Returns:
+        Optional[List[int]]: Indices of the selected players, best first, or None if no team satisfies the constraints.
+    """
+    n = len(points)
+    if n < team_size:
+        return None
+
+    role_keys = [str(role).lower() for role in roles]
+    if role_limits is None:
+        present = set(role_keys)
+        role_limits = {role: (1, team_size) for role in ROLES if role.lower() in present}
+    limits = {role.lower(): limit for role, limit in role_limits.items()}
+    if sum(minimum for minimum, _ in limits.values()) > team_size:
+        return None
+
+    order = sorted(range(n), key=lambda i: -points[i])
+    values = [float(points[i]) for i in order]
+    player_roles = [role_keys[i] if role_keys[i] in limits else None for i in order]
+    player_teams = [teams[i] for i in order]
+    costs = [float(credits[i]) for i in order] if budget is not None else [0.0] * n
+    extras = [multiplier - 1.0 for multiplier in multipliers][:team_size]
+
+    # prefix[i] = values[0] + ... + values[i - 1], so a run of the sorted values sums in O(1)
+    prefix = [0.0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+    # remaining[role][i] = players of that role at positions i..n-1
+    remaining = {role: [0] * (n + 1) for role in limits}
+    for i in range(n - 1, -1, -1):
+        for role in limits:
+            remaining[role][i] = remaining[role][i + 1] + (player_roles[i] == role)
+
+    def is_feasible(selected: List[int]) -> bool:
+        role_counts = {role: 0 for role in limits}
+        team_counts = {}
+        for position in selected:
+            if player_roles[position] is not None:
+                role_counts[player_roles[position]] += 1
+            team_counts[player_teams[position]] = team_counts.get(player_teams[position], 0) + 1
+        return (all(minimum <= role_counts[role] <= maximum for role, (minimum, maximum) in limits.items())
+                and max(team_counts.values()) <= max_per_team
+                and (budget is None or sum(costs[position] for position in selected) <= budget))
+
+    # Fast path: the top team_size players maximize the objective over all teams
+    top = list(range(team_size))
+    if is_feasible(top):
+        return [order[position] for position in top]
+
+    # Budget-aware bound: best_sums[i, j, b] = most points of j players from positions i..n-1 whose credits above the
+    # cheapest player's, each rounded down to whole units, add up to at most b units. Rounding down only loosens the
+    # budget, so with the role and side limits left out this bounds every completion of a node within its credits left
+    if budget is not None:
+        unit = _credit_unit(costs, budget)
+        cheapest = min(costs)
+        extra_units = [max(math.floor((cost - cheapest) / unit + 1e-9), 0) for cost in costs]
+        # Past team_size times the widest spread every completion is affordable, so the table stops there
+        units = min(team_size * max(extra_units), math.floor((budget - cheapest) / unit + 1e-9))
+        if units < 0:
+            return None
+        # Taking player i as the first of the last j picks makes it the (team_size - j)th best of the team, so its
+        # multiplier is known and weights[j - 1] = 1 + extras[team_size - j] is folded into the table
+        weights = np.array([1.0 + (extras[team_size - j] if team_size - j < len(extras) else 0.0)
+                            for j in range(1, team_size + 1)])[:, None]
+        best_sums = np.empty((n + 1, team_size + 1, units + 1))
+        best_sums[n] = -np.inf
+        best_sums[n, 0] = 0.0
+        for i in range(n - 1, -1, -1):
+            best_sums[i] = best_sums[i + 1]
+            units_i = extra_units[i]
+            if units_i <= units:
+                np.maximum(best_sums[i, 1:, units_i:], best_sums[i + 1, :-1, :units + 1 - units_i] + weights * values[i],
+                           out=best_sums[i, 1:, units_i:])
+        # Second fast path: the team that attains the bound at the root, when it also meets the role, side and exact
+        # budget limits
+        knapsack, j, b = [], team_size, min(math.floor((budget - team_size * cheapest) / unit + 1e-9), units)
+        if b >= 0 and best_sums[0, j, b] > -np.inf:
+            for i in range(n):
+                if j and best_sums[i, j, b] != best_sums[i + 1, j, b]:
+                    knapsack.append(i)
+                    j, b = j - 1, b - extra_units[i]
+            if is_feasible(knapsack):
+                return [order[position] for position in knapsack]
+
+    # dominators[q] = earlier players of q's role and side that cost no more: swapping q for one of them keeps a
+    # team feasible without lowering its points, so q is only taken once all of them are
+    dominators = [[p for p in range(q) if player_roles[p] == player_roles[q] and player_teams[p] == player_teams[q]
+                   and costs[p] <= costs[q]] for q in range(n)]
+    chosen = [False] * n
+    best_value = -math.inf
+    best_selection = None
+    selected = []
+    role_counts = {role: 0 for role in limits}
+    team_counts = {}
+
+    def search(i: int, value: float, cost: float) -> None:
+        nonlocal best_value, best_selection
+        k = team_size - len(selected)
+        if k == 0:
+            if value > best_value:
+                best_value = value
+                best_selection = list(selected)
+            return
+        if n - i < k:
+            return
+        # Every role must still be able to reach its minimum, within the slots left
+        missing = 0
+        for role, (minimum, _) in limits.items():
+            needed = minimum - role_counts[role]
+            if needed > 0:
+                if remaining[role][i] < needed:
+                    return
+                missing += needed
+        if missing > k:
+            return
+        # Upper bound: the next k players in points order, with the multipliers still unassigned (the best
+        # selected players come first, so the multipliers apply to at most the next values in order)
+        multiplied = 0.0
+        for offset, extra in enumerate(extras[len(selected):]):
+            if offset < k:
+                multiplied += extra * values[i + offset]
+        bound = value + multiplied + prefix[i + k] - prefix[i]
+        if bound <= best_value:
+            return
+        if budget is not None:
+            units_left = min(math.floor((budget - cost - k * cheapest) / unit + 1e-9), units)
+            if units_left < 0:
+                return
+            if value + best_sums[i, k, units_left] <= best_value:
+                return
+        # If those players would overfill a side, the bound is the best k players that respect
+        # max_per_team instead; when there are not k of them no team can be completed from here
+        side_counts = {}
+        for position in range(i, i + k):
+            side_counts[player_teams[position]] = side_counts.get(player_teams[position], 0) + 1
+        if any(team_counts.get(team, 0) + count > max_per_team for team, count in side_counts.items()):
+            bound = value
+            taken = 0
+            side_counts = dict(team_counts)
+            for position in range(i, n):
+                team = player_teams[position]
+                if side_counts.get(team, 0) < max_per_team:
+                    side_counts[team] = side_counts.get(team, 0) + 1
+                    extra = extras[len(selected) + taken] if len(selected) + taken < len(extras) else 0.0
+                    bound += (1.0 + extra) * values[position]
+                    taken += 1
+                    if taken == k:
+                        break
+            if taken < k or bound <= best_value:
+                return
+
+        role = player_roles[i]
+        team = player_teams[i]
+        # When every slot left is needed for a missing role, only a player of a missing role can be taken
+        fills_missing = role is not None and role_counts[role] < limits[role][0]
+        if (all(chosen[p] for p in dominators[i]) and (missing < k or fills_missing)
+                and (role is None or role_counts[role] < limits[role][1])
+                and team_counts.get(team, 0) < max_per_team
+                and (budget is None or cost + costs[i] <= budget)):
+            extra = extras[len(selected)] if len(selected) < len(extras) else 0.0
+            selected.append(i)
+            chosen[i] = True
+            if role is not None:
+                role_counts[role] += 1
+            team_counts[team] = team_counts.get(team, 0) + 1
+            search(i + 1, value + (1.0 + extra) * values[i], cost + costs[i])
+            team_counts[team] -= 1
+            if role is not None:
+                role_counts[role] -= 1
+            selected.pop()
+            chosen[i] = False
+        search(i + 1, value, cost)
+
+    search(0, 0.0, 0.0)
+    if best_selection is None:
+        return None
+    return [order[position] for position in best_selection]
+
+
+def _credit_unit(costs: List[float], budget: float) -> float:
+    """
+    Unit the budget bound counts credits in: the coarsest of the usual credit steps every cost is a whole number of
+    (so the bound is exact), else 1/512 of the budget. At most 512 units make up the budget, which keeps the bound's
+    table small; coarser units only loosen the bound.
+    """
+    for unit in (1.0, 0.5, 0.25, 0.1, 0.05, 0.01):
+        if all(abs(cost / unit - round(cost / unit)) < 1e-6 for cost in costs):
+            break
+    else:
+        unit = budget / 512
+    return max(unit, budget / 512, 1e-12)
+
+
+def select_dream_team(players: List[Dict[str, Any]], points_key: str, credits_key: str = "credits", **constraints) -> List[Dict[str, Any]]:
+    """
+    Pick the optimal team from a pool of player dicts.
+
+    Args:
+        players (List[Dict[str, Any]]): Players with role, team_name and the points_key field.
+        points_key (str): Field to maximize, e.g. 'predicted_fantasy_points' or 'actual_fantasy_points'.
+        credits_key (str): Field holding each player's credits, only read when a budget is given.
+        **constraints: team_size, role_limits, max_per_team, budget, multipliers (see optimal_team_indices).
+
+    Returns:
+        List[Dict[str, Any]]: The selected players sorted by points_key, best first, or [] if no team is feasible.
+    """
+    credits = [player.get(credits_key, 0.0) for player in players] if constraints.get("budget") is not None else None
+    indices = optimal_team_indices(
+        [player[points_key] for player in players],
+        [player["role"] for player in players],
+        [player["team_name"] for player in players],
+        credits=credits,
+        **constraints,
+    )
+    return [players[i] for i in indices] if indices is not None else []
+
+
+if __name__ == "__main__":
+    # Time 22- and 30-player pools of 11 under budgets from loose to tight (tests/test_team_optimizer.py checks the
+    # selections against brute force)
+    import random
+    import time
+
+    for n in (22, 30):
+        for budget in (None, 100, 95, 90, 85):
+            timings = []
+            for seed in range(100):
+                rng = random.Random(seed)
+                points = [rng.uniform(-10, 120) for _ in range(n)]
+                roles = [rng.choice(ROLES) for _ in range(n)]
+                teams = [rng.choice(["A", "B"]) for _ in range(n)]
+                credits = [rng.randrange(14, 23) / 2 for _ in range(n)]
+                start = time.perf_counter()
+                optimal_team_indices(points, roles, teams, max_per_team=7, credits=credits, budget=budget)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            print(f"{n} players, max 7 per side, budget {budget}: median {timings[50]:.3f} ms, worst {timings[-1]:.3f} ms per team")
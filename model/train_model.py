@@ -1,18 +1,19 @@
 import sys
 import os
+import shutil
+import logging
 sys.path.append(os.path.abspath('../'))
+from data_processing.MatchWise import MatchWise
+from data_processing.delivery_aggregation import MatchWise_from_store
+from data_processing.delivery_store import update_delivery_store
 from data_processing.ODI_MatchWise import ODI_MatchWise
 from data_processing.fantasy_points_odi import add_fantasy_points as add_fantasy_points_odi
-from data_processing.ODI import venue_ODI,recent_ODI,career_ODI
 from data_processing.T20_MatchWise import T20_MatchWise
 from data_processing.fantasy_points_t20 import add_fantasy_points as add_fantasy_points_t20 
-from data_processing.T20 import venue_T20,recent_T20,career_T20
 from data_processing.Test_MatchWise import Test_MatchWise
 from data_processing.fantasy_points_test import add_fantasy_points as add_fantasy_points_test
-from data_processing.Test import venue_Test,recent_Test,career_Test
-from data_processing.player_match_data_odi import process_player_match_data as process_player_match_data_odi
-from data_processing.player_match_data_t20 import process_player_match_data as process_player_match_data_t20
-from data_processing.player_match_data_test import process_player_match_data as process_player_match_data_test
+from data_processing.feature_builder import build_feature_tables, update_feature_tables
+from model.columnar_cache import cache_path, read_table
 
 
 import pandas as pd
@@ -21,6 +22,10 @@ from sklearn.linear_model import HuberRegressor
 from sklearn.preprocessing import StandardScaler
 
 import pickle
+from model.model_artifact import make_model_artifact, predict_with_artifact
+from model.model_registry import model_registry
+from model.team_optimizer import select_dream_team
+from model.evaluation import select_dream_teams, summarize_dream_teams
 
 career_dict = {
     "match_id": "string",  # Match ID is usually a string type, as it may contain letters or special characters.
@@ -92,88 +97,95 @@ player_dict = {
 
 DESIGNATION_PATH = os.path.join(os.path.dirname(__file__), '../data_ui2/interim/Designation.csv')
 
+form_dict = {
+    "match_id": "string",
+    "player_id": "string",
+}
 
-def generate_odi_data_training(start_date,end_date,end_train_date):
 
-    json_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/raw/cricksheet_data'  )
-    output_csv = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_{end_train_date}.csv' )
-    ODI_MatchWise(json_dir,output_csv,start_date,end_date)
+def merge_form_features(merged_df, form_path):
+    """
+    Adds the exponentially weighted form features of form_path (form_<format>_<date>.csv, written by
+    build_feature_tables) after the career, recent and venue columns. The trained artifact then lists them in its
+    feature_names and inference looks them up in the form table; without the table the merge is returned as is.
+    """
+    if not os.path.exists(form_path):
+        return merged_df
+    return pd.merge(merged_df, read_table(form_path, dtype=form_dict), on=['match_id', 'player_id'], how='inner')
 
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_fantasy_points_{end_train_date}.csv')
-    add_fantasy_points_odi(input_file, output_file)
 
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/career_odi_{end_train_date}.csv')
-    career_ODI(input_file, output_file)
+def generate_odi_data_training(start_date,end_date,end_train_date,parse_json=True):
 
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/recent_odi_{end_train_date}.csv')
-    recent_ODI(input_file, output_file)
+    # parse_json=False when the MatchWise CSV was already written by a multi-format MatchWise pass
+    if parse_json:
+        json_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/raw/cricksheet_data'  )
+        output_csv = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_{end_train_date}.csv' )
+        ODI_MatchWise(json_dir,output_csv,start_date,end_date)
 
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/venue_odi_{end_train_date}.csv')
-    venue_ODI(input_file, output_file)
+    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_{end_train_date}.csv')
+    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_fantasy_points_{end_train_date}.csv')
+    add_fantasy_points_odi(input_file, output_file)
 
     input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/ODI_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/player_match_data_odi_{end_train_date}.csv')
-    process_player_match_data_odi(DESIGNATION_PATH,input_file, output_file)
+    output_files = {
+        'career': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/career_odi_{end_train_date}.csv'),
+        'recent': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/recent_odi_{end_train_date}.csv'),
+        'venue': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/venue_odi_{end_train_date}.csv'),
+        'form': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/form_odi_{end_train_date}.csv'),
+        'player_match': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/player_match_data_odi_{end_train_date}.csv'),
+    }
+    # One read and one date sort of the fantasy points CSV for the career, recent, venue, form and player match tables
+    build_feature_tables('ODI', input_file, output_files, DESIGNATION_PATH)
 
 
 
-def generate_t20_data_training(start_date,end_date,end_train_date):
+def generate_t20_data_training(start_date,end_date,end_train_date,parse_json=True):
 
-    json_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/raw/cricksheet_data'  )
-    output_csv = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/T20_MatchWise_{end_train_date}.csv' )
-    T20_MatchWise(json_dir,output_csv,start_date,end_date)
+    # parse_json=False when the MatchWise CSV was already written by a multi-format MatchWise pass
+    if parse_json:
+        json_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/raw/cricksheet_data'  )
+        output_csv = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/T20_MatchWise_{end_train_date}.csv' )
+        T20_MatchWise(json_dir,output_csv,start_date,end_date)
 
     input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/T20_MatchWise_{end_train_date}.csv')
     output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/T20_MatchWise_fantasy_points_{end_train_date}.csv')
     add_fantasy_points_t20(input_file, output_file)
 
     input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/T20_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/career_t20_{end_train_date}.csv')
-    career_T20(input_file, output_file)
-
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/T20_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/recent_t20_{end_train_date}.csv')
-    recent_T20(input_file, output_file)
+    output_files = {
+        'career': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/career_t20_{end_train_date}.csv'),
+        'recent': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/recent_t20_{end_train_date}.csv'),
+        'venue': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/venue_t20_{end_train_date}.csv'),
+        'form': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/form_t20_{end_train_date}.csv'),
+        'player_match': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/player_match_data_t20_{end_train_date}.csv'),
+    }
+    # One read and one date sort of the fantasy points CSV for the career, recent, venue, form and player match tables
+    build_feature_tables('T20', input_file, output_files, DESIGNATION_PATH)
 
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/T20_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/venue_t20_{end_train_date}.csv')
-    venue_T20(input_file, output_file)
-
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/T20_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/player_match_data_t20_{end_train_date}.csv')
-    process_player_match_data_t20(DESIGNATION_PATH,input_file, output_file)
 
 
+def generate_test_data_training(start_date,end_date,end_train_date,parse_json=True):
 
-def generate_test_data_training(start_date,end_date,end_train_date):
-
-    json_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/raw/cricksheet_data'  )
-    output_csv = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/Test_MatchWise_{end_train_date}.csv' )
-    Test_MatchWise(json_dir,output_csv,start_date,end_date)
+    # parse_json=False when the MatchWise CSV was already written by a multi-format MatchWise pass
+    if parse_json:
+        json_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/raw/cricksheet_data'  )
+        output_csv = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/Test_MatchWise_{end_train_date}.csv' )
+        Test_MatchWise(json_dir,output_csv,start_date,end_date)
 
     input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/Test_MatchWise_{end_train_date}.csv')
     output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/Test_MatchWise_fantasy_points_{end_train_date}.csv')
     add_fantasy_points_test(input_file, output_file)
 
     input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/Test_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/career_test_{end_train_date}.csv')
-    career_Test(input_file, output_file)
-
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/Test_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/recent_test_{end_train_date}.csv')
-    recent_Test(input_file, output_file)
-
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/Test_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/venue_test_{end_train_date}.csv')
-    venue_Test(input_file, output_file)
-
-    input_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/Test_MatchWise_fantasy_points_{end_train_date}.csv')
-    output_file = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/player_match_data_test_{end_train_date}.csv')
-    process_player_match_data_test(DESIGNATION_PATH,input_file, output_file)
+    output_files = {
+        'career': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/career_test_{end_train_date}.csv'),
+        'recent': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/recent_test_{end_train_date}.csv'),
+        'venue': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/venue_test_{end_train_date}.csv'),
+        'form': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/form_test_{end_train_date}.csv'),
+        'player_match': os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/player_match_data_test_{end_train_date}.csv'),
+    }
+    # One read and one date sort of the fantasy points CSV for the career, recent, venue, form and player match tables
+    build_feature_tables('Test', input_file, output_files, DESIGNATION_PATH)
 
 
 def generate_odi_data_testing(start_date,end_date,end_train_date):
@@ -184,14 +196,16 @@ def generate_odi_data_testing(start_date,end_date,end_train_date):
     file4_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/player_match_data_odi_{end_train_date}.csv')
 
     # Load data
-    df1 = pd.read_csv(file1_path, dtype=career_dict)
-    df2 = pd.read_csv(file2_path, dtype=recent_dict)
-    df3 = pd.read_csv(file3_path, dtype=venue_dict)
-    df4 = pd.read_csv(file4_path, dtype=player_dict, parse_dates=["date"])
+    df1 = read_table(file1_path, dtype=career_dict)
+    df2 = read_table(file2_path, dtype=recent_dict)
+    df3 = read_table(file3_path, dtype=venue_dict)
+    df4 = read_table(file4_path, dtype=player_dict, parse_dates=["date"])
 
     # Merge datasets
     merged_df = pd.merge(df1, df2, on=['match_id', 'player_id'], how='inner')
     merged_df = pd.merge(merged_df, df3, on=['match_id', 'player_id'], how='inner')
+    form_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/form_odi_{end_train_date}.csv')
+    merged_df = merge_form_features(merged_df, form_path)
     merged_df = pd.merge(merged_df, df4, on=['match_id', 'player_id'], how='inner')
 
     # Process data
@@ -220,14 +234,16 @@ def generate_t20_data_testing(start_date,end_date,end_train_date):
 
 
     # Load data
-    df1 = pd.read_csv(file1_path, dtype=career_dict)
-    df2 = pd.read_csv(file2_path, dtype=recent_dict)
-    df3 = pd.read_csv(file3_path, dtype=venue_dict)
-    df4 = pd.read_csv(file4_path, dtype=player_dict, parse_dates=["date"])
+    df1 = read_table(file1_path, dtype=career_dict)
+    df2 = read_table(file2_path, dtype=recent_dict)
+    df3 = read_table(file3_path, dtype=venue_dict)
+    df4 = read_table(file4_path, dtype=player_dict, parse_dates=["date"])
 
     # Merge datasets
     merged_df = pd.merge(df1, df2, on=['match_id', 'player_id'], how='inner')
     merged_df = pd.merge(merged_df, df3, on=['match_id', 'player_id'], how='inner')
+    form_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/form_t20_{end_train_date}.csv')
+    merged_df = merge_form_features(merged_df, form_path)
     merged_df = pd.merge(merged_df, df4, on=['match_id', 'player_id'], how='inner')
 
     # Process data
@@ -253,14 +269,16 @@ def generate_test_data_testing(start_date,end_date,end_train_date):
     file4_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/player_match_data_test_{end_train_date}.csv')
 
     # Load data
-    df1 = pd.read_csv(file1_path, dtype=career_dict)
-    df2 = pd.read_csv(file2_path, dtype=recent_dict)
-    df3 = pd.read_csv(file3_path, dtype=venue_dict)
-    df4 = pd.read_csv(file4_path, dtype=player_dict, parse_dates=["date"])
+    df1 = read_table(file1_path, dtype=career_dict)
+    df2 = read_table(file2_path, dtype=recent_dict)
+    df3 = read_table(file3_path, dtype=venue_dict)
+    df4 = read_table(file4_path, dtype=player_dict, parse_dates=["date"])
 
     # Merge datasets
     merged_df = pd.merge(df1, df2, on=['match_id', 'player_id'], how='inner')
     merged_df = pd.merge(merged_df, df3, on=['match_id', 'player_id'], how='inner')
+    form_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/form_test_{end_train_date}.csv')
+    merged_df = merge_form_features(merged_df, form_path)
     merged_df = pd.merge(merged_df, df4, on=['match_id', 'player_id'], how='inner')
 
     # Process data
@@ -276,11 +294,77 @@ def generate_test_data_testing(start_date,end_date,end_train_date):
     merged_df_after_start_date.to_csv(output_file, index=False)
 
 
+# Fantasy points scoring of each tournament type
+ADD_FANTASY_POINTS = {"ODI": add_fantasy_points_odi, "T20": add_fantasy_points_t20, "Test": add_fantasy_points_test}
+# Processed table file names by table kind, as build_feature_tables() names its outputs
+TABLE_FILES = {"career": "career", "recent": "recent", "venue": "venue", "form": "form", "player_match": "player_match_data"}
+
+
+def update_data_training(tournament_type, end_train_date):
+    """
+    Brings the processed tables of a tournament type up to date with its MatchWise CSV for a retrain, and copies
+    them to the dated paths train_model_* and generate_*_data_testing read.
+
+    The MatchWise and fantasy points CSVs and the processed tables keep the same paths from one retrain to the
+    next. add_fantasy_points rewrites the fantasy points CSV sorted by date and match_id, so when only later matches
+    were added (later days, or later match ids of the checkpointed last day) the rows the checkpoint covers keep
+    their bytes and update_feature_tables() appends just the new rows. Matches added among earlier days, or removed
+    or changed, rewrite the tables from the first day they touch. Only without a usable checkpoint (none yet, or
+    tables changed since it was saved) are the tables and their checkpoint rebuilt, with a warning.
+
+    Args:
+        tournament_type (str): 'ODI', 'T20' or 'Test'.
+        end_train_date (str): Date the copies of the tables are named by.
+    """
+    interim_dir = os.path.join(os.path.dirname(__file__), '../data_ui2/interim')
+    processed_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/{tournament_type}')
+    suffix = tournament_type.lower()
+
+    input_file = os.path.join(interim_dir, f'{tournament_type}_MatchWise_fantasy_points.csv')
+    ADD_FANTASY_POINTS[tournament_type](os.path.join(interim_dir, f'{tournament_type}_MatchWise.csv'), input_file)
+
+    output_files = {kind: os.path.join(processed_dir, f'{name}_{suffix}.csv') for kind, name in TABLE_FILES.items()}
+    checkpoint_file = os.path.join(processed_dir, f'features_{suffix}.ckpt')
+    os.makedirs(processed_dir, exist_ok=True)
+    try:
+        update_feature_tables(tournament_type, input_file, output_files, checkpoint_file, DESIGNATION_PATH)
+    except (FileNotFoundError, ValueError) as e:
+        logging.warning(f"Rebuilding the {tournament_type} tables from their whole MatchWise CSV: {e}")
+        build_feature_tables(tournament_type, input_file, output_files, DESIGNATION_PATH, checkpoint_file=checkpoint_file)
+
+    # Copies keep their modification times, so each table's columnar cache is still fresh for its copy
+    for kind, output_file in output_files.items():
+        dated_file = os.path.join(processed_dir, f'{TABLE_FILES[kind]}_{suffix}_{end_train_date}.csv')
+        shutil.copy2(output_file, dated_file)
+        if os.path.exists(cache_path(output_file)):
+            shutil.copy2(cache_path(output_file), cache_path(dated_file))
+
+
 def generate_training_data_for_retraining(start_date,end_date,end_train_date):
 
-    generate_odi_data_training(start_date,end_date,end_train_date)
-    generate_t20_data_training(start_date,end_date,end_train_date)
-    generate_test_data_training(start_date,end_date,end_train_date)
+    # Bring the delivery store of the Cricsheet archive up to date, parsing on every CPU only the files added or changed
+    # since the previous retrain, then write the ODI, T20 and Test MatchWise CSVs from it with grouped reductions over
+    # every match at once. Their paths stay the same across retrains and new matches come last (see update_data_training)
+    json_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/raw/cricksheet_data'  )
+    output_csvs = {
+        tournament_type: os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/{tournament_type}_MatchWise.csv')
+        for tournament_type in ['ODI', 'T20', 'Test']
+    }
+    store_dir = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/delivery_store')
+    try:
+        print(update_delivery_store(json_dir,store_dir,workers=None))
+    except ImportError as e:
+        # Without pyarrow there is no store; walk the JSON, still parsing only new or changed files thanks to the
+        # manifest, and skipping files outside the date range unopened thanks to the match index
+        print(f"Parsing the match files directly: {e}")
+        manifest_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/MatchWise_manifest.json')
+        index_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/interim/match_index.csv')
+        MatchWise(json_dir,output_csvs,start_date,end_date,workers=None,manifest_path=manifest_path,index_path=index_path)
+    else:
+        MatchWise_from_store(store_dir,output_csvs,start_date,end_date)
+
+    for tournament_type in ['ODI', 'T20', 'Test']:
+        update_data_training(tournament_type, end_train_date)
     
 def generate_testing_data_for_retraining(start_date,end_date,end_train_date):
 
@@ -305,21 +389,22 @@ def train_model_odi(start_date, end_date):
         file2_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/recent_odi_{end_date}.csv')
         file3_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/venue_odi_{end_date}.csv')
         file4_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/player_match_data_odi_{end_date}.csv')
+        form_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/ODI/form_odi_{end_date}.csv')
 
         print(f"File paths:\n  {file1_path}\n  {file2_path}\n  {file3_path}\n  {file4_path}")
 
         # Load data
         print("Loading data...")
-        df1 = pd.read_csv(file1_path, dtype=career_dict)
+        df1 = read_table(file1_path, dtype=career_dict)
         print(f"Loaded career data: {df1.shape}")
 
-        df2 = pd.read_csv(file2_path, dtype=recent_dict)
+        df2 = read_table(file2_path, dtype=recent_dict)
         print(f"Loaded recent data: {df2.shape}")
 
-        df3 = pd.read_csv(file3_path, dtype=venue_dict)
+        df3 = read_table(file3_path, dtype=venue_dict)
         print(f"Loaded venue data: {df3.shape}")
 
-        df4 = pd.read_csv(file4_path, dtype=player_dict, parse_dates=["date"])
+        df4 = read_table(file4_path, dtype=player_dict, parse_dates=["date"])
         print(f"Loaded player match data: {df4.shape}")
 
         # Merge datasets
@@ -330,6 +415,9 @@ def train_model_odi(start_date, end_date):
         merged_df = pd.merge(merged_df, df3, on=['match_id', 'player_id'], how='inner')
         print(f"After merging df3: {merged_df.shape}")
 
+        merged_df = merge_form_features(merged_df, form_path)
+        print(f"After merging form features: {merged_df.shape}")
+
         merged_df = pd.merge(merged_df, df4, on=['match_id', 'player_id'], how='inner')
         print(f"After merging df4: {merged_df.shape}")
 
@@ -363,8 +451,9 @@ def train_model_odi(start_date, end_date):
 
         filename = os.path.join(os.path.dirname(__file__), f"../model_artifacts_ui2/ODI/model_ODI_{end_date}.pkl")
         os.makedirs(os.path.dirname(filename), exist_ok=True)
+        # Save the scaler and the feature order with the model so inference reuses them
         with open(filename, 'wb') as f:
-            pickle.dump(model, f)
+            pickle.dump(make_model_artifact("ODI", scaler, model, X_train.columns), f)
         print(f"Model saved successfully at {filename}.")
 
     except Exception as e:
@@ -382,14 +471,16 @@ def train_model_t20(start_date, end_date):
     file4_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/player_match_data_t20_{end_date}.csv')
 
     # Load data
-    df1 = pd.read_csv(file1_path, dtype=career_dict)
-    df2 = pd.read_csv(file2_path, dtype=recent_dict)
-    df3 = pd.read_csv(file3_path, dtype=venue_dict)
-    df4 = pd.read_csv(file4_path, dtype=player_dict, parse_dates=["date"])
+    df1 = read_table(file1_path, dtype=career_dict)
+    df2 = read_table(file2_path, dtype=recent_dict)
+    df3 = read_table(file3_path, dtype=venue_dict)
+    df4 = read_table(file4_path, dtype=player_dict, parse_dates=["date"])
 
     # Merge datasets
     merged_df = pd.merge(df1, df2, on=['match_id', 'player_id'], how='inner')
     merged_df = pd.merge(merged_df, df3, on=['match_id', 'player_id'], how='inner')
+    form_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/T20/form_t20_{end_date}.csv')
+    merged_df = merge_form_features(merged_df, form_path)
     merged_df = pd.merge(merged_df, df4, on=['match_id', 'player_id'], how='inner')
 
     # Process data
@@ -413,8 +504,9 @@ def train_model_t20(start_date, end_date):
 
     filename = os.path.join(os.path.dirname(__file__), f"../model_artifacts_ui2/T20/model_T20_{end_date}.pkl")
     os.makedirs(os.path.dirname(filename), exist_ok=True)
+    # Save the scaler and the feature order with the model so inference reuses them
     with open(filename, 'wb') as f:
-        pickle.dump(model, f)
+        pickle.dump(make_model_artifact("T20", scaler, model, X_train.columns), f)
 
 
 def train_model_test(start_date, end_date):
@@ -425,14 +517,16 @@ def train_model_test(start_date, end_date):
     file4_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/player_match_data_test_{end_date}.csv')
 
     # Load data
-    df1 = pd.read_csv(file1_path, dtype=career_dict)
-    df2 = pd.read_csv(file2_path, dtype=recent_dict)
-    df3 = pd.read_csv(file3_path, dtype=venue_dict)
-    df4 = pd.read_csv(file4_path, dtype=player_dict, parse_dates=["date"])
+    df1 = read_table(file1_path, dtype=career_dict)
+    df2 = read_table(file2_path, dtype=recent_dict)
+    df3 = read_table(file3_path, dtype=venue_dict)
+    df4 = read_table(file4_path, dtype=player_dict, parse_dates=["date"])
 
     # Merge datasets
     merged_df = pd.merge(df1, df2, on=['match_id', 'player_id'], how='inner')
     merged_df = pd.merge(merged_df, df3, on=['match_id', 'player_id'], how='inner')
+    form_path = os.path.join(os.path.dirname(__file__), f'../data_ui2/processed/Test/form_test_{end_date}.csv')
+    merged_df = merge_form_features(merged_df, form_path)
     merged_df = pd.merge(merged_df, df4, on=['match_id', 'player_id'], how='inner')
 
     # Process data
@@ -457,8 +551,9 @@ def train_model_test(start_date, end_date):
     # Save the model
     filename = os.path.join(os.path.dirname(__file__), f"../model_artifacts_ui2/Test/model_test_{end_date}.pkl")
     os.makedirs(os.path.dirname(filename), exist_ok=True)
+    # Save the scaler and the feature order with the model so inference reuses them
     with open(filename, 'wb') as f:
-        pickle.dump(model, f)
+        pickle.dump(make_model_artifact("Test", scaler, model, X_train.columns), f)
 
 # Function to clean team names by replacing empty or whitespace-only strings with NaN
 def clean_team_names(df):
@@ -500,36 +595,10 @@ def extract_match_details(df):
 # Define Dream Team Calculation Logic
 def calculate_dream_team_predicted(players):
     try:
-        # Step 1: Pick one player from each role based on predicted fantasy points
-        selected_players = []
-        for role in ["Batsman", "Bowler", "Wicket-Keeper", "All-Rounder"]:
-            role_players = [p for p in players if p["role"].lower() == role.lower()]
-            if role_players:
-                selected_players.append(max(role_players, key=lambda x: x["predicted_fantasy_points"]))
-
-        # Step 2: Select remaining players to make a team of 11
-        remaining_players = [p for p in players if p not in selected_players]
-        remaining_players.sort(key=lambda x: x["predicted_fantasy_points"], reverse=True)
-
-        while len(selected_players) < 11:
-            next_player = remaining_players.pop(0)
-            selected_players.append(next_player)
-
-        # Step 3: Ensure team diversity (max 5 players from one team)
-        team_counts = pd.DataFrame(selected_players)["team_name"].value_counts()
-        if team_counts.max() == 11:
-            # Replace the lowest fantasy point player with the highest fantasy point player from the other team
-            other_team = [team for team in players[0]["team_name"].unique() if team not in team_counts.index][0]
-            lowest_fantasy_player = min(selected_players, key=lambda x: x["predicted_fantasy_points"])
-            replacement_player = max(
-                [p for p in players if p["team_name"] == other_team and p not in selected_players],
-                key=lambda x: x["predicted_fantasy_points"]
-            )
-            selected_players.remove(lowest_fantasy_player)
-            selected_players.append(replacement_player)
-
-        # Step 4: Sort selected players by predicted fantasy points
-        selected_players.sort(key=lambda x: x["predicted_fantasy_points"], reverse=True)
+        # Exact selection by predicted fantasy points (same constraints as generate_recommended_team)
+        selected_players = select_dream_team(players, "predicted_fantasy_points")
+        if not selected_players:
+            return None, "Infeasible"
 
         return selected_players, "Optimal"
 
@@ -540,36 +609,10 @@ def calculate_dream_team_predicted(players):
 # Define Dream Team Calculation Logic
 def calculate_dream_team_actual(players):
     try:
-        # Step 1: Pick one player from each role based on actual fantasy points
-        selected_players = []
-        for role in ["Batsman", "Bowler", "Wicket-Keeper", "All-Rounder"]:
-            role_players = [p for p in players if p["role"].lower() == role.lower()]
-            if role_players:
-                selected_players.append(max(role_players, key=lambda x: x["actual_fantasy_points"]))
-
-        # Step 2: Select remaining players to make a team of 11
-        remaining_players = [p for p in players if p not in selected_players]
-        remaining_players.sort(key=lambda x: x["actual_fantasy_points"], reverse=True)
-
-        while len(selected_players) < 11:
-            next_player = remaining_players.pop(0)
-            selected_players.append(next_player)
-
-        # Step 3: Ensure team diversity (max 5 players from one team)
-        team_counts = pd.DataFrame(selected_players)["team_name"].value_counts()
-        if team_counts.max() == 11:
-            # Replace the lowest fantasy point player with the highest fantasy point player from the other team
-            other_team = [team for team in players[0]["team_name"].unique() if team not in team_counts.index][0]
-            lowest_fantasy_player = min(selected_players, key=lambda x: x["actual_fantasy_points"])
-            replacement_player = max(
-                [p for p in players if p["team_name"] == other_team and p not in selected_players],
-                key=lambda x: x["actual_fantasy_points"]
-            )
-            selected_players.remove(lowest_fantasy_player)
-            selected_players.append(replacement_player)
-
-        # Step 4: Sort selected players by actual fantasy points
-        selected_players.sort(key=lambda x: x["actual_fantasy_points"], reverse=True)
+        # Exact selection by actual fantasy points (same constraints as generate_recommended_team)
+        selected_players = select_dream_team(players, "actual_fantasy_points")
+        if not selected_players:
+            return None, "Infeasible"
 
         return selected_players, "Optimal"
 
@@ -620,8 +663,7 @@ def evaluate_model_odi(end_training_date, end_testing_date):
 
     # Ensure the model file exists
     if os.path.exists(model_file_path):
-        with open(model_file_path, 'rb') as f:
-            model = pickle.load(f)
+        model = model_registry.get("ODI", model_file_path)
         print("Model loaded successfully!")
     else:
         print(f"Model file not found at: {model_file_path}")
@@ -631,11 +673,8 @@ def evaluate_model_odi(end_training_date, end_testing_date):
     X_test = merged_df_test.drop(columns=columns_to_drop)
     y_test = merged_df_test['fantasy_points']
 
-    scaler = StandardScaler()
-    X_test_scaled = scaler.fit_transform(X_test)
-
-    # Use the trained model to make predictions on the test data
-    y_pred = model.predict(X_test_scaled)
+    # Use the trained model and its training-time scaler to make predictions on the test data
+    y_pred = predict_with_artifact(model, X_test)
 
     # Create a new DataFrame with the necessary columns
     predictions_df = merged_df_test[['match_id', 'player_id', 'player_name', 'fantasy_points', 'role', 'team_name','date']].copy()
@@ -669,45 +708,13 @@ def evaluate_model_odi(end_training_date, end_testing_date):
     # Read Data
     data = pd.read_csv(input_file)
 
-    # Prepare Output Data
-    output_data = []
-    # Process Matches
-    i = 1
-    for match_id, match_group in data.groupby("match_id"):
-        # Extract necessary columns (including date)
-        players = match_group[['match_id', 'date', 'player_id', 'player_name', 'actual_fantasy_points', 'role', 'team_name', 'predicted_fantasy_points']].to_dict(orient="records")
-        match_date = match_group['date'].iloc[0]  # Extract the date for the match
-
-        # Calculate Dream Team
-        selected_team, status = calculate_dream_team_predicted(players)
-
-        if selected_team is None or len(selected_team) != 11:
-            # If selected_team is None or doesn't have exactly 11 players, log the error
-            with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
-                file.write(f"{status}, {match_id}, {len(selected_team) if selected_team else 'None'}, {selected_team if selected_team else 'None'}\n")
-            i += 1
-            continue
-
-        # Prepare Row for Output
-        for player in selected_team:
-            row = [
-                match_id,
-                match_date,
-                player["player_id"],
-                player["player_name"],
-                player["actual_fantasy_points"],
-                player["role"],
-                player["team_name"],
-                player["predicted_fantasy_points"]
-            ]
-            output_data.append(row)
-
-        if i % 100 == 0:
-            print(f"Processed {i} matches...")
-        i += 1
-
-    # Write Output to CSV
-    output_df = pd.DataFrame(output_data, columns=output_columns)
+    # Pick every match's dream team in one grouped pass
+    output_df, failed_matches = select_dream_teams(data, "predicted_fantasy_points")
+    if failed_matches:
+        with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
+            for match_id, status in failed_matches:
+                file.write(f"{status}, {match_id}, None, None\n")
+    output_df = output_df[output_columns]
     output_df.to_csv(output_file, index=False)
 
     print(f"Dream Team details saved to {output_file}")
@@ -726,46 +733,13 @@ def evaluate_model_odi(end_training_date, end_testing_date):
     # Read Data
     data = pd.read_csv(input_file)
 
-    # Prepare Output Data
-    output_data = []
-
-    # Process Matches
-    i = 1
-    for match_id, match_group in data.groupby("match_id"):
-        # Extract necessary columns (including date)
-        players = match_group[['match_id', 'date', 'player_id', 'player_name', 'actual_fantasy_points', 'role', 'team_name', 'predicted_fantasy_points']].to_dict(orient="records")
-        match_date = match_group['date'].iloc[0]  # Extract the date for the match
-
-        # Calculate Dream Team
-        selected_team, status = calculate_dream_team_actual(players)
-
-        if selected_team is None or len(selected_team) != 11:
-            # If selected_team is None or doesn't have exactly 11 players, log the error
-            with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
-                file.write(f"{status}, {match_id}, {len(selected_team) if selected_team else 'None'}, {selected_team if selected_team else 'None'}\n")
-            i += 1
-            continue
-
-        # Prepare Row for Output
-        for player in selected_team:
-            row = [
-                match_id,
-                match_date,
-                player["player_id"],
-                player["player_name"],
-                player["actual_fantasy_points"],
-                player["role"],
-                player["team_name"],
-                player["predicted_fantasy_points"]
-            ]
-            output_data.append(row)
-
-        if i % 100 == 0:
-            print(f"Processed {i} matches...")
-        i += 1
-
-    # Write Output to CSV
-    output_df = pd.DataFrame(output_data, columns=output_columns)
+    # Pick every match's dream team in one grouped pass
+    output_df, failed_matches = select_dream_teams(data, "actual_fantasy_points")
+    if failed_matches:
+        with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
+            for match_id, status in failed_matches:
+                file.write(f"{status}, {match_id}, None, None\n")
+    output_df = output_df[output_columns]
     output_df.to_csv(output_file, index=False)
 
     print(f"Dream Team details saved to {output_file}")
@@ -781,34 +755,8 @@ def evaluate_model_odi(end_training_date, end_testing_date):
     predicted_df = pd.read_csv(predicted_file)
     actual_df = pd.read_csv(actual_file)
 
-    # Initialize list to store the summary for each match_id
-    summary_data = []
-
-    
-
-    # Iterate through the unique match IDs
-    for match_id in predicted_df['match_id'].unique():
-        # Get the predicted dream team for the current match_id
-        predicted_team = predicted_df[predicted_df['match_id'] == match_id]
-
-        # Get the actual dream team for the current match_id
-        actual_team = actual_df[actual_df['match_id'] == match_id]
-
-        # Calculate the sum of actual and predicted points for both teams
-        predicted_team_points = calculate_team_points(predicted_team)
-        actual_team_points_predicted = calculate_team_points(actual_team)
-        
-        # Add the match summary to the summary_data list
-        summary_data.append({
-            'match_id': match_id,
-            'sum_predicted_points_predicted_team': predicted_team_points,
-            'sum_predicted_points_actual_team': actual_team_points_predicted,
-            'sum_actual_points_predicted_team': predicted_team['actual_fantasy_points'].sum(),
-            'sum_actual_points_actual_team': actual_team['actual_fantasy_points'].sum()
-        })
-
-    # Create a DataFrame from the summary_data
-    summary_df = pd.DataFrame(summary_data)
+    # Summarize every match with grouped sums
+    summary_df = summarize_dream_teams(predicted_df, actual_df)
 
     # Write the summary data to a CSV file
     summary_df.to_csv(output_file, index=False)
@@ -1011,8 +959,7 @@ def evaluate_model_test(end_training_date, end_testing_date):
 
     # Ensure the model file exists
     if os.path.exists(model_file_path):
-        with open(model_file_path, 'rb') as f:
-            model = pickle.load(f)
+        model = model_registry.get("Test", model_file_path)
         print("Model loaded successfully!")
     else:
         print(f"Model file not found at: {model_file_path}")
@@ -1022,11 +969,8 @@ def evaluate_model_test(end_training_date, end_testing_date):
     X_test = merged_df_test.drop(columns=columns_to_drop)
     y_test = merged_df_test['fantasy_points']
 
-    scaler = StandardScaler()
-    X_test_scaled = scaler.fit_transform(X_test)
-
-    # Use the trained model to make predictions on the test data
-    y_pred = model.predict(X_test_scaled)
+    # Use the trained model and its training-time scaler to make predictions on the test data
+    y_pred = predict_with_artifact(model, X_test)
 
     # Create a new DataFrame with the necessary columns
     predictions_df = merged_df_test[['match_id', 'player_id', 'player_name', 'fantasy_points', 'role', 'team_name','date']].copy()
@@ -1060,45 +1004,13 @@ def evaluate_model_test(end_training_date, end_testing_date):
     # Read Data
     data = pd.read_csv(input_file)
 
-    # Prepare Output Data
-    output_data = []
-    # Process Matches
-    i = 1
-    for match_id, match_group in data.groupby("match_id"):
-        # Extract necessary columns (including date)
-        players = match_group[['match_id', 'date', 'player_id', 'player_name', 'actual_fantasy_points', 'role', 'team_name', 'predicted_fantasy_points']].to_dict(orient="records")
-        match_date = match_group['date'].iloc[0]  # Extract the date for the match
-
-        # Calculate Dream Team
-        selected_team, status = calculate_dream_team_predicted(players)
-
-        if selected_team is None or len(selected_team) != 11:
-            # If selected_team is None or doesn't have exactly 11 players, log the error
-            with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
-                file.write(f"{status}, {match_id}, {len(selected_team) if selected_team else 'None'}, {selected_team if selected_team else 'None'}\n")
-            i += 1
-            continue
-
-        # Prepare Row for Output
-        for player in selected_team:
-            row = [
-                match_id,
-                match_date,
-                player["player_id"],
-                player["player_name"],
-                player["actual_fantasy_points"],
-                player["role"],
-                player["team_name"],
-                player["predicted_fantasy_points"]
-            ]
-            output_data.append(row)
-
-        if i % 100 == 0:
-            print(f"Processed {i} matches...")
-        i += 1
-
-    # Write Output to CSV
-    output_df = pd.DataFrame(output_data, columns=output_columns)
+    # Pick every match's dream team in one grouped pass
+    output_df, failed_matches = select_dream_teams(data, "predicted_fantasy_points")
+    if failed_matches:
+        with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
+            for match_id, status in failed_matches:
+                file.write(f"{status}, {match_id}, None, None\n")
+    output_df = output_df[output_columns]
     output_df.to_csv(output_file, index=False)
 
     print(f"Dream Team details saved to {output_file}")
@@ -1117,46 +1029,13 @@ def evaluate_model_test(end_training_date, end_testing_date):
     # Read Data
     data = pd.read_csv(input_file)
 
-    # Prepare Output Data
-    output_data = []
-
-    # Process Matches
-    i = 1
-    for match_id, match_group in data.groupby("match_id"):
-        # Extract necessary columns (including date)
-        players = match_group[['match_id', 'date', 'player_id', 'player_name', 'actual_fantasy_points', 'role', 'team_name', 'predicted_fantasy_points']].to_dict(orient="records")
-        match_date = match_group['date'].iloc[0]  # Extract the date for the match
-
-        # Calculate Dream Team
-        selected_team, status = calculate_dream_team_actual(players)
-
-        if selected_team is None or len(selected_team) != 11:
-            # If selected_team is None or doesn't have exactly 11 players, log the error
-            with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
-                file.write(f"{status}, {match_id}, {len(selected_team) if selected_team else 'None'}, {selected_team if selected_team else 'None'}\n")
-            i += 1
-            continue
-
-        # Prepare Row for Output
-        for player in selected_team:
-            row = [
-                match_id,
-                match_date,
-                player["player_id"],
-                player["player_name"],
-                player["actual_fantasy_points"],
-                player["role"],
-                player["team_name"],
-                player["predicted_fantasy_points"]
-            ]
-            output_data.append(row)
-
-        if i % 100 == 0:
-            print(f"Processed {i} matches...")
-        i += 1
-
-    # Write Output to CSV
-    output_df = pd.DataFrame(output_data, columns=output_columns)
+    # Pick every match's dream team in one grouped pass
+    output_df, failed_matches = select_dream_teams(data, "actual_fantasy_points")
+    if failed_matches:
+        with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
+            for match_id, status in failed_matches:
+                file.write(f"{status}, {match_id}, None, None\n")
+    output_df = output_df[output_columns]
     output_df.to_csv(output_file, index=False)
 
     print(f"Dream Team details saved to {output_file}")
@@ -1172,34 +1051,8 @@ def evaluate_model_test(end_training_date, end_testing_date):
     predicted_df = pd.read_csv(predicted_file)
     actual_df = pd.read_csv(actual_file)
 
-    # Initialize list to store the summary for each match_id
-    summary_data = []
-
-    
-
-    # Iterate through the unique match IDs
-    for match_id in predicted_df['match_id'].unique():
-        # Get the predicted dream team for the current match_id
-        predicted_team = predicted_df[predicted_df['match_id'] == match_id]
-
-        # Get the actual dream team for the current match_id
-        actual_team = actual_df[actual_df['match_id'] == match_id]
-
-        # Calculate the sum of actual and predicted points for both teams
-        predicted_team_points = calculate_team_points(predicted_team)
-        actual_team_points_predicted = calculate_team_points(actual_team)
-        
-        # Add the match summary to the summary_data list
-        summary_data.append({
-            'match_id': match_id,
-            'sum_predicted_points_predicted_team': predicted_team_points,
-            'sum_predicted_points_actual_team': actual_team_points_predicted,
-            'sum_actual_points_predicted_team': predicted_team['actual_fantasy_points'].sum(),
-            'sum_actual_points_actual_team': actual_team['actual_fantasy_points'].sum()
-        })
-
-    # Create a DataFrame from the summary_data
-    summary_df = pd.DataFrame(summary_data)
+    # Summarize every match with grouped sums
+    summary_df = summarize_dream_teams(predicted_df, actual_df)
 
     # Write the summary data to a CSV file
     summary_df.to_csv(output_file, index=False)
@@ -1402,8 +1255,7 @@ def evaluate_model_t20(end_training_date, end_testing_date):
 
     # Ensure the model file exists
     if os.path.exists(model_file_path):
-        with open(model_file_path, 'rb') as f:
-            model = pickle.load(f)
+        model = model_registry.get("T20", model_file_path)
         print("Model loaded successfully!")
     else:
         print(f"Model file not found at: {model_file_path}")
@@ -1413,11 +1265,8 @@ def evaluate_model_t20(end_training_date, end_testing_date):
     X_test = merged_df_test.drop(columns=columns_to_drop)
     y_test = merged_df_test['fantasy_points']
 
-    scaler = StandardScaler()
-    X_test_scaled = scaler.fit_transform(X_test)
-
-    # Use the trained model to make predictions on the test data
-    y_pred = model.predict(X_test_scaled)
+    # Use the trained model and its training-time scaler to make predictions on the test data
+    y_pred = predict_with_artifact(model, X_test)
 
     # Create a new DataFrame with the necessary columns
     predictions_df = merged_df_test[['match_id', 'player_id', 'player_name', 'fantasy_points', 'role', 'team_name','date']].copy()
@@ -1451,45 +1300,13 @@ def evaluate_model_t20(end_training_date, end_testing_date):
     # Read Data
     data = pd.read_csv(input_file)
 
-    # Prepare Output Data
-    output_data = []
-    # Process Matches
-    i = 1
-    for match_id, match_group in data.groupby("match_id"):
-        # Extract necessary columns (including date)
-        players = match_group[['match_id', 'date', 'player_id', 'player_name', 'actual_fantasy_points', 'role', 'team_name', 'predicted_fantasy_points']].to_dict(orient="records")
-        match_date = match_group['date'].iloc[0]  # Extract the date for the match
-
-        # Calculate Dream Team
-        selected_team, status = calculate_dream_team_predicted(players)
-
-        if selected_team is None or len(selected_team) != 11:
-            # If selected_team is None or doesn't have exactly 11 players, log the error
-            with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
-                file.write(f"{status}, {match_id}, {len(selected_team) if selected_team else 'None'}, {selected_team if selected_team else 'None'}\n")
-            i += 1
-            continue
-
-        # Prepare Row for Output
-        for player in selected_team:
-            row = [
-                match_id,
-                match_date,
-                player["player_id"],
-                player["player_name"],
-                player["actual_fantasy_points"],
-                player["role"],
-                player["team_name"],
-                player["predicted_fantasy_points"]
-            ]
-            output_data.append(row)
-
-        if i % 100 == 0:
-            print(f"Processed {i} matches...")
-        i += 1
-
-    # Write Output to CSV
-    output_df = pd.DataFrame(output_data, columns=output_columns)
+    # Pick every match's dream team in one grouped pass
+    output_df, failed_matches = select_dream_teams(data, "predicted_fantasy_points")
+    if failed_matches:
+        with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
+            for match_id, status in failed_matches:
+                file.write(f"{status}, {match_id}, None, None\n")
+    output_df = output_df[output_columns]
     output_df.to_csv(output_file, index=False)
 
     print(f"Dream Team details saved to {output_file}")
@@ -1508,46 +1325,13 @@ def evaluate_model_t20(end_training_date, end_testing_date):
     # Read Data
     data = pd.read_csv(input_file)
 
-    # Prepare Output Data
-    output_data = []
-
-    # Process Matches
-    i = 1
-    for match_id, match_group in data.groupby("match_id"):
-        # Extract necessary columns (including date)
-        players = match_group[['match_id', 'date', 'player_id', 'player_name', 'actual_fantasy_points', 'role', 'team_name', 'predicted_fantasy_points']].to_dict(orient="records")
-        match_date = match_group['date'].iloc[0]  # Extract the date for the match
-
-        # Calculate Dream Team
-        selected_team, status = calculate_dream_team_actual(players)
-
-        if selected_team is None or len(selected_team) != 11:
-            # If selected_team is None or doesn't have exactly 11 players, log the error
-            with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
-                file.write(f"{status}, {match_id}, {len(selected_team) if selected_team else 'None'}, {selected_team if selected_team else 'None'}\n")
-            i += 1
-            continue
-
-        # Prepare Row for Output
-        for player in selected_team:
-            row = [
-                match_id,
-                match_date,
-                player["player_id"],
-                player["player_name"],
-                player["actual_fantasy_points"],
-                player["role"],
-                player["team_name"],
-                player["predicted_fantasy_points"]
-            ]
-            output_data.append(row)
-
-        if i % 100 == 0:
-            print(f"Processed {i} matches...")
-        i += 1
-
-    # Write Output to CSV
-    output_df = pd.DataFrame(output_data, columns=output_columns)
+    # Pick every match's dream team in one grouped pass
+    output_df, failed_matches = select_dream_teams(data, "actual_fantasy_points")
+    if failed_matches:
+        with open("matches_where_team_could_not_be_formed.txt", 'a') as file:
+            for match_id, status in failed_matches:
+                file.write(f"{status}, {match_id}, None, None\n")
+    output_df = output_df[output_columns]
     output_df.to_csv(output_file, index=False)
 
     print(f"Dream Team details saved to {output_file}")
@@ -1563,34 +1347,8 @@ def evaluate_model_t20(end_training_date, end_testing_date):
     predicted_df = pd.read_csv(predicted_file)
     actual_df = pd.read_csv(actual_file)
 
-    # Initialize list to store the summary for each match_id
-    summary_data = []
-
-    
-
-    # Iterate through the unique match IDs
-    for match_id in predicted_df['match_id'].unique():
-        # Get the predicted dream team for the current match_id
-        predicted_team = predicted_df[predicted_df['match_id'] == match_id]
-
-        # Get the actual dream team for the current match_id
-        actual_team = actual_df[actual_df['match_id'] == match_id]
-
-        # Calculate the sum of actual and predicted points for both teams
-        predicted_team_points = calculate_team_points(predicted_team)
-        actual_team_points_predicted = calculate_team_points(actual_team)
-        
-        # Add the match summary to the summary_data list
-        summary_data.append({
-            'match_id': match_id,
-            'sum_predicted_points_predicted_team': predicted_team_points,
-            'sum_predicted_points_actual_team': actual_team_points_predicted,
-            'sum_actual_points_predicted_team': predicted_team['actual_fantasy_points'].sum(),
-            'sum_actual_points_actual_team': actual_team['actual_fantasy_points'].sum()
-        })
-
-    # Create a DataFrame from the summary_data
-    summary_df = pd.DataFrame(summary_data)
+    # Summarize every match with grouped sums
+    summary_df = summarize_dream_teams(predicted_df, actual_df)
 
     # Write the summary data to a CSV file
     summary_df.to_csv(output_file, index=False)
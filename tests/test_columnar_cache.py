@@ -0,0 +1,67 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model import columnar_cache
+from model.columnar_cache import (append_columnar_cache, build_columnar_caches, cache_path, is_cache_fresh,
+                                  read_table, write_columnar_cache)
+
+pytest.importorskip('pyarrow')
+
+IDS_AS_TEXT = {'match_id': 'string', 'player_id': 'string'}
+
+
+@pytest.fixture
+def table(tmp_path):
+    # A small processed table, with an id that only survives as text
+    csv_path = str(tmp_path / 'career_test.csv')
+    pd.DataFrame({
+        'match_id': [1, 2, 3],
+        'player_id': ['01234567', 'ab12cd34', '0000ffff'],
+        'runs': [10, 0, 57],
+        'average': [10.0, 0.5, 28.5],
+        'date': ['2024-01-02', '2024-01-03', '2024-01-05'],
+    }).to_csv(csv_path, index=False)
+    return csv_path
+
+
+def read_cached(monkeypatch, csv_path, **options):
+    # read_table with the CSV out of reach, so the table can only come from the cache
+    with monkeypatch.context() as patch:
+        patch.setattr(columnar_cache.pd, 'read_csv', lambda *args, **kwargs: pytest.fail('read the CSV'))
+        return read_table(csv_path, **options)
+
+
+def test_reads_do_not_write_a_cache(table):
+    read_table(table, dtype={'player_id': 'string'})
+    read_table(table, usecols=['match_id'])
+    assert not os.path.exists(cache_path(table))
+
+
+def test_cache_serves_every_caller_what_the_csv_gives(table, monkeypatch):
+    build_columnar_caches(os.path.dirname(table))
+    assert is_cache_fresh(table)
+    for options in ({'dtype': IDS_AS_TEXT},
+                    {'dtype': {**IDS_AS_TEXT, 'player_id': str, 'runs': 'float64'}, 'parse_dates': ['date']}):
+        expected = pd.read_csv(table, **options)
+        pd.testing.assert_frame_equal(read_cached(monkeypatch, table, **options), expected, check_dtype=False)
+    # Without the ids as text the CSV is read, whose ids are numbers where they look like numbers
+    pd.testing.assert_frame_equal(read_table(table), pd.read_csv(table))
+    # A read with other pd.read_csv options is not served from the cache, nor changes what the next read gets
+    assert read_table(table, usecols=['runs']).columns.tolist() == ['runs']
+    assert read_table(table).columns.tolist() == ['match_id', 'player_id', 'runs', 'average', 'date']
+
+
+def test_appended_rows_extend_the_cache(table, monkeypatch):
+    df = pd.read_csv(table, dtype=IDS_AS_TEXT)
+    write_columnar_cache(table, df)
+    rows = pd.DataFrame({'match_id': [4], 'player_id': ['00000001'], 'runs': [3], 'average': [1.5],
+                         'date': pd.to_datetime(['2024-01-09'])})
+    was_fresh = is_cache_fresh(table)
+    rows.to_csv(table, mode='a', header=False, index=False)
+    assert not is_cache_fresh(table)
+    append_columnar_cache(table, rows, was_fresh)
+    assert is_cache_fresh(table)
+    pd.testing.assert_frame_equal(read_cached(monkeypatch, table, dtype=IDS_AS_TEXT), pd.read_csv(table, dtype=IDS_AS_TEXT))
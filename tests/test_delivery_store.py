@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+import zipfile
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.H2H import H2H
+from data_processing.MatchWise import MatchWise
+from data_processing.PlayerStats import Overall_PlayerStats
+from data_processing.delivery_aggregation import H2H_from_store, MatchWise_from_store, Overall_PlayerStats_from_store
+from data_processing.delivery_store import build_delivery_store, load_delivery_store, update_delivery_store
+
+ARCHIVE = os.path.join(os.path.dirname(__file__), '../ipl_json.zip')
+FORMATS = ['ODI', 'T20', 'Test']
+
+
+def write_matches(json_dir, names, match_types=None):
+    # IPL matches from the shipped archive, some relabelled so that every format has matches
+    with zipfile.ZipFile(ARCHIVE) as archive:
+        for name in names:
+            match_data = json.loads(archive.read(name))
+            if match_types and name in match_types:
+                match_data['info']['match_type'] = match_types[name]
+            with open(os.path.join(json_dir, name), 'w') as f:
+                json.dump(match_data, f)
+
+
+@pytest.fixture
+def json_dir(tmp_path):
+    with zipfile.ZipFile(ARCHIVE) as archive:
+        names = [name for name in archive.namelist() if name.endswith('.json')]
+    json_dir = tmp_path / 'json'
+    json_dir.mkdir()
+    match_types = {name: match_type for name, match_type in zip(names[::7], ['ODI', 'ODM', 'Test', 'MDM'] * 3)}
+    write_matches(str(json_dir), names[:40], match_types)
+    return str(json_dir), names
+
+
+def store_outputs(store_dir, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    MatchWise_from_store(store_dir, {fmt: os.path.join(out_dir, f'{fmt}_MatchWise.csv') for fmt in FORMATS})
+    H2H_from_store(store_dir, {fmt: os.path.join(out_dir, f'{fmt}_H2H.csv') for fmt in FORMATS})
+    Overall_PlayerStats_from_store(store_dir, os.path.join(out_dir, 'Overall_PlayerStats.csv'))
+
+
+def walker_outputs(json_dir, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    MatchWise(json_dir, {fmt: os.path.join(out_dir, f'{fmt}_MatchWise.csv') for fmt in FORMATS})
+    H2H(json_dir, {fmt: os.path.join(out_dir, f'{fmt}_H2H.csv') for fmt in FORMATS})
+    Overall_PlayerStats(json_dir, os.path.join(out_dir, 'Overall_PlayerStats.csv'))
+
+
+def test_store_outputs_match_the_json_walkers(json_dir, tmp_path):
+    json_dir, _ = json_dir
+    update_delivery_store(json_dir, str(tmp_path / 'store'))
+    store_outputs(str(tmp_path / 'store'), str(tmp_path / 'from_store'))
+    walker_outputs(json_dir, str(tmp_path / 'walked'))
+    for file_name in sorted(os.listdir(tmp_path / 'walked')):
+        with open(tmp_path / 'walked' / file_name, 'rb') as walked, open(tmp_path / 'from_store' / file_name, 'rb') as stored:
+            assert stored.read() == walked.read(), file_name
+
+
+def test_update_parses_only_new_and_changed_files(json_dir, tmp_path):
+    json_dir, names = json_dir
+    store_dir = str(tmp_path / 'store')
+    assert update_delivery_store(json_dir, store_dir) == {'parsed': 40, 'dropped': 0, 'kept': 0}
+
+    # Nothing changed: the store is not rewritten
+    mtime = os.stat(os.path.join(store_dir, 'deliveries.feather')).st_mtime_ns
+    assert update_delivery_store(json_dir, store_dir) == {'parsed': 0, 'dropped': 0, 'kept': 40}
+    assert os.stat(os.path.join(store_dir, 'deliveries.feather')).st_mtime_ns == mtime
+
+    # New files, a deleted one and one whose content changed
+    write_matches(json_dir, names[40:60])
+    os.remove(os.path.join(json_dir, names[3]))
+    with open(os.path.join(json_dir, names[5])) as f:
+        match_data = json.load(f)
+    match_data['innings'][0]['overs'][0]['deliveries'][0]['runs'] = {'batter': 6, 'extras': 0, 'total': 6}
+    with open(os.path.join(json_dir, names[5]), 'w') as f:
+        json.dump(match_data, f)
+    assert update_delivery_store(json_dir, store_dir) == {'parsed': 21, 'dropped': 2, 'kept': 38}
+
+    # The same matches as a rebuild, the new ones last
+    build_delivery_store(json_dir, str(tmp_path / 'rebuilt'))
+    updated = load_delivery_store(store_dir, ['matches'])['matches']
+    rebuilt = load_delivery_store(str(tmp_path / 'rebuilt'), ['matches'])['matches']
+    assert sorted(updated['file']) == sorted(rebuilt['file'])
+    assert updated['file'].tolist()[-21:] == [name for name in os.listdir(json_dir) if name in set(names[40:60]) | {names[5]}]
+
+    store_outputs(store_dir, str(tmp_path / 'from_store'))
+    walker_outputs(json_dir, str(tmp_path / 'walked'))
+    for file_name in sorted(os.listdir(tmp_path / 'walked')):
+        stored = pd.read_csv(tmp_path / 'from_store' / file_name, dtype=str, keep_default_na=False)
+        walked = pd.read_csv(tmp_path / 'walked' / file_name, dtype=str, keep_default_na=False)
+        sort = lambda df: df.sort_values(list(df.columns)).reset_index(drop=True)
+        pd.testing.assert_frame_equal(sort(stored), sort(walked), obj=file_name)
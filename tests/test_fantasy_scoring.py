@@ -0,0 +1,75 @@
+import os
+import sys
+import copy
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing import fantasy_points_odi, fantasy_points_t20, fantasy_points_test
+from data_processing.fantasy_scoring import DREAM11_RULES, ODI_TYPES, compile_scoring, fantasy_points
+
+
+@pytest.fixture(scope='module')
+def rows():
+    """
+    Random MatchWise rows of every match type, with runs and runs conceded drawn densely around every strike rate
+    and economy band edge (and one either side) as well as at random.
+    """
+    rng = np.random.default_rng(0)
+    row_count = 20_000
+    balls_faced = rng.integers(0, 80, row_count)
+    balls_bowled = rng.choice([0, 6, 11, 12, 13, 24, 60, 120, 300], row_count)
+    edge_strike_rates = np.array([30, 40, 50, 60, 70, 100, 120, 130, 140, 150, 170])
+    edge_runs = np.rint(balls_faced * rng.choice(edge_strike_rates, row_count) / 100).astype(np.int64) + rng.integers(-1, 2, row_count)
+    runs = np.where(rng.random(row_count) < 0.5, edge_runs, rng.integers(0, 160, row_count)).clip(0)
+    edge_economy = np.array([2.5, 3.5, 4.5, 5, 6, 7, 8, 9, 10, 11, 12])
+    edge_conceded = np.rint(balls_bowled / 6 * rng.choice(edge_economy, row_count)).astype(np.int64) + rng.integers(-1, 2, row_count)
+    return pd.DataFrame({
+        'runs_scored': runs,
+        'balls_faced': balls_faced,
+        'no_of_fours': rng.integers(0, 10, row_count),
+        'no_of_sixes': rng.integers(0, 8, row_count),
+        'no_of_catches': rng.integers(0, 4, row_count),
+        'runouts': rng.integers(0, 3, row_count),
+        'balls_bowled': balls_bowled,
+        'wickets': rng.integers(0, 8, row_count),
+        'LBWs/Bowled': rng.integers(0, 3, row_count),
+        'runs_conceded': np.where(rng.random(row_count) < 0.5, edge_conceded, rng.integers(0, 90, row_count)).clip(0),
+        'stumpings': rng.integers(0, 2, row_count),
+        'out': rng.choice(['out', 'not out', 'DNB'], row_count),
+        'match_type': rng.choice(['T20', 'IT20', 'ODI', 'ODM', 'Test', 'MDM'], row_count),
+    })
+
+
+@pytest.mark.parametrize('module', [fantasy_points_t20, fantasy_points_odi, fantasy_points_test])
+def test_column_wise_scores_match_calculate_fantasy_points(rows, module):
+    expected = rows.apply(module.calculate_fantasy_points, axis=1)
+    scored = fantasy_points(rows)
+    assert scored.dtype == expected.dtype
+    mismatches = rows[scored != expected]
+    assert mismatches.empty, mismatches.assign(expected=expected, scored=scored).head()
+
+
+def test_rows_without_out_column_score_as_test_matches(rows):
+    # Test tables have no 'out' column
+    test_rows = rows[rows['match_type'].isin(['Test', 'MDM'])].drop(columns='out')
+    assert (fantasy_points(test_rows) == test_rows.apply(fantasy_points_test.calculate_fantasy_points, axis=1)).all()
+
+
+def test_rule_sets_scored_in_one_pass_match_one_at_a_time(rows):
+    # Rule variants: ODM economy bands, and doubled boundary points
+    with_odm_economy = copy.deepcopy(DREAM11_RULES)
+    for band in with_odm_economy['bands']:
+        if band['match_types'] == ('ODI',):
+            band['match_types'] = ODI_TYPES
+    boundary_boost = copy.deepcopy(DREAM11_RULES)
+    boundary_boost['per_unit'].update({'no_of_fours': 2, 'no_of_sixes': 4})
+    rule_sets = {'dream11': DREAM11_RULES, 'odm_economy': with_odm_economy, 'boundary_boost': boundary_boost}
+
+    scores = compile_scoring(rule_sets)(rows)
+    assert scores['dream11'].equals(fantasy_points(rows).rename('dream11'))
+    for name, rules in rule_sets.items():
+        assert scores[name].equals(compile_scoring({name: rules})(rows)[name]), name
+    assert (scores['odm_economy'] != scores['dream11']).any()
+    assert (scores['boundary_boost'] >= scores['dream11']).all()
@@ -0,0 +1,301 @@
+import io
+import os
+import sys
+import contextlib
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing import ODI, T20, Test
+from data_processing.feature_builder import (FEATURE_BUILDERS, FEATURE_KINDS, FORM_DAY_HALFLIVES, FORM_MATCH_HALFLIVES,
+                                             RECENT_WINDOW, TABLE_KINDS, build_feature_table, build_feature_tables,
+                                             feature_columns, form_columns, form_features, form_values, load_matchwise,
+                                             prior_sums, recent_features, update_feature_tables, window_sums)
+from model.columnar_cache import is_cache_fresh, read_table
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), '../data/processed/Test')
+DESIGNATION_FILE = os.path.join(DATA_DIR, 'Designation.csv')
+FORMATS = ('ODI', 'T20', 'Test')
+REFERENCE_MODULES = {'ODI': ODI, 'T20': T20, 'Test': Test}
+
+
+def matchwise_file(format_name):
+    """
+    The small MatchWise fantasy points CSV of a format shipped with the tests: every match of one team, with
+    players both in and outside the registry.
+    """
+    return os.path.join(DATA_DIR, f'{format_name}_MatchWise_fantasy_points.csv')
+
+
+def assert_same_table(actual_csv, expected_csv):
+    """
+    Asserts two feature CSVs hold the same rows and values. The iterrows builders start their rate columns as the
+    integer 0, so under pandas 2 a column that never gets a fractional value is written as 0 rather than 0.0;
+    values are compared exactly but not their dtypes.
+    """
+    actual = pd.read_csv(actual_csv, float_precision='round_trip')
+    expected = pd.read_csv(expected_csv, float_precision='round_trip')
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_exact=True)
+
+
+def quietly(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def iterrows_ordered_file(format_name, tmp_path):
+    """
+    The shipped MatchWise rows of a format written in the order the *_iterrows builders accumulate them in: their
+    unstable date sort moves rows within a day. Each day of these rows holds one match, so the (date, match_id) sort
+    of the vectorized builders keeps this order.
+    """
+    matchwise = pd.read_csv(matchwise_file(format_name), low_memory=False)
+    order = matchwise.assign(date=pd.to_datetime(matchwise['date'])).sort_values(by='date').index
+    path = tmp_path / 'matchwise_iterrows_order.csv'
+    matchwise.loc[order].to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('kind', FEATURE_KINDS)
+@pytest.mark.parametrize('format_name', FORMATS)
+def test_vectorized_builders_match_iterrows(format_name, kind, tmp_path):
+    # tests/data/<kind>_<format>_iterrows.csv were written by the *_iterrows builders (under pandas 2)
+    output = tmp_path / f'{kind}.csv'
+    quietly(build_feature_table, kind, format_name, iterrows_ordered_file(format_name, tmp_path), str(output))
+    assert_same_table(output, os.path.join(DATA_DIR, f'{kind}_{format_name}_iterrows.csv'))
+
+
+@pytest.mark.skipif(int(pd.__version__.split('.')[0]) >= 3,
+                    reason="the iterrows builders set float rates in integer columns, which pandas 3 rejects")
+@pytest.mark.parametrize('kind', FEATURE_KINDS)
+@pytest.mark.parametrize('format_name', FORMATS)
+def test_iterrows_builders_write_the_shipped_tables(format_name, kind, tmp_path):
+    output = tmp_path / f'{kind}.csv'
+    quietly(getattr(REFERENCE_MODULES[format_name], f'{kind}_{format_name}_iterrows'), matchwise_file(format_name), str(output))
+    assert_same_table(output, os.path.join(DATA_DIR, f'{kind}_{format_name}_iterrows.csv'))
+
+
+@pytest.mark.parametrize('format_name', FORMATS)
+def test_fused_build_matches_single_builds(format_name, tmp_path):
+    # The fused build writes the same three tables from a single read and sort
+    fused = {kind: str(tmp_path / f'{kind}_fused.csv') for kind in FEATURE_KINDS}
+    quietly(build_feature_tables, format_name, matchwise_file(format_name), fused)
+    for kind, path in fused.items():
+        single = tmp_path / f'{kind}.csv'
+        quietly(build_feature_table, kind, format_name, matchwise_file(format_name), str(single))
+        assert single.read_bytes() == open(path, 'rb').read(), kind
+
+
+@pytest.mark.parametrize('format_name', FORMATS)
+def test_recent_windows_in_one_pass_match_one_at_a_time(format_name):
+    df = load_matchwise(matchwise_file(format_name))
+    single = [recent_features(df, format_name, (window,)) for window in (3, 5, 10)]
+    assert recent_features(df, format_name, (3, 5, 10)).equals(pd.concat(single, axis=1))
+
+
+def form_reference(df):
+    """
+    Pre-match form features of every row, one row at a time over a dict of per-player state, laid out as the
+    form_columns().
+    """
+    state = {}
+    out = []
+    match_values, days = form_values(df)
+    # Missing player ids compare unequal, so players are keyed by their factorized codes
+    codes = pd.factorize(df['player_id'], use_na_sentinel=False)[0]
+    for player, day, values in zip(codes, days.tolist(), match_values.tolist()):
+        sums, weights, last_day = state.get(player, ({}, {}, None))
+        row = []
+        for halflife in FORM_MATCH_HALFLIVES:
+            weight = weights.get(('m', halflife), 0.)
+            row += [s / weight if weight > 0 else 0. for s in sums.get(('m', halflife), [0.] * len(values))]
+        for halflife in FORM_DAY_HALFLIVES:
+            weight = weights.get(('d', halflife), 0.)
+            decay = 2 ** (-(day - last_day) / halflife) if last_day is not None else 0.
+            row += [s / weight if weight > 0 else 0. for s in sums.get(('d', halflife), [0.] * len(values))]
+            row.append(weight * decay)
+        out.append(row)
+        for halflife in FORM_MATCH_HALFLIVES:
+            decay = 2 ** (-1 / halflife)
+            key = ('m', halflife)
+            sums[key] = [s * decay + v for s, v in zip(sums.get(key, [0.] * len(values)), values)]
+            weights[key] = weights.get(key, 0.) * decay + 1
+        for halflife in FORM_DAY_HALFLIVES:
+            decay = 2 ** (-(day - last_day) / halflife) if last_day is not None else 0.
+            key = ('d', halflife)
+            sums[key] = [s * decay + v for s, v in zip(sums.get(key, [0.] * len(values)), values)]
+            weights[key] = weights.get(key, 0.) * decay + 1
+        state[player] = (sums, weights, day)
+    return np.array(out)
+
+
+@pytest.mark.parametrize('format_name', FORMATS)
+def test_form_features_match_row_at_a_time_recurrence(format_name):
+    df = load_matchwise(matchwise_file(format_name))
+    form = form_features(df, format_name)
+    assert form.columns.tolist() == form_columns(format_name)
+    assert np.allclose(form.to_numpy(), form_reference(df), rtol=1e-12, atol=1e-9)
+
+
+def date_batches(format_name):
+    """
+    The shipped MatchWise rows of a format split by date into three batches: the first eight days, the next two and
+    the rest.
+    """
+    matchwise = pd.read_csv(matchwise_file(format_name), low_memory=False)
+    day = matchwise['date'].rank(method='dense')
+    return [matchwise[day <= 8], matchwise[(day > 8) & (day <= 10)], matchwise[day > 10]]
+
+
+def assert_same_tables(updated, rebuilt):
+    # Tables brought up to date by updates hold the bytes of tables built from scratch, and fresh columnar caches
+    for kind in updated:
+        assert open(updated[kind], 'rb').read() == open(rebuilt[kind], 'rb').read(), kind
+        assert is_cache_fresh(updated[kind]), kind
+        pd.testing.assert_frame_equal(read_table(updated[kind]), read_table(rebuilt[kind]), obj=kind)
+
+
+def build_checkpointed(format_name, tmp_path, rows):
+    # Tables and a checkpoint built on rows, in tmp_path
+    input_file = str(tmp_path / 'matchwise.csv')
+    rows.to_csv(input_file, index=False)
+    output_files = {kind: str(tmp_path / f'{kind}_updated.csv') for kind in TABLE_KINDS + ('player_match',)}
+    checkpoint_file = str(tmp_path / 'features.ckpt')
+    quietly(build_feature_tables, format_name, input_file, output_files, DESIGNATION_FILE, checkpoint_file=checkpoint_file)
+    return input_file, output_files, checkpoint_file
+
+
+def rebuild(format_name, tmp_path, input_file, output_files):
+    rebuilt = {kind: str(tmp_path / f'{kind}_rebuilt.csv') for kind in output_files}
+    quietly(build_feature_tables, format_name, input_file, rebuilt, DESIGNATION_FILE)
+    return rebuilt
+
+
+def update(format_name, input_file, output_files, checkpoint_file):
+    return quietly(update_feature_tables, format_name, input_file, output_files, checkpoint_file, DESIGNATION_FILE)
+
+
+@pytest.mark.parametrize('format_name', FORMATS)
+def test_update_from_checkpoint_matches_rebuild(format_name, tmp_path):
+    # Tables built on the earlier matches and updated with two later batches are the tables built on all
+    batches = date_batches(format_name)
+    input_file, updated, checkpoint_file = build_checkpointed(format_name, tmp_path, batches[0])
+    for batch in batches[1:]:
+        batch.to_csv(input_file, mode='a', header=False, index=False)
+        assert update(format_name, input_file, updated, checkpoint_file) == len(batch)
+    assert update(format_name, input_file, updated, checkpoint_file) == 0
+    assert_same_tables(updated, rebuild(format_name, tmp_path, input_file, updated))
+
+
+def redated(rows, date):
+    # The rows of a match moved to another day
+    return rows.assign(date=date)
+
+
+def test_update_appends_later_matches_of_the_last_day(tmp_path):
+    # A match of the last checkpointed day with a higher match_id sorts after every checkpointed row
+    batches = date_batches('T20')
+    input_file, updated, checkpoint_file = build_checkpointed('T20', tmp_path, batches[0])
+    first = batches[1][batches[1]['match_id'] == batches[1]['match_id'].iloc[0]]
+    redated(first, batches[0]['date'].max()).to_csv(input_file, mode='a', header=False, index=False)
+    assert update('T20', input_file, updated, checkpoint_file) == len(first)
+    assert_same_tables(updated, rebuild('T20', tmp_path, input_file, updated))
+
+    batches[2].to_csv(input_file, mode='a', header=False, index=False)
+    assert update('T20', input_file, updated, checkpoint_file) == len(batches[2])
+    assert_same_tables(updated, rebuild('T20', tmp_path, input_file, updated))
+
+
+@pytest.mark.parametrize('change', ['late_match', 'inserted_match', 'removed_match'])
+def test_update_rewrites_tables_from_the_first_changed_day(change, tmp_path):
+    batches = date_batches('T20')
+    input_file, updated, checkpoint_file = build_checkpointed('T20', tmp_path, batches[0])
+    days = sorted(batches[0]['date'].unique())
+    late = redated(batches[1][batches[1]['match_id'] == batches[1]['match_id'].iloc[0]], days[3])
+    if change == 'late_match':
+        # Appended at the end of the CSV, though it sorts among the checkpointed rows
+        late.to_csv(input_file, mode='a', header=False, index=False)
+        changed_day = days[3]
+    elif change == 'inserted_match':
+        # The CSV rewritten in sorted order, as add_fantasy_points writes it
+        rows = pd.concat([batches[0], late]).sort_values(by=['date', 'match_id'])
+        rows.to_csv(input_file, index=False)
+        changed_day = days[3]
+    else:
+        rows = batches[0][batches[0]['date'] != days[4]]
+        rows.to_csv(input_file, index=False)
+        changed_day = days[4]
+    rows = pd.read_csv(input_file)
+    assert update('T20', input_file, updated, checkpoint_file) == (rows['date'] >= changed_day).sum()
+    assert_same_tables(updated, rebuild('T20', tmp_path, input_file, updated))
+
+    # The checkpoint carries on past the rewrite
+    batches[2].to_csv(input_file, mode='a', header=False, index=False)
+    assert update('T20', input_file, updated, checkpoint_file) == len(batches[2])
+    assert_same_tables(updated, rebuild('T20', tmp_path, input_file, updated))
+
+
+@pytest.mark.parametrize('change', ['first_day', 'appended_table'])
+def test_update_rejects_what_it_cannot_rewrite_from_a_day(change, tmp_path):
+    batches = date_batches('T20')
+    input_file, output_files, checkpoint_file = build_checkpointed('T20', tmp_path, batches[0])
+    if change == 'first_day':
+        # A match removed from the first day, with a later one appended
+        rows = pd.concat([batches[0], batches[1]])
+        rows[rows['match_id'] != rows['match_id'].iloc[0]].to_csv(input_file, index=False)
+    else:
+        # A table appended to after the checkpoint was saved, as by an update that stopped part way
+        batches[1].head(1).to_csv(output_files['career'], mode='a', header=False, index=False)
+        batches[1].to_csv(input_file, mode='a', header=False, index=False)
+    checkpoint = open(checkpoint_file, 'rb').read()
+    with pytest.raises(ValueError):
+        update('T20', input_file, output_files, checkpoint_file)
+    assert open(checkpoint_file, 'rb').read() == checkpoint
+
+
+def test_shipped_test_samples_are_reproduced():
+    # data/processed/Test holds career, recent and venue tables but not the MatchWise rows they were built from.
+    # A match's stats are the step from its career row to the player's next one (the last match feeds no feature).
+    tables = {kind: pd.read_csv(os.path.join(SAMPLES_DIR, f'{kind}_test.csv'), float_precision='round_trip')
+              for kind in FEATURE_KINDS}
+    career = tables['career']
+    for kind, table in tables.items():
+        assert table.columns.tolist() == ['match_id', 'player_id'] + feature_columns(kind, 'Test'), kind
+        assert table[['match_id', 'player_id']].equals(career[['match_id', 'player_id']]), kind
+
+    def match_stat(cumulative):
+        return (cumulative.groupby(career['player_id'], sort=False).shift(-1) - cumulative).fillna(0).astype(np.int64)
+
+    wickets_before = career['career_bowler_wickets_test']
+    matches = pd.read_csv(os.path.join(SAMPLES_DIR, 'player_match_data_test.csv')).drop_duplicates('match_id')
+    matches = matches.set_index('match_id')
+    df = pd.DataFrame({
+        'match_id': career['match_id'], 'player_id': career['player_id'],
+        'runs_scored': match_stat(career['career_batsman_total_runs_test']), 'balls_faced': 0,
+        'no_of_fours': match_stat(career['career_batsman_total_fours_test']),
+        'no_of_sixes': match_stat(career['career_batsman_total_sixes_test']),
+        'no_of_catches': match_stat(career['career_fielder_total_catches_test']),
+        'runouts': match_stat(career['career_fielder_total_runouts_test']), 'balls_bowled': 0,
+        'wickets': match_stat(wickets_before),
+        'runs_conceded': match_stat(np.rint(career['career_bowler_average_test'] * wickets_before)),
+        'date': pd.to_datetime(career['match_id'].map(matches['date'])),
+        'venue': career['match_id'].map(matches['venue']),
+    })
+
+    # Runs conceded are only known once the bowler has a wicket (average * wickets); until then they are lumped into
+    # the match that brings the first one, so bowling averages over windows covering such matches are not compared
+    wickets_after = wickets_before.groupby(career['player_id'], sort=False).shift(-1)
+    unknown = (wickets_after == 0) | ((wickets_before == 0) & career['player_id'].duplicated())
+    unknown = pd.DataFrame({'matches': unknown.astype(np.int64)})
+    unknown_before = {
+        'career': unknown['matches'] * 0,
+        'recent': window_sums(unknown, [df['player_id']], RECENT_WINDOW)['matches'],
+        'venue': prior_sums(unknown, [df['player_id'], df['venue']])['matches'],
+    }
+    for kind, table in tables.items():
+        features = FEATURE_BUILDERS[kind](df, 'Test')
+        for column in features.columns:
+            compared = (unknown_before[kind] == 0) if column.endswith('bowler_average_test') else slice(None)
+            assert (features[column][compared].to_numpy() == table[column][compared].to_numpy()).all(), column
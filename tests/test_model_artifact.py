@@ -0,0 +1,48 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import ElasticNet, HuberRegressor, Lasso, LinearRegression, PoissonRegressor, Ridge
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.model_artifact import linear_scorer, make_model_artifact, predict_with_artifact
+
+FEATURE_NAMES = [f'feature_{i}' for i in range(6)]
+
+
+@pytest.fixture(scope='module')
+def features():
+    # Features on very different scales and far from zero, so a wrong mean or scale shows in the scores
+    rng = np.random.default_rng(0)
+    values = rng.normal(loc=[50, 5, 300, 0.5, 20, 1000], scale=[20, 2, 100, 0.2, 5, 300], size=(400, 6))
+    return pd.DataFrame(values, columns=FEATURE_NAMES)
+
+
+def fitted_artifact(features, scaler, model):
+    scaled = scaler.fit_transform(features)
+    points = np.abs(scaled @ np.arange(1, 7) + 40) / 10
+    return make_model_artifact('T20', scaler, model.fit(scaled, points), FEATURE_NAMES)
+
+
+@pytest.mark.parametrize('scaler', [StandardScaler(), StandardScaler(with_mean=False), StandardScaler(with_std=False)],
+                         ids=['standard', 'without_mean', 'without_std'])
+@pytest.mark.parametrize('model', [HuberRegressor(max_iter=500), LinearRegression(), Ridge(), Lasso(alpha=0.01),
+                                   ElasticNet(alpha=0.01)], ids=lambda model: type(model).__name__)
+def test_folded_scores_match_predict(features, scaler, model):
+    artifact = fitted_artifact(features, scaler, model)
+    scorer = linear_scorer(artifact)
+    assert scorer is not None
+    expected = artifact['model'].predict(artifact['scaler'].transform(features))
+    assert np.allclose(scorer.score(features.to_numpy()), expected, rtol=1e-4, atol=1e-2)
+
+
+@pytest.mark.parametrize('scaler, model', [(MinMaxScaler(), HuberRegressor(max_iter=500)),
+                                           (StandardScaler(), PoissonRegressor())],
+                         ids=['min_max_scaler', 'log_link'])
+def test_other_models_are_not_folded(features, scaler, model):
+    artifact = fitted_artifact(features, scaler, model)
+    assert linear_scorer(artifact) is None
+    expected = artifact['model'].predict(artifact['scaler'].transform(features))
+    assert np.allclose(predict_with_artifact(artifact, features), expected)
@@ -0,0 +1,99 @@
+import os
+import sys
+import pickle
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import HuberRegressor, LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_processing.feature_builder import form_columns
+from model import predict_model
+from model.columnar_cache import read_table
+from model.feature_store import FeatureStore, LazyRegistry
+from model.model_artifact import make_model_artifact
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), '../data/processed/Test')
+
+
+@pytest.fixture
+def store_with_form(monkeypatch, tmp_path):
+    """
+    The Test feature store of the shipped sample tables (read from copies, so nothing is written next to the
+    samples), with a form table next to them, served by predict_model.
+    """
+    tables = []
+    for path, dtype in predict_model.FEATURE_TABLES['Test']:
+        sample = tmp_path / os.path.basename(path)
+        shutil.copyfile(os.path.join(SAMPLES_DIR, os.path.basename(path)), sample)
+        tables.append(read_table(str(sample), dtype=dtype))
+    career = tables[0]
+    rng = np.random.default_rng(0)
+    form_data = pd.DataFrame(rng.random((len(career), len(form_columns('Test')))) * 50, columns=form_columns('Test'))
+    form_data.insert(0, 'player_id', career['player_id'].to_numpy())
+    form_data.insert(0, 'match_id', career['match_id'].to_numpy())
+    store = FeatureStore(*tables, form_data=form_data)
+    monkeypatch.setattr(predict_model, 'feature_stores', LazyRegistry(lambda tournament_type: store, ['Test']))
+    return store
+
+
+def save_model(monkeypatch, tmp_path, model, name='model_test'):
+    # The model registry caches by path, so every model gets a file of its own
+    path = tmp_path / f'{name}.pkl'
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+    monkeypatch.setitem(predict_model.MODEL_ARTIFACTS, 'Test', str(path))
+
+
+def last_match_squad(store):
+    # Every player of the last sample match, queried the day after it at the same venue
+    matches = store.player_match_data
+    last = matches[matches['match_id'] == matches['match_id'].iloc[-1]]
+    players = [{'player_id': player_id, 'player_name': player_name}
+               for player_id, player_name in zip(last['player_id'], last['player_name'])]
+    match_date = (pd.Timestamp(last['date'].iloc[0]) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+    return players, match_date, last['venue'].iloc[0]
+
+
+def training_data(store):
+    # Every 20th feature row of the sample tables (which are row-aligned), with points that depend on all the features
+    features = pd.concat([table.iloc[::20, 2:].astype('float64')
+                          for table in (store.career_data, store.recent_data, store.venue_data, store.form_data)], axis=1)
+    weights = np.random.default_rng(1).random(features.shape[1])
+    return features, pd.Series(features.to_numpy() @ weights)
+
+
+def test_bare_regressor_takes_career_recent_and_venue_columns(store_with_form, monkeypatch, tmp_path):
+    # Bare regressors were trained before form features existed; the form table must not change their input width
+    features, points = training_data(store_with_form)
+    base = features[store_with_form.base_feature_names]
+    regressor = HuberRegressor(max_iter=500).fit(StandardScaler().fit_transform(base), points)
+    save_model(monkeypatch, tmp_path, regressor)
+    assert predict_model.model_feature_names('Test', regressor) == store_with_form.base_feature_names
+
+    players_df = predict_model.generate_features_for_all_players_test(*last_match_squad(store_with_form))
+    assert players_df.columns[2:].tolist() == store_with_form.feature_names
+    expected = regressor.predict(StandardScaler().fit_transform(players_df[store_with_form.base_feature_names]))
+    predicted = predict_model.predict_fantasy_points_for_all_players_test(players_df)
+    assert len(predicted) == len(players_df)
+    assert np.allclose(predicted['predicted_fantasy_points'], expected)
+
+
+@pytest.mark.parametrize('with_form', [False, True])
+def test_artifact_takes_its_feature_names(store_with_form, monkeypatch, tmp_path, with_form):
+    features, points = training_data(store_with_form)
+    feature_names = store_with_form.feature_names if with_form else store_with_form.base_feature_names
+    scaler = StandardScaler().fit(features[feature_names])
+    # A linear model is served through the folded scorer, the others through the saved scaler
+    for regressor in (LinearRegression(), HuberRegressor(max_iter=500)):
+        regressor.fit(scaler.transform(features[feature_names]), points)
+        artifact = make_model_artifact('Test', scaler, regressor, feature_names)
+        save_model(monkeypatch, tmp_path, artifact, type(regressor).__name__)
+
+        players_df = predict_model.generate_features_for_all_players_test(*last_match_squad(store_with_form))
+        expected = regressor.predict(scaler.transform(players_df[feature_names]))
+        predicted = predict_model.predict_fantasy_points_for_all_players_test(players_df)
+        assert len(predicted) == len(players_df), type(regressor).__name__
+        assert np.allclose(predicted['predicted_fantasy_points'], expected, rtol=1e-4, atol=1e-3), type(regressor).__name__
@@ -0,0 +1,95 @@
+import os
+import sys
+import math
+import random
+import itertools
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from model.team_optimizer import ROLES, optimal_team_indices, select_dream_team
+
+
+def brute_force(points, roles, teams, team_size, max_per_team, credits, budget):
+    # Best objective over every team that has one player of each role present, fits the side cap and the budget
+    combos = np.array(list(itertools.combinations(range(len(points)), team_size)))
+    feasible = np.ones(len(combos), dtype=bool)
+    for role in set(roles):
+        feasible &= (np.array(roles) == role)[combos].any(axis=1)
+    for team in set(teams):
+        feasible &= (np.array(teams) == team)[combos].sum(axis=1) <= max_per_team
+    if budget is not None:
+        feasible &= np.array(credits)[combos].sum(axis=1) <= budget
+    if not feasible.any():
+        return -math.inf
+    ranked = -np.sort(-np.array(points)[combos[feasible]], axis=1)
+    return (ranked.sum(axis=1) + ranked[:, 0] + 0.5 * ranked[:, 1]).max()
+
+
+def random_pool(rng, n, half_credits):
+    points = [rng.uniform(-10, 120) for _ in range(n)]
+    roles = [rng.choice(ROLES) for _ in range(n)]
+    teams = [rng.choice(['A', 'B']) for _ in range(n)]
+    # Dream11 credits come in half steps; arbitrary floats exercise the bound's coarser credit units
+    credits = [rng.randrange(14, 23) / 2 if half_credits else rng.uniform(7, 11) for _ in range(n)]
+    return points, roles, teams, credits
+
+
+def pool_budget(rng, credits, team_size, budget_kind):
+    if budget_kind == 'none':
+        return None
+    if budget_kind == 'loose':
+        return 9.5 * team_size
+    # Between the cheapest possible team and a little above it, where the budget decides the team
+    return sum(sorted(credits)[:team_size]) + rng.uniform(0, 1.5) * team_size
+
+
+def assert_matches_brute_force(seed, n, team_size, budget_kind):
+    rng = random.Random(seed)
+    points, roles, teams, credits = random_pool(rng, n, seed % 2 == 0)
+    budget = pool_budget(rng, credits, team_size, budget_kind)
+    max_per_team = rng.randint(team_size // 2 + 1, team_size)
+    indices = optimal_team_indices(points, roles, teams, team_size=team_size, max_per_team=max_per_team,
+                                   credits=credits, budget=budget)
+    expected = brute_force(points, roles, teams, team_size, max_per_team, credits, budget)
+    if indices is None:
+        assert expected == -math.inf
+        return
+    ranked = [points[i] for i in indices]
+    assert ranked == sorted(ranked, reverse=True)
+    assert budget is None or sum(credits[i] for i in indices) <= budget
+    assert max(sum(teams[i] == team for i in indices) for team in set(teams)) <= max_per_team
+    assert sum(ranked) + ranked[0] + 0.5 * ranked[1] == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize('budget_kind', ['none', 'loose', 'tight'])
+def test_small_pools_match_brute_force(budget_kind):
+    for seed in range(100):
+        n = random.Random(seed).randint(6, 13)
+        assert_matches_brute_force(seed, n, random.Random(-seed).randint(4, min(n, 7)), budget_kind)
+
+
+@pytest.mark.parametrize('team_size', [4, 5])
+@pytest.mark.parametrize('budget_kind', ['none', 'loose', 'tight'])
+def test_large_pools_match_brute_force(team_size, budget_kind):
+    for seed in range(5):
+        assert_matches_brute_force(seed, 30, team_size, budget_kind)
+
+
+def test_infeasible_constraints():
+    points, roles, teams, credits = random_pool(random.Random(0), 22, True)
+    # More role minimums than slots, a budget below the cheapest team, and a side cap no split of 11 can meet
+    assert optimal_team_indices(points, roles, teams, role_limits={role: (3, 11) for role in ROLES}) is None
+    assert optimal_team_indices(points, roles, teams, credits=credits, budget=sum(sorted(credits)[:11]) - 0.5) is None
+    assert optimal_team_indices(points, roles, teams, max_per_team=5) is None
+
+
+def test_select_dream_team():
+    points, roles, teams, credits = random_pool(random.Random(1), 22, True)
+    players = [{'player_id': i, 'role': role, 'team_name': team, 'points': point, 'credits': credit}
+               for i, (point, role, team, credit) in enumerate(zip(points, roles, teams, credits))]
+    team = select_dream_team(players, 'points', max_per_team=7, budget=95)
+    indices = optimal_team_indices(points, roles, teams, max_per_team=7, credits=credits, budget=95)
+    assert [player['player_id'] for player in team] == indices
+    assert sum(player['credits'] for player in team) <= 95
+    assert select_dream_team(players, 'points', max_per_team=5) == []
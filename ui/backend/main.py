@@ -1,6 +1,7 @@
 # backend/main.py
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any
 from datetime import datetime
@@ -10,10 +11,12 @@ import uvicorn
 import os
 import sys
 import zipfile
+import json
 
 sys.path.append(os.path.abspath('../../'))
-from model.predict_model import generate_dream_team
+from model.predict_model import generate_dream_team, generate_dream_teams, warm_up
 from model.train_model import train_model_ui2
+from model.model_registry import model_registry
 from response_models import *
 from rest.justification_audio import generate_justification, generate_audio
 
@@ -56,8 +59,21 @@ TRAINING_END = datetime.now()
 TESTING_START = datetime.now()
 TESTING_END = datetime.now()
 FILES_RELATIVE_PATH = {}
+# Comma separated tournament types whose feature tables are loaded at startup (e.g. "T20"), the rest load on first use
+WARM_UP_TOURNAMENT_TYPES = [t.strip() for t in os.environ.get("WARM_UP_TOURNAMENT_TYPES", "").split(",") if t.strip()]
 #---------------------------------------------------------------------------------------------------
 
+
+@app.on_event("startup")
+def warm_up_feature_tables():
+    """
+    Load the feature tables listed in WARM_UP_TOURNAMENT_TYPES so the first request does not pay for it.
+    """
+    if WARM_UP_TOURNAMENT_TYPES:
+        logger.info(f"Warming up feature tables for {WARM_UP_TOURNAMENT_TYPES}")
+        warm_up(WARM_UP_TOURNAMENT_TYPES)
+
+
 # Endpoint Implementations
 
 # TODO: TESTING
@@ -126,6 +142,74 @@ def get_recommended_team(request: RecommendedTeamRequest):
         raise HTTPException(status_code=500, detail="Internal Server Error.")
 
 
+@app.post("/api/recommended_teams")
+def get_recommended_teams(request: BatchRecommendedTeamRequest):
+    """
+    Generate recommended Dream11 teams for many fixtures in one call.
+
+    Feature lookups and scoring are shared by all fixtures of a tournament type, and each fixture's team
+    is streamed back as soon as it is selected, one JSON object per line:
+    {"index": <fixture index>, "recommended_team": [...]} or {"index": <fixture index>, "error": "..."}.
+    Justifications are not generated for batch requests.
+
+    Args:
+        request (BatchRecommendedTeamRequest): request from frontend containing the fixtures
+
+    Returns:
+        StreamingResponse: newline-delimited JSON, one line per fixture, in completion order
+    """
+    logger.info(f"Received request for recommended teams of {len(request.fixtures)} fixtures.")
+
+    def stream_teams():
+        fixtures = []
+        fixture_indices = []
+        for index, fixture in enumerate(request.fixtures):
+            # Same validation as /api/recommended_team, reported per fixture instead of failing the batch
+            if not fixture.players_team1 or not fixture.players_team2:
+                yield json.dumps({"index": index, "error": "Both teams need at least one player."}) + "\n"
+                continue
+            if fixture.players_team1[0].team_name == fixture.players_team2[0].team_name:
+                yield json.dumps({"index": index, "error": "team1 and team2 must be different."}) + "\n"
+                continue
+            all_players = [{"player_name":player.player_name, "player_id":player.player_id, "team_name":player.team_name, "role":player.role} for player in fixture.players_team1 + fixture.players_team2]
+            if len(all_players) < 11:
+                yield json.dumps({"index": index, "error": "At least 11 players are required to form a team."}) + "\n"
+                continue
+            fixtures.append({"players_data": all_players, "match_date": fixture.match_date, "venue": fixture.venue, "tournament_type": fixture.tournament_type})
+            fixture_indices.append(index)
+
+        pending = set(fixture_indices)
+        try:
+            for position, recommended_team, error in generate_dream_teams(fixtures):
+                index = fixture_indices[position]
+                pending.discard(index)
+                if error is not None:
+                    yield json.dumps({"index": index, "error": error}) + "\n"
+                    continue
+                response_team = [
+                    PlayerResponse(
+                        name=player.get("player_name", "Unknown"),
+                        role=player.get("role", "Unknown"),
+                        predicted_points=round(player.get("predicted_points", 0.0), 1),
+                        justification="",
+                        is_captain=player.get("is_captain", False),
+                        is_vice_captain=player.get("is_vice_captain", False),
+                        team=player.get("team_name", "")
+                    ).model_dump()
+                    for player in recommended_team
+                ]
+                if not response_team:
+                    yield json.dumps({"index": index, "error": "Failed to generate recommended team."}) + "\n"
+                else:
+                    yield json.dumps({"index": index, "recommended_team": response_team}) + "\n"
+        except Exception as e:
+            logger.error(f"Error in get_recommended_teams: {e}")
+            for index in sorted(pending):
+                yield json.dumps({"index": index, "error": "Internal Server Error."}) + "\n"
+
+    return StreamingResponse(stream_teams(), media_type="application/x-ndjson")
+
+
 # TODO: IMPLEMENTATION INCOMPLETE
 @app.post("/api/analyze_model", response_model=PerformanceMetrics)
 def analyze_model(request: AnalyzeModelRequest):
@@ -336,6 +420,14 @@ async def detect_date(request: DetectDateRequest):
     return {"detail": "Valid match date."}
 
 
+@app.get("/api/model_cache_stats")
+def get_model_cache_stats():
+    """
+    Load counts, hit rates and load timings of the cached model artifacts.
+    """
+    return {"models": model_registry.stats()}
+
+
 @app.get("/api/players", response_model=Dict[str, List[Dict[str, Any]]])
 async def get_players():
     """
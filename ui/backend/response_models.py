@@ -11,7 +11,7 @@ class Player(BaseModel):
     def __str__(self):
         return f"{self.player_name} ({self.role}) [{self.player_id}]"
 
-class RecommendedTeamRequest(BaseModel):
+class FixtureRequest(BaseModel):
     players_team1: List[Player] = Field(...,
                                        description="List of players in Team 1")
     players_team2: List[Player] = Field(...,
@@ -22,7 +22,6 @@ class RecommendedTeamRequest(BaseModel):
                                 description="Type of tournament (e.g., T20, ODI, Test)")
     venue: str = Field(..., description="Venue of the match")
 
-    need_justification: bool
     # for pretty printing while debugging
     def __str__(self):
         team1 = self.players_team1[0].team_name
@@ -46,6 +45,9 @@ class RecommendedTeamRequest(BaseModel):
             f"{team2} Players:{team2_players}"
         )
 
+class RecommendedTeamRequest(FixtureRequest):
+    need_justification: bool
+
 class PlayerResponse(BaseModel):
     name: str
     role: str
@@ -68,6 +70,12 @@ class RecommendedTeamResponse(BaseModel):
         return(f"\nPredicted Dream Team:{players}")
 
 
+class BatchRecommendedTeamRequest(BaseModel):
+    # Batch teams are returned without justifications, so fixtures carry no need_justification
+    fixtures: List[FixtureRequest] = Field(...,
+                                         description="Fixtures to generate recommended teams for")
+
+
 class AnalyzeModelRequest(BaseModel):
     training_start: datetime = Field(...,
                                      description="Start date for training data")